@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark the financial model generator on synthetic portfolios.
+
+Usage:
+    python scripts/benchmark-financial-model.py [--accounts 10 100 1000 10000] [--months 24 120 360]
+                                                [--output bench.json] [--compare baseline.json]
+
+Every phase (input load, derive, projection, paycheck plan, each sheet, save)
+is timed separately. With --compare the run exits 1 if any phase got slower
+than --threshold times the baseline.
+"""
+
+from pathlib import Path
+import argparse
+import json
+import sys
+
+from financial_model.benchmark import ACCOUNTS, HORIZONS, REGRESSION_RATIO, compare, format_results, run_suite
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the financial model generator.")
+    parser.add_argument("--accounts", type=int, nargs="+", default=list(ACCOUNTS),
+                        help="synthetic portfolio sizes (default: %(default)s)")
+    parser.add_argument("--months", type=int, nargs="+", default=list(HORIZONS),
+                        help="projection horizons in months (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per case; each phase keeps its fastest time (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic portfolio seed (default: 0)")
+    parser.add_argument("--streaming", action="store_true", help="benchmark write-only workbooks")
+    parser.add_argument("--monte-carlo", type=int, default=0, metavar="PATHS",
+                        help="include the Monte Carlo sheet with PATHS paths")
+    parser.add_argument("--optimize", action="store_true", help="include the Strategy Optimizer sheet")
+    parser.add_argument("--calendar", action="store_true", help="include the Cash Calendar sheet")
+    parser.add_argument("--sensitivity", action="store_true",
+                        help="include the Sensitivity sheet (extra payment x living costs)")
+    parser.add_argument("--output", type=Path, metavar="JSON", help="write the results here")
+    parser.add_argument("--compare", type=Path, metavar="JSON",
+                        help="baseline results to check this run against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_RATIO,
+                        help=f"slowdown ratio that counts as a regression (default: {REGRESSION_RATIO})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    options = dict(monte_carlo_paths=args.monte_carlo, optimize_strategy=args.optimize,
+                   cash_calendar=args.calendar, workers=1,
+                   sensitivity=("extra_payment", "living") if args.sensitivity else None)
+    results = run_suite(args.accounts, args.months, write_only=args.streaming, repeat=args.repeat,
+                        seed=args.seed, **options)
+    print(format_results(results))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Results saved to: {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(baseline, results, args.threshold)
+        for accounts, months, _, phase, before, after in regressions:
+            print(f"SLOWER {accounts} accounts x {months} months, {phase}: "
+                  f"{before:.3f}s -> {after:.3f}s", file=sys.stderr)
+        print(f"{len(regressions)} regression(s) against {args.compare}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
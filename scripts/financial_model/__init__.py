@@ -0,0 +1,38 @@
+"""
+Financial model toolkit behind scripts/build-financial-model.py.
+
+Names are imported on first use: `from financial_model import derive` loads
+numpy but not openpyxl, which only the workbook side needs.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    "BuildCache": "cache",
+    "compare_scenarios": "compare",
+    **dict.fromkeys(("CATEGORIES", "CATEGORY_LABELS", "Portfolio", "Projection", "avalanche_order",
+                     "debt_bucket", "debt_category", "month_labels", "priority_order", "simulate",
+                     "snowball_order"), "engine"),
+    "check_goals": "goals",
+    "HistoryStore": "history",
+    **dict.fromkeys(("Aggregates", "ModelInputs", "derive", "load_inputs", "project"), "inputs"),
+    "evaluate_offers": "refinance",
+    "load_snapshot": "snapshot",
+    "projection_summary": "summary",
+    **dict.fromkeys(("build_model", "save_model"), "workbook"),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,86 @@
+"""
+Batch mode: build one workbook per user across a process pool.
+
+Each worker builds and saves its workbook and returns only the output path,
+so finished workbooks never travel back to the parent. Workers are recycled
+after `max_tasks_per_child` builds, can be capped with an address-space
+limit, and only a bounded window of jobs is in flight at a time, so memory
+stays flat however many users are queued.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+import os
+
+from .history import record_history
+from .inputs import load_inputs
+from .workbook import save_model
+
+
+@dataclass
+class BatchResult:
+    name: str
+    path: Path = None
+    error: str = None
+
+
+def _limit_memory(limit_mb):
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return
+    limit = limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _build_one(name, inputs, output_path, options, history=None):
+    if isinstance(inputs, (str, Path)):
+        inputs = load_inputs(inputs)
+    if history:
+        options = dict(options, variance=record_history(history, name, inputs))
+    save_model(inputs, output_path, workers=1, **options)
+    return output_path
+
+
+def build_many(jobs, output_dir, workers=None, memory_limit_mb=None, max_tasks_per_child=16,
+               history=None, **options):
+    """Build `jobs` ((name, ModelInputs or JSON path) pairs) into `output_dir/<name>.xlsx`.
+
+    `options` are passed to save_model (monte_carlo_paths, optimize_strategy, cache);
+    nested simulations run in-process inside each worker. With a `history`
+    store path, each user's snapshot is recorded under its name and the
+    workbook gets a Variance sheet. A failing user is reported in its
+    BatchResult instead of stopping the batch.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    window = workers * 2
+    results = []
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        max_tasks_per_child=max_tasks_per_child,
+        initializer=_limit_memory if memory_limit_mb else None,
+        initargs=(memory_limit_mb,) if memory_limit_mb else (),
+    )
+    with pool:
+        pending = {}
+        jobs = iter(jobs)
+        while True:
+            for name, inputs in jobs:
+                future = pool.submit(_build_one, name, inputs, output_dir / f"{name}.xlsx", options, history)
+                pending[future] = name
+                if len(pending) >= window:
+                    break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    results.append(BatchResult(name, path=future.result()))
+                except Exception as exc:
+                    results.append(BatchResult(name, error=f"{type(exc).__name__}: {exc}"))
+    return results
@@ -0,0 +1,178 @@
+"""
+Benchmark suite for the workbook generator.
+
+Builds models from synthetic portfolios shaped like `all_debts` across a grid
+of account counts and projection horizons, timing every phase separately:
+loading the inputs JSON, deriving totals, the projection, the paycheck plan,
+each sheet builder and `wb.save`. Each case runs in a fresh worker process so
+its peak RSS is its own. Results are plain JSON; `compare` lines two runs up
+phase by phase and flags the ones that got slower.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+import openpyxl
+from openpyxl import Workbook
+
+from .cache import generator_version
+from .inputs import PAYCHECKS_PER_MONTH, ModelInputs, derive, load_inputs
+from .streaming import StreamingWorkbook
+from .styles import register_styles
+from .workbook import _Shared, model_sheets
+
+ACCOUNTS = (10, 100, 1000, 10000)
+HORIZONS = (24, 120, 360)
+REGRESSION_RATIO = 1.25
+# Ignore phases too short to time reliably
+MIN_SECONDS = 0.01
+
+# (name prefix, share of accounts, balance range, APR range)
+ACCOUNT_SHAPES = (
+    ("Credit Card", 0.35, (300, 9000), (17, 30)),
+    ("Affirm", 0.45, (80, 1500), (0, 36)),
+    ("Auto Loan", 0.05, (8000, 30000), (5, 12)),
+    ("Student Loan", 0.15, (2000, 25000), (3, 8)),
+)
+
+
+def synthetic_debts(accounts, seed=0):
+    """`accounts` all_debts rows with the real mix of cards, BNPL and loans."""
+    rng = random.Random(seed)
+    shapes = [shape for shape in ACCOUNT_SHAPES for _ in range(max(1, round(shape[1] * 100)))]
+    debts = []
+    for i in range(accounts):
+        prefix, _, balances, aprs = rng.choice(shapes)
+        balance = round(rng.uniform(*balances), 2)
+        apr = round(rng.uniform(*aprs), 2)
+        minimum = round(max(25.0, balance * rng.uniform(0.02, 0.06)), 2)
+        status = "PAST DUE" if rng.random() < 0.05 else "DEFERRED" if rng.random() < 0.03 else "CURRENT"
+        debts.append((f"{prefix} {i + 1}", balance, apr, minimum, 1 + i % 28, status, i + 1))
+    return debts
+
+
+def synthetic_inputs(accounts, months, seed=0):
+    """ModelInputs for `accounts` synthetic debts over a `months` horizon.
+
+    The paycheck covers the minimums with a 25% surplus, so the waterfall
+    has extra money to route every month.
+    """
+    inputs = replace(ModelInputs(), all_debts=synthetic_debts(accounts, seed),
+                     projection_months=months, payoff_horizon=months)
+    totals = derive(inputs)
+    needed = totals.total_minimum * 1.25 + totals.monthly_bills + totals.monthly_living
+    paycheck = round(needed / PAYCHECKS_PER_MONTH[inputs.paycheck_frequency], 2)
+    return replace(inputs, net_paycheck=max(inputs.net_paycheck, paycheck))
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(accounts, months, write_only=False, seed=0, **options):
+    """Time one build; returns {"phases": {name: seconds}, ...} for the case."""
+    phases = {}
+
+    def timed(name, fn):
+        start = time.perf_counter()
+        result = fn()
+        phases[name] = round(time.perf_counter() - start, 4)
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "inputs.json"
+        source.write_text(synthetic_inputs(accounts, months, seed).to_json(), encoding="utf-8")
+        inputs = timed("load", lambda: load_inputs(source))
+
+        shared = _Shared(inputs)
+        timed("derive", lambda: shared.totals)
+        timed("projection", lambda: shared.projection)
+        timed("paycheck plan", lambda: shared.periods)
+
+        wb = register_styles(StreamingWorkbook() if write_only else Workbook())
+        for title, build in model_sheets(shared, **options):
+            timed(f"sheet: {title}", lambda: build(wb))
+
+        output = Path(tmp) / "model.xlsx"
+        timed("save", lambda: wb.save(output))
+        size = output.stat().st_size
+
+    return dict(accounts=accounts, months=months, write_only=write_only, options=options,
+                phases=phases, total=round(sum(phases.values()), 4),
+                peak_rss_mb=_peak_rss_mb(), file_kb=size // 1024)
+
+
+def _case_key(case):
+    return case["accounts"], case["months"], case["write_only"]
+
+
+def run_suite(accounts=ACCOUNTS, horizons=HORIZONS, write_only=False, repeat=1, seed=0, **options):
+    """Run every (accounts, horizon) case and return the results document.
+
+    With `repeat` > 1 each phase keeps its fastest time; peak RSS is the
+    largest seen. Every run gets a fresh process.
+    """
+    cases = []
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        for n in accounts:
+            for months in horizons:
+                runs = [pool.submit(run_case, n, months, write_only, seed, **options).result()
+                        for _ in range(repeat)]
+                case = runs[0]
+                for run in runs[1:]:
+                    case["phases"] = {k: min(v, run["phases"][k]) for k, v in case["phases"].items()}
+                    if run["peak_rss_mb"] is not None:
+                        case["peak_rss_mb"] = max(case["peak_rss_mb"], run["peak_rss_mb"])
+                case["total"] = round(sum(case["phases"].values()), 4)
+                cases.append(case)
+    return dict(
+        generator=generator_version()[:12],
+        created=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        environment=dict(python=platform.python_version(), numpy=np.__version__,
+                         openpyxl=openpyxl.__version__, platform=platform.platform(),
+                         cpus=os.cpu_count()),
+        repeat=repeat,
+        cases=cases,
+    )
+
+
+def compare(baseline, current, ratio=REGRESSION_RATIO):
+    """(accounts, months, write_only, phase, before, after) for every phase at least `ratio` slower."""
+    before = {_case_key(case): case for case in baseline["cases"]}
+    regressions = []
+    for case in current["cases"]:
+        old = before.get(_case_key(case))
+        if old is None:
+            continue
+        for phase, seconds in {**case["phases"], "total": case["total"]}.items():
+            was = old["total"] if phase == "total" else old["phases"].get(phase)
+            if was is None or max(was, seconds) < MIN_SECONDS:
+                continue
+            if seconds >= was * ratio:
+                regressions.append((*_case_key(case), phase, was, seconds))
+    return regressions
+
+
+def format_results(results):
+    """Fixed-width table of the slowest phases per case."""
+    lines = [f"{'accounts':>8} {'months':>6} {'total s':>8} {'peak MB':>8} {'file KB':>8}  slowest phases"]
+    for case in results["cases"]:
+        slowest = sorted(case["phases"].items(), key=lambda item: -item[1])[:3]
+        lines.append(f"{case['accounts']:>8} {case['months']:>6} {case['total']:>8.2f} "
+                     f"{case['peak_rss_mb'] or 0:>8.1f} {case['file_kb']:>8}  "
+                     + ", ".join(f"{name} {seconds:.2f}" for name, seconds in slowest))
+    return "\n".join(lines)
@@ -0,0 +1,156 @@
+"""
+BNPL installment schedules.
+
+Every Affirm, Afterpay, Sezzle, Zip or Klarna plan in all_debts is expanded
+into its dated installments: the row's payment on its due day every month,
+or every one or two weeks from the first due date, until the balance is
+gone. The last installment is whatever remains, except that a remainder
+under RESIDUE is the rounding of an evenly split plan (Affirm's $355.26 in
+12 payments of $29.60), which the provider collects with the final
+installment rather than as one more a month later. Plans with an APR accrue
+interest on the remaining balance before each installment in cents, under
+the posting rules of money.py, so a monthly plan's schedule is exactly what
+the engine charges it.
+
+Every plan is stepped together, one installment at a time, and the result
+is sorted by date once. Totals per month or per pay period are then a
+np.searchsorted of the group boundaries into the sorted days plus one
+np.bincount, so regenerating dozens of plans takes well under a millisecond.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from .engine import month_grid
+from .money import MONTHLY_RATE, from_cents, half_up, to_cents
+
+FREQUENCIES = ("weekly", "biweekly", "monthly")
+FREQUENCY_DAYS = {"weekly": 7, "biweekly": 14}
+# Pay-in-4 providers bill every two weeks (see scripts/fix-biweekly-bnpl.mjs);
+# Affirm and anything unrecognised bill monthly, the app's default
+PROVIDER_FREQUENCIES = {"sezzle": "biweekly", "zip": "biweekly", "afterpay": "biweekly",
+                        "klarna": "biweekly"}
+DAILY_RATE = 3650000  # APR in hundredths of a percent -> daily fraction: / 365 / 100 / 100
+RESIDUE = 100  # Cents: a smaller final installment is rounding, folded into the one before it
+
+
+def plan_frequency(name, frequencies=None):
+    """`frequencies[name]` when given, else the provider's usual cadence."""
+    if frequencies and name in frequencies:
+        return frequencies[name]
+    lowered = name.lower()
+    return next((f for provider, f in PROVIDER_FREQUENCIES.items() if provider in lowered), "monthly")
+
+
+@dataclass
+class Installments:
+    """Every BNPL installment as flat parallel arrays, sorted by date."""
+    start: date
+    frequency: np.ndarray     # Per portfolio account; None for accounts that are not BNPL
+    account: np.ndarray       # Index into the portfolio
+    day: np.ndarray           # Day offset from start
+    cents: np.ndarray         # int64
+
+    def __len__(self):
+        return len(self.day)
+
+    @property
+    def amount(self):
+        return from_cents(self.cents)
+
+    def totals(self, boundaries):
+        """(groups, accounts) int64 cents due in each [boundaries[k], boundaries[k + 1]) day range."""
+        accounts, groups = len(self.frequency), len(boundaries) - 1
+        edges = np.searchsorted(self.day, boundaries)
+        group = np.repeat(np.arange(groups), np.diff(edges))
+        rows = slice(edges[0], edges[-1])
+        sums = np.bincount(group * accounts + self.account[rows], weights=self.cents[rows],
+                           minlength=groups * accounts)
+        return np.rint(sums).astype(np.int64).reshape(groups, accounts)
+
+    def monthly(self, months):
+        """(months, accounts) dollars due in each projection month."""
+        month_start, month_len = month_grid(self.start, months)
+        return from_cents(self.totals(np.append(month_start, month_start[-1] + month_len[-1])))
+
+    def counts(self):
+        """Installments left per account."""
+        return np.bincount(self.account, minlength=len(self.frequency))
+
+    def last_day(self):
+        """Day offset of each account's final installment, -1 for accounts without any."""
+        last = np.full(len(self.frequency), -1)
+        np.maximum.at(last, self.account, self.day)
+        return last
+
+
+def installments(portfolio, start, frequencies=None, days=None):
+    """Expand every BNPL account of `portfolio` into dated installments from `start`.
+
+    `frequencies` maps plan names to FREQUENCIES (e.g. ModelInputs.bnpl_frequency);
+    unnamed plans follow their provider. Installments on or after day `days`
+    (default 30 years) are left out, which also bounds plans whose payment
+    never covers their interest.
+    """
+    days = days or 360 * 31
+    plans = np.flatnonzero(portfolio.category == "BNPL")
+    frequency = np.full(len(portfolio), None, dtype=object)
+    frequency[plans] = [plan_frequency(portfolio.names[i], frequencies) for i in plans]
+    unknown = sorted(set(frequency[plans]) - set(FREQUENCIES))
+    if unknown:
+        raise ValueError(f"unknown BNPL payment frequency {', '.join(map(repr, unknown))} "
+                         f"(expected one of {', '.join(FREQUENCIES)})")
+
+    step = np.asarray([FREQUENCY_DAYS.get(f, 0) for f in frequency[plans]], dtype=int)
+    monthly = step == 0
+    # Interest before each installment: a month's at APR / 1200, else `step` days' at APR / 36500
+    rate = to_cents(portfolio.apr[plans]) * np.where(monthly, 1, step)
+    denominator = np.where(monthly, MONTHLY_RATE, DAILY_RATE)
+    bal = to_cents(portfolio.balance[plans])
+    payment = to_cents(portfolio.min_payment[plans])
+    due_day = portfolio.due_day[plans]
+    first_month = np.datetime64(start, "M") + (portfolio.start_month[plans] - 1)
+
+    def due_on(k):
+        month = first_month + k
+        first = month.astype("datetime64[D]")
+        length = ((month + 1).astype("datetime64[D]") - first).astype(int)
+        return (first + np.minimum(due_day, length) - 1 - np.datetime64(start, "D")).astype(int)
+
+    anchor = due_on(0)
+    account_parts, day_parts, cent_parts = [], [], []
+    for k in range(days):
+        day = np.where(monthly, due_on(k) if monthly.any() else anchor, anchor + k * step)
+        active = (bal > 0) & (day < days)
+        if not active.any():
+            break
+        bal += np.where(active, half_up(bal * rate, denominator), 0)
+        paid = np.where(active, np.minimum(payment, bal), 0)
+        paid = np.where(active & (bal - paid < RESIDUE), bal, paid)
+        bal -= paid
+        account_parts.append(plans[active])
+        day_parts.append(day[active])
+        cent_parts.append(paid[active])
+
+    account = np.concatenate(account_parts) if account_parts else np.zeros(0, dtype=int)
+    day = np.concatenate(day_parts) if day_parts else np.zeros(0, dtype=int)
+    cents = np.concatenate(cent_parts) if cent_parts else np.zeros(0, dtype=np.int64)
+    order = np.lexsort((account, day))
+    return Installments(start, frequency, account[order], day[order], cents[order])
+
+
+def minimum_schedule(portfolio, start, months, frequencies=None, plan=None):
+    """(months, accounts) amount due each month, for `simulate(minimum_schedule=...)`.
+
+    BNPL accounts pay their installments; every other account, and a BNPL
+    account after its last installment (when earlier months paid less than
+    the schedule assumed), pays its fixed minimum.
+    """
+    month_start, month_len = month_grid(start, months)
+    if plan is None:
+        plan = installments(portfolio, start, frequencies, int(month_start[-1] + month_len[-1]))
+    ended = month_start[:, None] > plan.last_day()[None, :]
+    scheduled = (portfolio.category == "BNPL")[None, :] & ~ended
+    return np.where(scheduled, plan.monthly(months), portfolio.min_payment[None, :])
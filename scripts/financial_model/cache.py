@@ -0,0 +1,217 @@
+"""
+Content-addressed build cache.
+
+Keys are SHA-256 hashes of the normalized inputs plus the generator version
+(this package's source, openpyxl and numpy versions), so editing either one
+invalidates old entries without any bookkeeping. Two kinds of entry share one
+directory, evicted least-recently-used once it grows past `max_bytes`:
+
+* `<key>.xlsx`  - a finished workbook, copied out as-is on a hit
+* `<key>.sheet` - one sheet captured as a SheetRecord, replayed into a new
+  workbook so that only the sheets whose inputs changed are rebuilt
+"""
+
+from collections import defaultdict
+from copy import copy
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+from types import SimpleNamespace
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+
+# openpyxl is imported only where sheets are recorded or replayed, so a
+# workbook served from the cache never pays for importing it
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def generator_version():
+    """Hash of everything that shapes the output besides the inputs."""
+    digest = hashlib.sha256(f"openpyxl {version('openpyxl')} numpy {np.__version__}".encode())
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def normalized(inputs):
+    """ModelInputs as plain JSON data (tuples become lists, dates ISO strings)."""
+    return json.loads(inputs.to_json())
+
+
+class BuildCache:
+    """Directory of build artifacts keyed by content hash, evicted least-recently-used."""
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def key(self, *parts):
+        payload = json.dumps([generator_version(), *parts], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def workbook_key(self, inputs, cached_values=False, **options):
+        """Key of the finished workbook for `inputs` built with build_model `options`."""
+        sheet_options = {k: v.cache_key() if hasattr(v, "cache_key") else v
+                         for k, v in options.items() if k not in ("workers", "write_only")}
+        return self.key("workbook", normalized(inputs), sheet_options, cached_values)
+
+    def _get(self, name):
+        path = self.root / name
+        try:
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            return None
+        return path
+
+    def _put(self, name, write):
+        # Write beside the target and rename, so concurrent builds never see half a file
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, self.root / name)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+
+    def fetch(self, key, dest):
+        """Copy the cached workbook for `key` to `dest`; False on a miss."""
+        path = self._get(f"{key}.xlsx")
+        if path is None:
+            return False
+        shutil.copyfile(path, dest)
+        return True
+
+    def store(self, key, src):
+        with open(src, "rb") as f:
+            self._put(f"{key}.xlsx", lambda out: shutil.copyfileobj(f, out))
+
+    def load_sheet(self, key):
+        path = self._get(f"{key}.sheet")
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def store_sheet(self, key, record):
+        self._put(f"{key}.sheet", lambda out: pickle.dump(record, out, pickle.HIGHEST_PROTOCOL))
+
+    def evict(self):
+        """Drop least-recently-used entries until the directory fits in max_bytes."""
+        entries = []
+        for path in self.root.iterdir():
+            if path.suffix not in (".xlsx", ".sheet"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # Evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+# ============== SHEET RECORDS ==============
+@lru_cache(maxsize=None)
+def _style_book():
+    from openpyxl import Workbook
+
+    from .styles import register_styles
+
+    # Named-style ids are assigned in registration order, so arrays taken from
+    # this book are valid in every workbook that went through register_styles()
+    return register_styles(Workbook())
+
+
+class _Cell:
+    __slots__ = ("value", "_style")
+
+    def __init__(self):
+        self.value = None
+        self._style = None
+
+
+class SheetRecord:
+    """A sheet captured as plain data: values, style arrays, widths, row outlines and merges.
+
+    It stands in for a worksheet while a sheet builder runs, then `replay`
+    writes it into a real (or streaming) workbook.
+    """
+
+    def __init__(self):
+        self.title = None
+        self.cells = {}
+        self.column_dimensions = defaultdict(SimpleNamespace)
+        self.row_dimensions = defaultdict(SimpleNamespace)  # outline_level, hidden, collapsed
+        self.sheet_format = SimpleNamespace()
+        self.merges = []
+
+    @property
+    def parent(self):
+        return _style_book()
+
+    @property
+    def book(self):
+        """Workbook-shaped handle for builders that call wb.active / wb.create_sheet."""
+        return SimpleNamespace(active=self, create_sheet=self._create)
+
+    def _create(self, title=None):
+        self.title = title
+        return self
+
+    def __getitem__(self, coordinate):
+        cell = self.cells.get(coordinate)
+        if cell is None:
+            cell = self.cells[coordinate] = _Cell()
+        return cell
+
+    def __setitem__(self, coordinate, value):
+        self[coordinate].value = value
+
+    def merge_cells(self, range_string):
+        self.merges.append(range_string)
+
+    def replay(self, wb, first=False):
+        from openpyxl.utils import column_index_from_string
+        from openpyxl.utils.cell import coordinate_from_string
+
+        ws = wb.active if first else wb.create_sheet(self.title)
+        ws.title = self.title
+        for column, dimension in self.column_dimensions.items():
+            if hasattr(dimension, "width"):
+                ws.column_dimensions[column].width = dimension.width
+        for name, value in vars(self.sheet_format).items():
+            setattr(ws.sheet_format, name, value)
+        # Before any cell, as a streaming sheet writes each row's attributes with the row
+        for row, dimension in self.row_dimensions.items():
+            for name, value in vars(dimension).items():
+                setattr(ws.row_dimensions[row], name, value)
+
+        def position(coordinate):
+            column, row = coordinate_from_string(coordinate)
+            return row, column_index_from_string(column)
+
+        for coordinate in sorted(self.cells, key=position):
+            recorded = self.cells[coordinate]
+            cell = ws[coordinate]
+            cell.value = recorded.value
+            if recorded._style is not None:
+                cell._style = copy(recorded._style)
+        for range_string in self.merges:
+            ws.merge_cells(range_string)
+        return ws
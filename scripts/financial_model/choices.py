@@ -0,0 +1,9 @@
+"""
+Option choices the command line offers.
+
+Kept free of imports so that parsing arguments (and --help, and build-cache
+hits) loads nothing else; export.FORMATS and sensitivity.AXES are these.
+"""
+
+EXPORT_FORMATS = ("parquet", "arrow", "csv")
+SENSITIVITY_AXES = ("extra_payment", "living", "net_paycheck", "debt_share")  # The keys of sensitivity.AXES
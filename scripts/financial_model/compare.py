@@ -0,0 +1,190 @@
+"""
+Side-by-side scenario comparison workbook.
+
+A scenario is a name and a set of overrides on one base ModelInputs: any
+input field (e.g. "extra_payment": 500) plus "debts", which edits
+individual all_debts rows by account name, and "added_income", a monthly
+amount on top of the base's income:
+
+    {"BMW refinanced": {"debts": {"BMW Financial Services": {"apr": 5.99, "min_payment": 413.60}}}}
+
+`extra_payment` is not new money: it is committed to debt out of the
+surplus the base already has, so it only moves the surplus split. Money
+that is not in the base, such as a raise or a side job, is added_income;
+its share of the surplus goes to debt like the rest.
+
+The base inputs are parsed once and handed to each pool worker when it
+starts (inherited, not pickled, where processes fork), so a task carries
+only a scenario's name and overrides and returns its JSON summary. The
+comparison workbook holds a summary row per scenario and total debt by
+month side by side.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+import json
+import os
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+from .inputs import ModelInputs, derive, inputs_from_data
+from .styles import register_styles, set_header, style
+from .summary import projection_summary
+
+DEBT_FIELDS = {"balance": 1, "apr": 2, "min_payment": 3, "due_day": 4, "status": 5, "priority": 6}
+DEFAULT_SCENARIOS = {
+    "Current plan": {},
+    "+$500/mo income": {"added_income": 500},
+    "Aggressive": {"extra_payment": 1000, "debt_surplus_percent": 1.0},
+    # Deferment extended a year past Feb 2026
+    "Nelnet stays deferred": {"debts": {"Nelnet Federal Student Loans": {"status": "DEFERRED to Feb 2027"}}},
+    # The current balance (past-due amount included) over 48 months at 5.99%
+    "BMW refinanced": {"debts": {"BMW Financial Services": {"apr": 5.99, "min_payment": 413.83,
+                                                            "status": "CURRENT"}}},
+}
+
+
+def apply_overrides(inputs, overrides, name="scenario"):
+    """`inputs` with a scenario's overrides applied; ValueError on unknown fields or accounts."""
+    overrides = dict(overrides)
+    debts = overrides.pop("debts", {})
+    added_income = overrides.pop("added_income", 0)
+    if isinstance(added_income, bool) or not isinstance(added_income, (int, float)):
+        raise ValueError(f"{name}: added_income must be a number, got {added_income!r}")
+    known = {f.name for f in fields(ModelInputs)}
+    unknown = sorted(set(overrides) - known)
+    if unknown:
+        raise ValueError(f"{name}: unknown input fields {', '.join(unknown)}")
+    if overrides:
+        # Through the JSON loader so dates and lists parse as in an inputs file
+        data = json.loads(inputs.to_json())
+        data.update(overrides)
+        inputs = inputs_from_data(data, source=name)
+
+    rows = [list(row) for row in inputs.all_debts]
+    index = {row[0]: i for i, row in enumerate(rows)}
+    for account, changes in debts.items():
+        if account not in index:
+            raise ValueError(f"{name}: no account named {account!r}")
+        for key, value in changes.items():
+            if key not in DEBT_FIELDS:
+                raise ValueError(f"{name}: {account}: unknown debt field {key!r} "
+                                 f"(expected one of {', '.join(DEBT_FIELDS)})")
+            rows[index[account]][DEBT_FIELDS[key]] = value
+    if debts:
+        inputs = replace(inputs, all_debts=[tuple(row) for row in rows])
+    if added_income:
+        inputs = replace(inputs, monthly_income=derive(inputs).monthly_income + added_income)
+    return inputs
+
+
+def load_scenarios(path):
+    """{name: overrides} from a JSON object, in file order."""
+    with open(path, encoding="utf-8") as f:
+        scenarios = json.load(f)
+    if not isinstance(scenarios, dict) or not all(isinstance(v, dict) for v in scenarios.values()):
+        raise ValueError(f"{path}: expected a JSON object of scenario name -> overrides")
+    return scenarios
+
+
+# Worker state: the base inputs, set once per process by the pool initializer
+_BASE = None
+
+
+def _init(base):
+    global _BASE
+    _BASE = base
+
+
+def _summarize(task):
+    name, overrides = task
+    return projection_summary(apply_overrides(_BASE, overrides, name), series=True)
+
+
+def compare_scenarios(base, scenarios, workers=None):
+    """{name: projection_summary(series=True)} for every scenario, in order.
+
+    Every scenario is validated before any simulation runs. `workers=1` runs
+    in-process.
+    """
+    for name, overrides in scenarios.items():
+        apply_overrides(base, overrides, name)
+    tasks = list(scenarios.items())
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        _init(base)
+        summaries = [_summarize(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=(base,)) as pool:
+            summaries = list(pool.map(_summarize, tasks))
+    return dict(zip(scenarios, summaries))
+
+
+def _describe(overrides):
+    parts = [f"{key} = {value}" for key, value in overrides.items() if key != "debts"]
+    for account, changes in overrides.get("debts", {}).items():
+        parts.append(f"{account}: " + ", ".join(f"{k} = {v}" for k, v in changes.items()))
+    return "; ".join(parts) or "Inputs as they are"
+
+
+def build_comparison(scenarios, summaries):
+    """Workbook with a "Scenario Summary" and a "Debt by Month" sheet."""
+    wb = register_styles(Workbook())
+    ws = wb.active
+    ws.title = "Scenario Summary"
+    names = list(summaries)
+    first = summaries[names[0]]
+    shown = first["end_of_projection"]["month"]
+
+    ws.column_dimensions['A'].width = 26
+    for col in 'BCDEFG':
+        ws.column_dimensions[col].width = 15
+    ws.column_dimensions['H'].width = 70
+    ws['A1'] = "SCENARIO COMPARISON"
+    style(ws, 'A1', "Title")
+    ws.merge_cells('A1:H1')
+    ws['A2'] = f"Every scenario is simulated account by account from the same inputs (as of {first['as_of']})"
+    style(ws, 'A2', "Note")
+
+    headers = ["Scenario", "Debt-Free", "Months", "Total Interest", f"vs {names[0]}",
+               f"Debt {shown}", f"Emergency Fund {shown}", "Changes"]
+    for col, h in enumerate(headers, 1):
+        set_header(ws, f"{get_column_letter(col)}4", h)
+    for row, name in enumerate(names, 5):
+        summary = summaries[name]
+        ws[f'A{row}'] = name
+        style(ws, f'A{row}', "Bold")
+        ws[f'B{row}'] = summary["debt_free"] or "Not in 30 yrs"
+        if summary["debt_free"] is None:
+            style(ws, f'B{row}', "Alert")
+        ws[f'C{row}'] = summary["months_to_debt_free"]
+        ws[f'D{row}'] = summary["interest"]["horizon"]
+        style(ws, f'D{row}', "Currency")
+        ws[f'E{row}'] = f"=D{row}-D5"
+        style(ws, f'E{row}', "Currency")
+        ws[f'F{row}'] = summary["end_of_projection"]["total_debt"]
+        style(ws, f'F{row}', "Currency")
+        ws[f'G{row}'] = summary["end_of_projection"]["emergency_fund"]
+        style(ws, f'G{row}', "Currency")
+        ws[f'H{row}'] = _describe(scenarios[name])
+
+    ws = wb.create_sheet("Debt by Month")
+    ws.column_dimensions['A'].width = 12
+    ws['A1'] = "TOTAL DEBT BY MONTH"
+    style(ws, 'A1', "Title")
+    set_header(ws, 'A3', "Month")
+    for col, name in enumerate(names, 2):
+        ws.column_dimensions[get_column_letter(col)].width = 18
+        set_header(ws, f"{get_column_letter(col)}3", name)
+    # Up to the month the slowest scenario is debt-free
+    payoffs = [summaries[name]["months_to_debt_free"] for name in names]
+    shown = len(first["series"]) if None in payoffs else max(payoffs)
+    for t, point in enumerate(first["series"][:shown]):
+        row = t + 4
+        ws[f'A{row}'] = point["month"]
+        for col, name in enumerate(names, 2):
+            cell = f"{get_column_letter(col)}{row}"
+            ws[cell] = summaries[name]["series"][t]["total_debt"]
+            style(ws, cell, "Currency")
+    return wb
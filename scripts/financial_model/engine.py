@@ -0,0 +1,328 @@
+"""
+Vectorized debt amortization engine.
+
+Every account in the inventory is stepped month by month as one NumPy array,
+optionally with a leading scenario axis so many what-if paths run together.
+Each month: interest accrues, minimums are paid, the surplus is split between
+debt and the emergency fund, and the debt share is poured down the payoff
+order (avalanche by default) so freed-up minimums roll into the next target.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+import re
+
+import numpy as np
+
+from .money import MONTHLY_RATE, from_cents, half_up, to_basis_points, to_cents
+
+CATEGORIES = ("CREDIT_CARD", "AUTO_LOAN", "STUDENT_LOAN", "BNPL", "OTHER")
+CATEGORY_LABELS = {
+    "CREDIT_CARD": "Credit Cards",
+    "AUTO_LOAN": "Auto Loans",
+    "STUDENT_LOAN": "Student Loans",
+    "BNPL": "BNPL Bal",
+    "OTHER": "Other Debt",
+}
+
+PAID_OFF = 0.005  # Balances below half a cent count as paid
+
+_MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+_DEFERRED = re.compile(r"DEFERRED to (\w{3})\w* (\d{4})", re.IGNORECASE)
+
+
+def debt_category(name):
+    """Map an account name to a Prisma DebtType bucket."""
+    lowered = name.lower()
+    if any(k in lowered for k in ("affirm", "afterpay", "sezzle", "zip", "klarna")):
+        return "BNPL"
+    if any(k in lowered for k in ("auto", "bmw")):
+        return "AUTO_LOAN"
+    if any(k in lowered for k in ("student", "sallie", "nelnet", "lendkey")):
+        return "STUDENT_LOAN"
+    return "CREDIT_CARD"
+
+
+def debt_bucket(debt_type):
+    """Fold any Prisma DebtType into CATEGORIES; PERSONAL_LOAN and MORTGAGE go in OTHER."""
+    return debt_type if debt_type in CATEGORIES else "OTHER"
+
+
+def month_index(start, when):
+    """1-based projection month of `when` relative to `start` (month 1)."""
+    return (when.year - start.year) * 12 + (when.month - start.month) + 1
+
+
+def month_grid(start, months):
+    """Day offsets from `start` of each projection month's 1st, and each month's length."""
+    first = np.arange(np.datetime64(start, "M"), np.datetime64(start, "M") + months + 1)
+    first_days = (first.astype("datetime64[D]") - np.datetime64(start, "D")).astype(int)
+    return first_days[:-1], np.diff(first_days)
+
+
+def month_labels(start, months):
+    """Labels like 'Jan 2026' for each projection month."""
+    labels = []
+    for i in range(months):
+        y, m = divmod(start.month - 1 + i, 12)
+        labels.append(date(start.year + y, m + 1, 1).strftime("%b %Y"))
+    return labels
+
+
+@dataclass
+class Portfolio:
+    """Debt inventory as parallel arrays (one slot per account)."""
+    names: list
+    balance: np.ndarray
+    apr: np.ndarray          # Percent, e.g. 29.99
+    min_payment: np.ndarray
+    due_day: np.ndarray
+    priority: np.ndarray
+    category: np.ndarray
+    start_month: np.ndarray  # First projection month a minimum is due
+
+    @classmethod
+    def from_rows(cls, rows, start=date(2026, 1, 1), categories=None):
+        """Build from `all_debts`-style tuples (name, balance, apr, min, due, status, priority).
+
+        `categories` gives each row's Prisma DebtType; without it the bucket is
+        guessed from the account name.
+        """
+        names, starts = [], []
+        for name, _, _, _, _, status, _ in rows:
+            names.append(name)
+            match = _DEFERRED.search(status)
+            if match:
+                until = date(int(match.group(2)), _MONTHS[match.group(1).lower()], 1)
+                starts.append(month_index(start, until) + 1)
+            else:
+                starts.append(1)
+        cols = list(zip(*rows)) if rows else [()] * 7
+        return cls(
+            names=names,
+            balance=np.asarray(cols[1], dtype=float),
+            apr=np.asarray(cols[2], dtype=float),
+            min_payment=np.asarray(cols[3], dtype=float),
+            due_day=np.asarray(cols[4], dtype=int),
+            priority=np.asarray(cols[6], dtype=int),
+            category=np.asarray([debt_bucket(c) for c in categories] if categories is not None
+                                else [debt_category(n) for n in names]),
+            start_month=np.asarray(starts, dtype=int),
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def category_mask(self, category):
+        return self.category == category
+
+    def category_masks(self):
+        """(len(CATEGORIES), n) membership matrix, for `simulate(groups=...)`."""
+        return np.stack([self.category_mask(c) for c in CATEGORIES])
+
+
+def avalanche_order(portfolio):
+    """Highest APR first, smallest balance breaks ties."""
+    return np.lexsort((portfolio.balance, -portfolio.apr))
+
+
+def snowball_order(portfolio):
+    """Smallest balance first, highest APR breaks ties."""
+    return np.lexsort((-portfolio.apr, portfolio.balance))
+
+
+def priority_order(portfolio):
+    """The hand-typed `priority` column."""
+    return np.argsort(portfolio.priority, kind="stable")
+
+
+@dataclass
+class Projection:
+    """Simulation output; arrays are (scenarios, months[, accounts])."""
+    total_debt: np.ndarray
+    emergency_fund: np.ndarray
+    interest: np.ndarray
+    minimums_paid: np.ndarray
+    to_debt: np.ndarray
+    to_savings: np.ndarray
+    payoff_month: np.ndarray          # -1 when not debt-free within the horizon
+    final_balance: np.ndarray         # (scenarios, accounts) after the last month
+    account_payoff: np.ndarray        # (scenarios, accounts) first month at zero, -1 if never
+    group_balances: np.ndarray = None  # (scenarios, months, groups), only with groups
+    group_minimums: np.ndarray = None
+    balances: np.ndarray = None       # Per account, only with keep_accounts
+    minimums: np.ndarray = None
+    payments: np.ndarray = None
+
+    @property
+    def total_interest(self):
+        return self.interest.sum(axis=1)
+
+
+def _per_month(value, scenarios, months):
+    """Broadcast a scalar, (S,) or (S, T) input to (S, T)."""
+    arr = np.asarray(value, dtype=float)
+    if arr.ndim == 1:
+        arr = arr[:, None]
+    return np.broadcast_to(arr, (scenarios, months))
+
+
+def _per_scenario(value, scenarios):
+    return np.broadcast_to(np.asarray(value, dtype=float), (scenarios,))
+
+
+def _scenario_count(*values):
+    sizes = [np.shape(v)[0] for v in values if np.ndim(v) >= 1]
+    return max(sizes, default=1)
+
+
+def simulate(portfolio, months, income, bills=0.0, living=0.0, debt_share=0.8,
+             ef_cap=1000.0, extra=0.0, emergency_fund=0.0, order=None, apr=None,
+             balance=None, first_month=1, groups=None, keep_accounts=False, exact=False,
+             minimum_schedule=None, min_payment=None):
+    """Project every account forward `months` months.
+
+    Cash-flow inputs (income, bills, living, extra) accept a scalar, one value
+    per scenario (S,) or a full path (S, T). `debt_share`, `ef_cap` and
+    `emergency_fund` are scalar or (S,). `order` is a payoff order (n,) or one
+    per scenario (S, n); `apr` overrides the inventory APRs with (n,) or (S, n).
+    `balance` (n,) or (S, n) and `first_month` resume a run part way through,
+    e.g. from a previous result's `final_balance`. `minimum_schedule` (T, n)
+    replaces the fixed `min_payment` with the amount due each month, e.g.
+    BNPL installments from bnpl.minimum_schedule; without a schedule,
+    `min_payment` (n,) or (S, n) overrides the inventory minimums.
+
+    `groups` is a (G, n) boolean membership matrix (e.g. category masks);
+    per-group balances and minimums are then summed inside the loop, which
+    keeps memory at (S, T, groups) instead of the (S, T, n) of keep_accounts.
+
+    The surplus after minimums follows the app's allocation plan: `extra` is
+    committed to debt first, the savings share of the rest tops up the
+    emergency fund until `ef_cap`, and everything else goes to debt. A
+    negative surplus is drawn from the emergency fund.
+
+    With `exact=True` the run is in int64 cents under the posting rules of
+    money.py, so every balance is exact to the cent; results are still
+    returned in dollars.
+    """
+    n = len(portfolio)
+    rates = portfolio.apr if apr is None else np.asarray(apr, dtype=float)
+    orders = avalanche_order(portfolio) if order is None else np.asarray(order)
+    balances0 = portfolio.balance if balance is None else np.asarray(balance, dtype=float)
+    mins = portfolio.min_payment if min_payment is None else np.asarray(min_payment, dtype=float)
+    S = _scenario_count(income, bills, living, extra, debt_share, ef_cap, emergency_fund,
+                        *(a for a in (rates, orders, balances0, mins) if a.ndim == 2))
+
+    money = to_cents if exact else (lambda values: values)
+    cash = (money(_per_month(income, S, months)) - money(_per_month(bills, S, months))
+            - money(_per_month(living, S, months)))
+    extra = money(_per_month(extra, S, months))
+    ef_cap = money(_per_scenario(ef_cap, S))
+
+    # Work in payoff-order space so the waterfall needs no gathers per month
+    if minimum_schedule is None and mins.ndim == 2:
+        minimum = np.take_along_axis(np.broadcast_to(money(mins), (S, n)), np.broadcast_to(orders, (S, n)), axis=1)
+        minimum = np.broadcast_to(minimum, (months, S, n))
+    elif minimum_schedule is None:
+        minimum = np.broadcast_to(money(mins)[orders], (months, *orders.shape))
+    else:
+        # (T, n) or, with one order per scenario, (T, S, n)
+        minimum = money(np.asarray(minimum_schedule, dtype=float)[:months])[:, orders]
+    orders = np.broadcast_to(orders, (S, n))
+    start = portfolio.start_month[orders]
+    bal = np.take_along_axis(np.broadcast_to(money(balances0), (S, n)), orders, axis=1)
+    ef = np.array(money(_per_scenario(emergency_fund, S)))
+    if exact:
+        rate = np.take_along_axis(np.broadcast_to(to_cents(rates), (S, n)), orders, axis=1)
+        savings_share = 10000 - to_basis_points(_per_scenario(debt_share, S))
+
+        def accrue(bal):
+            return half_up(bal * rate, MONTHLY_RATE)
+
+        def savings(amount):
+            return half_up(amount * savings_share, 10000)
+    else:
+        rate = np.take_along_axis(np.broadcast_to(rates / 1200.0, (S, n)), orders, axis=1)
+        savings_share = 1.0 - _per_scenario(debt_share, S)
+
+        def accrue(bal):
+            return bal * rate
+
+        def savings(amount):
+            return amount * savings_share
+    cleared_at = np.full(bal.shape, -1)
+    if groups is not None:
+        masks = np.asarray(groups, dtype=bool)[:, orders]
+        group_balances = np.empty((S, months, len(masks)), dtype=bal.dtype)
+        group_minimums = np.empty((S, months, len(masks)), dtype=bal.dtype)
+
+    total_debt = np.empty((S, months), dtype=bal.dtype)
+    fund = np.empty((S, months), dtype=bal.dtype)
+    interest = np.empty((S, months), dtype=bal.dtype)
+    mins_paid = np.empty((S, months), dtype=bal.dtype)
+    to_debt_log = np.empty((S, months), dtype=bal.dtype)
+    savings_log = np.empty((S, months), dtype=bal.dtype)
+    if keep_accounts:
+        balances = np.empty((S, months, n), dtype=bal.dtype)
+        minimums = np.empty((S, months, n), dtype=bal.dtype)
+        payments = np.empty((S, months, n), dtype=bal.dtype)
+
+    # Integer literals below keep an exact run in int64
+    for t in range(months):
+        accrued = accrue(bal)
+        bal += accrued
+        due = np.where(start <= first_month + t, np.minimum(minimum[t], bal), 0)
+        bal -= due
+        paid = due.sum(axis=1)
+
+        surplus = cash[:, t] - paid
+        positive = np.maximum(surplus, 0)
+        committed = np.minimum(positive, extra[:, t])
+        room = np.maximum(ef_cap - ef, 0)
+        saved = np.minimum(savings(positive - committed), room)
+        budget = positive - saved
+
+        # Waterfall: each account takes what is left after everything ahead of it
+        ahead = np.cumsum(bal, axis=1) - bal
+        pay = np.clip(budget[:, None] - ahead, 0, bal)
+        bal -= pay
+        applied = pay.sum(axis=1)
+
+        # Anything the debts could not absorb (debt-free) is saved
+        ef += saved + (budget - applied) + np.minimum(surplus, 0)
+
+        total_debt[:, t] = bal.sum(axis=1)
+        fund[:, t] = ef
+        interest[:, t] = accrued.sum(axis=1)
+        mins_paid[:, t] = paid
+        to_debt_log[:, t] = applied
+        savings_log[:, t] = positive - applied
+        cleared_at[(cleared_at < 0) & (bal <= PAID_OFF)] = t + 1
+        if groups is not None:
+            group_balances[:, t] = (masks * bal).sum(axis=2).T
+            group_minimums[:, t] = (masks * due).sum(axis=2).T
+        if keep_accounts:
+            balances[:, t] = bal
+            minimums[:, t] = due
+            payments[:, t] = due + pay
+
+    cleared = total_debt <= PAID_OFF
+    payoff = np.where(cleared.any(axis=1), cleared.argmax(axis=1) + 1, -1)
+    final = np.empty_like(bal)
+    np.put_along_axis(final, orders, bal, axis=1)
+    account_payoff = np.empty_like(cleared_at)
+    np.put_along_axis(account_payoff, orders, cleared_at, axis=1)
+    dollars = from_cents if exact else (lambda values: values)
+    result = Projection(*map(dollars, (total_debt, fund, interest, mins_paid, to_debt_log, savings_log)),
+                        payoff, dollars(final), account_payoff)
+    if groups is not None:
+        result.group_balances, result.group_minimums = dollars(group_balances), dollars(group_minimums)
+    if keep_accounts:
+        # Back to inventory order
+        index = np.broadcast_to(orders[:, None, :], balances.shape)
+        for name, values in (("balances", balances), ("minimums", minimums), ("payments", payments)):
+            restored = np.empty_like(values)
+            np.put_along_axis(restored, index, values, axis=2)
+            setattr(result, name, dollars(restored))
+    return result
@@ -0,0 +1,172 @@
+"""
+Columnar export of the model's results.
+
+Dashboards only need columns like `total_debt` per month, and parsing them
+back out of styled xlsx cells costs far more than reading a column file.
+`export_tables` writes three tables straight from the simulation arrays:
+
+* projection  - one row per month: total and per-category balances, cash flow
+* schedule    - one row per account per month: opening balance, interest,
+  minimum, total payment, closing balance
+* allocations - one row per obligation in the exact per-paycheck plan
+
+Parquet or Arrow IPC (Feather v2) when pyarrow is installed, CSV otherwise.
+Column names, order and types are fixed by SCHEMAS and amounts are rounded
+to cents; any change to the schema bumps SCHEMA_VERSION, which is stored in
+the Parquet/Arrow metadata.
+"""
+
+from pathlib import Path
+import csv
+
+import numpy as np
+
+from .bnpl import minimum_schedule
+from .choices import EXPORT_FORMATS as FORMATS
+from .engine import CATEGORIES, simulate
+from .inputs import derive
+from .paychecks import paycheck_plan
+
+SCHEMA_VERSION = 1
+
+# Column -> type: int, float, str or date
+SCHEMAS = {
+    "projection": {
+        "month": "int", "month_start": "date", "total_debt": "float",
+        **{f"balance_{c.lower()}": "float" for c in CATEGORIES},
+        "minimums_paid": "float", "interest": "float", "to_debt": "float",
+        "to_savings": "float", "emergency_fund": "float",
+    },
+    "schedule": {
+        "month": "int", "month_start": "date", "account": "str", "category": "str",
+        "opening_balance": "float", "interest": "float", "minimum": "float",
+        "payment": "float", "balance": "float",
+    },
+    "allocations": {
+        "period": "int", "payday": "date", "due_date": "date", "name": "str",
+        "kind": "str", "amount": "float",
+    },
+}
+
+
+def _have_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _month_starts(start, months):
+    first = np.datetime64(start, "M")
+    return np.arange(first, first + months).astype("datetime64[D]")
+
+
+def projection_tables(inputs, totals=None, months=None):
+    """{table: {column: numpy array}} in SCHEMAS order, over `months` (default: projection rows)."""
+    totals = totals or derive(inputs)
+    months = months or inputs.projection_months
+    portfolio = totals.portfolio
+    result = simulate(
+        portfolio, months,
+        income=totals.monthly_income, bills=totals.monthly_bills, living=totals.monthly_living,
+        debt_share=inputs.debt_surplus_percent, ef_cap=inputs.emergency_fund_target,
+        extra=inputs.extra_payment, groups=portfolio.category_masks(), keep_accounts=True, exact=True,
+        minimum_schedule=minimum_schedule(portfolio, inputs.projection_start, months, inputs.bnpl_frequency),
+    )
+    month = np.arange(1, months + 1)
+    month_start = _month_starts(inputs.projection_start, months)
+
+    projection = {"month": month, "month_start": month_start, "total_debt": result.total_debt[0]}
+    for g, category in enumerate(CATEGORIES):
+        projection[f"balance_{category.lower()}"] = result.group_balances[0, :, g]
+    projection.update(minimums_paid=result.minimums_paid[0], interest=result.interest[0],
+                      to_debt=result.to_debt[0], to_savings=result.to_savings[0],
+                      emergency_fund=result.emergency_fund[0])
+
+    # Long format, month-major: row k is month k // n, account k % n
+    n = len(portfolio)
+    balance = result.balances[0]
+    opening = np.vstack([portfolio.balance[None, :], balance[:-1]])
+    payment = result.payments[0]
+    schedule = {
+        "month": np.repeat(month, n),
+        "month_start": np.repeat(month_start, n),
+        "account": np.tile(np.asarray(portfolio.names, dtype=object), months),
+        "category": np.tile(portfolio.category.astype(object), months),
+        "opening_balance": opening.ravel(),
+        "interest": (balance - opening + payment).ravel(),
+        "minimum": result.minimums[0].ravel(),
+        "payment": payment.ravel(),
+        "balance": balance.ravel(),
+    }
+
+    items = [(p.number, p.start if p.number else None, *item)
+             for p in paycheck_plan(inputs, totals) for item in p.items]
+    columns = list(zip(*items)) or [()] * 6
+    allocations = {
+        "period": np.asarray(columns[0], dtype=int),
+        "payday": np.asarray(columns[1], dtype="datetime64[D]"),
+        "due_date": np.asarray(columns[2], dtype="datetime64[D]"),
+        "name": np.asarray(columns[3], dtype=object),
+        "kind": np.asarray(columns[4], dtype=object),
+        "amount": np.asarray(columns[5], dtype=float),
+    }
+    return {"projection": projection, "schedule": schedule, "allocations": allocations}
+
+
+def _arrow_table(name, columns):
+    import pyarrow as pa
+
+    types = {"int": pa.int32(), "float": pa.float64(), "str": pa.string(), "date": pa.date32()}
+    schema = pa.schema([(column, types[kind]) for column, kind in SCHEMAS[name].items()],
+                       metadata={"schema_version": str(SCHEMA_VERSION), "table": name})
+    return pa.Table.from_arrays([pa.array(columns[column], type=field.type)
+                                 for column, field in zip(SCHEMAS[name], schema)], schema=schema)
+
+
+def _write_csv(path, name, columns):
+    def text(column, kind):
+        values = columns[column]
+        if kind == "date":
+            return [str(v) if not np.isnat(v) else "" for v in values]
+        return values.tolist()
+
+    data = [text(column, kind) for column, kind in SCHEMAS[name].items()]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(SCHEMAS[name])
+        writer.writerows(zip(*data))
+
+
+def export_tables(inputs, directory, format=None, totals=None, months=None):
+    """Write projection, schedule and allocations to `directory`; returns the paths.
+
+    `format` is "parquet", "arrow" or "csv"; the default is Parquet when
+    pyarrow is installed and CSV otherwise.
+    """
+    if format is None:
+        format = "parquet" if _have_pyarrow() else "csv"
+    if format not in FORMATS:
+        raise ValueError(f"unknown export format {format!r} (expected one of {', '.join(FORMATS)})")
+    if format != "csv" and not _have_pyarrow():
+        raise ValueError(f"{format} export needs pyarrow (pip install pyarrow), or use csv")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for name, columns in projection_tables(inputs, totals, months).items():
+        # Money columns are written in cents, whatever the format
+        columns = {column: np.round(values, 2) + 0.0 if SCHEMAS[name][column] == "float" else values
+                   for column, values in columns.items()}
+        path = directory / f"{name}.{'arrow' if format == 'arrow' else format}"
+        if format == "csv":
+            _write_csv(path, name, columns)
+        elif format == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(_arrow_table(name, columns), path)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(_arrow_table(name, columns), path)
+        paths.append(path)
+    return paths
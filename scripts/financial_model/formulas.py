@@ -0,0 +1,397 @@
+"""
+Formula evaluation and cached values.
+
+openpyxl writes formulas without results, so anything that is not Excel
+(pandas, previews, the API) reads those cells as empty. This module
+evaluates the workbook's own formulas and stores each result in the
+formula cell's cached value, the way Excel does on save.
+
+Each formula is tokenized once (openpyxl's Tokenizer) and compiled to a
+Python expression; its cell references give the dependency graph, which is
+walked once into evaluation order so every formula runs exactly once, after
+the cells it reads. Only the subset of Excel the generator emits is
+supported - arithmetic, comparisons, cross-sheet references, ranges and a
+handful of functions. A formula outside it, in a reference cycle or reading
+either, keeps no cached value and is left for Excel to compute.
+"""
+
+from pathlib import Path
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+import math
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import zipfile
+
+from openpyxl.formula import Tokenizer
+from openpyxl.utils import get_column_letter, range_boundaries
+from openpyxl.utils.datetime import to_excel
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+INFIX = {"+": "+", "-": "-", "*": "*", "/": "/", "^": "**",
+         "=": "==", "<>": "!=", "<": "<", ">": ">", "<=": "<=", ">=": ">="}
+
+
+class FormulaError(str):
+    """An Excel error value, e.g. #DIV/0!, carried as the cell's result."""
+
+
+class Unsupported(ValueError):
+    """The formula uses syntax or a function the evaluator does not implement."""
+
+
+class _Propagate(Exception):
+    def __init__(self, error):
+        self.error = error
+
+
+def _numbers(args):
+    # Range arguments skip text, booleans and blanks, like Excel's SUM
+    for arg in args:
+        if isinstance(arg, list):
+            yield from (v for v in arg if isinstance(v, (int, float)) and not isinstance(v, bool))
+        else:
+            yield arg
+
+
+def _round(value, digits=0):
+    factor = 10 ** int(digits)
+    return math.copysign(math.floor(abs(value) * factor + 0.5) / factor, value)
+
+
+def _if(test, yes=lambda: True, no=lambda: False):
+    # Branches arrive as thunks so only the chosen one runs, as in Excel
+    return yes() if test else no()
+
+
+def _average(*args):
+    values = list(_numbers(args))
+    if not values:
+        raise ZeroDivisionError
+    return sum(values) / len(values)
+
+
+FUNCTIONS = {
+    "SUM": lambda *args: sum(_numbers(args)),
+    "MIN": lambda *args: min(_numbers(args), default=0),
+    "MAX": lambda *args: max(_numbers(args), default=0),
+    "AVERAGE": _average,
+    "COUNT": lambda *args: sum(1 for _ in _numbers(args)),
+    "ABS": abs,
+    "ROUND": _round,
+    "IF": _if,
+    "AND": lambda *args: all(_numbers(args)),
+    "OR": lambda *args: any(_numbers(args)),
+    "NOT": lambda value: not value,
+}
+
+
+def _split_reference(token, sheet):
+    """(sheet, 'A1' or 'A1:B9') from a RANGE token, absolute markers removed."""
+    if "!" in token:
+        sheet, token = token.rsplit("!", 1)
+        if sheet.startswith("'"):
+            sheet = sheet[1:-1].replace("''", "'")
+    return sheet, token.replace("$", "")
+
+
+def _cells_in(reference):
+    min_col, min_row, max_col, max_row = range_boundaries(reference)
+    if min_row is None or min_col is None:
+        raise Unsupported(f"whole row/column reference {reference}")
+    return [f"{get_column_letter(col)}{row}"
+            for row in range(min_row, max_row + 1) for col in range(min_col, max_col + 1)]
+
+
+def compile_formula(formula, sheet):
+    """(code object, referenced (sheet, coordinate) pairs) for `formula` on `sheet`."""
+    parts, refs = [], []
+    closers = []  # Per open function/paren: (text to emit at its close, whether it is an IF)
+    negate = False
+    for token in Tokenizer(formula).items:
+        kind, value = token.type, token.value
+        wrap = ")" if negate else ""
+        if negate:
+            parts.append("(-")  # Excel's negation binds tighter than ^
+            negate = False
+        if kind == "OPERAND":
+            if token.subtype == "RANGE":
+                ref_sheet, reference = _split_reference(value, sheet)
+                if ":" in reference:
+                    cells = _cells_in(reference)
+                    refs.extend((ref_sheet, c) for c in cells)
+                    parts.append(f"r({ref_sheet!r}, {cells!r})")
+                else:
+                    refs.append((ref_sheet, reference))
+                    parts.append(f"c({ref_sheet!r}, {reference!r})")
+            elif token.subtype == "NUMBER":
+                parts.append(repr(float(value)))
+            elif token.subtype == "TEXT":
+                parts.append(repr(value[1:-1].replace('""', '"')))
+            elif token.subtype == "LOGICAL":
+                parts.append(str(value.upper() == "TRUE"))
+            else:
+                raise Unsupported(f"operand {value}")
+            parts.append(wrap)
+        elif kind == "FUNC" and token.subtype == "OPEN":
+            name = value[:-1].upper()
+            if name not in FUNCTIONS:
+                raise Unsupported(f"function {name}")
+            parts.append(f"F[{name!r}](")
+            closers.append((")" + wrap, name == "IF"))
+        elif kind == "PAREN" and token.subtype == "OPEN":
+            parts.append("(")
+            closers.append((")" + wrap, False))
+        elif token.subtype == "CLOSE":
+            parts.append(closers.pop()[0])
+        elif kind == "SEP" and token.subtype == "ARG":
+            parts.append(", lambda: " if closers and closers[-1][1] else ", ")
+        elif kind == "OPERATOR-PREFIX":
+            if value == "-":
+                negate = not negate
+        elif kind == "OPERATOR-INFIX" and value in INFIX:
+            parts.append(f" {INFIX[value]} ")
+        elif kind == "OPERATOR-POSTFIX" and value == "%":
+            parts.append(" / 100")
+        elif kind != "WHITE-SPACE":
+            raise Unsupported(f"{kind} {value}")
+    source = "".join(parts)
+    try:
+        return compile(source, formula, "eval"), refs
+    except SyntaxError as exc:
+        raise Unsupported(f"cannot compile {formula}") from exc
+
+
+def _order(graph):
+    """Formula cells in dependency order (Kahn's algorithm); cells in or behind a cycle never
+    reach zero pending inputs and are left out."""
+    pending, dependents = {}, {}
+    for node, refs in graph.items():
+        deps = {ref for ref in refs if ref in graph}
+        pending[node] = len(deps)
+        for dep in deps:
+            dependents.setdefault(dep, []).append(node)
+    ready = [node for node, count in pending.items() if count == 0]
+    order = []
+    while ready:
+        node = ready.pop()
+        order.append(node)
+        for dependent in dependents.get(node, ()):
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+    return order
+
+
+def evaluate(cells):
+    """Values of every cell in `cells` ({sheet: {coordinate: value}}), formulas resolved.
+
+    Formulas are strings starting with "=", as openpyxl stores them. The
+    result has the same shape; a formula that could not be evaluated is None
+    and errors are FormulaError strings. A formula that reads an unsupported
+    one, directly or through others, is not evaluated either: its inputs
+    are unknown, not blank.
+    """
+    values = {(sheet, coord): value for sheet, sheet_cells in cells.items()
+              for coord, value in sheet_cells.items()}
+    compiled, graph, unresolved = {}, {}, set()
+    for key, value in values.items():
+        if isinstance(value, str) and value.startswith("=") and len(value) > 1:
+            values[key] = None
+            try:
+                compiled[key], graph[key] = compile_formula(value, key[0])
+            except Unsupported:
+                graph[key] = []
+                unresolved.add(key)
+
+    def cell(sheet, coord):
+        value = values.get((sheet, coord))
+        if isinstance(value, FormulaError):
+            raise _Propagate(value)
+        return 0 if value is None else value
+
+    def cells_of(sheet, coords):
+        found = [values.get((sheet, coord)) for coord in coords]
+        for value in found:
+            if isinstance(value, FormulaError):
+                raise _Propagate(value)
+        return found
+
+    scope = dict(c=cell, r=cells_of, F=FUNCTIONS)
+    for key in _order(graph):
+        if key in unresolved or any(ref in unresolved for ref in graph[key]):
+            unresolved.add(key)
+            continue
+        try:
+            value = eval(compiled[key], scope)
+        except _Propagate as exc:
+            value = exc.error
+        except ZeroDivisionError:
+            value = FormulaError("#DIV/0!")
+        except (TypeError, ValueError, OverflowError):
+            value = FormulaError("#VALUE!")
+        if isinstance(value, list):  # A bare range: Excel takes its first cell
+            value = value[0] if value else None
+        if isinstance(value, float) and value.is_integer() and abs(value) < 2 ** 53:
+            value = int(value)
+        values[key] = value
+
+    result = {sheet: {} for sheet in cells}
+    for (sheet, coord), value in values.items():
+        result[sheet][coord] = value
+    return result
+
+
+def workbook_cells(wb):
+    """{sheet: {coordinate: value}} of an in-memory openpyxl Workbook; dates become serial numbers."""
+    def value(cell):
+        return to_excel(cell.value) if cell.is_date else cell.value
+
+    return {ws.title: {cell.coordinate: value(cell) for row in ws.iter_rows() for cell in row
+                       if cell.value is not None}
+            for ws in wb.worksheets}
+
+
+def sheet_rows(sheet_values):
+    """A sheet's values as a list of rows from A1, blanks as None."""
+    bounds = [range_boundaries(coord)[:2] for coord in sheet_values]
+    width = max((col for col, _ in bounds), default=0)
+    height = max((row for _, row in bounds), default=0)
+    rows = [[None] * width for _ in range(height)]
+    for (col, row), value in zip(bounds, sheet_values.values()):
+        rows[row - 1][col - 1] = value
+    return rows
+
+
+# ============== XLSX FILES ==============
+def sheet_members(archive):
+    """(title, zip member) of each worksheet, in workbook order."""
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels.iter(f"{PACKAGE_REL_NS}Relationship"):
+        target = rel.get("Target")
+        targets[rel.get("Id")] = target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+    return [(sheet.get("name"), targets[sheet.get(f"{REL_NS}id")])
+            for sheet in workbook.iter(f"{MAIN_NS}sheet")]
+
+
+def _shared_strings(archive):
+    try:
+        root = ElementTree.fromstring(archive.read("xl/sharedStrings.xml"))
+    except KeyError:
+        return []
+    return ["".join(t.text or "" for t in si.iter(f"{MAIN_NS}t")) for si in root.iter(f"{MAIN_NS}si")]
+
+
+def _cell_value(c, strings):
+    formula = c.find(f"{MAIN_NS}f")
+    if formula is not None and formula.text:
+        return "=" + formula.text
+    kind = c.get("t", "n")
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in c.iter(f"{MAIN_NS}t"))
+    v = c.find(f"{MAIN_NS}v")
+    if v is None or v.text is None:
+        return None
+    if kind == "s":
+        return strings[int(v.text)]
+    if kind == "b":
+        return v.text == "1"
+    if kind == "e":
+        return FormulaError(v.text)
+    if kind in ("str", "d"):
+        return v.text
+    number = float(v.text)
+    return int(number) if number.is_integer() else number
+
+
+def read_cells(path, sheets=None):
+    """{sheet: {coordinate: value}} of a saved workbook (or just `sheets`), formulas as "=..." strings."""
+    with zipfile.ZipFile(path) as archive:
+        strings = _shared_strings(archive)
+        cells = {}
+        for title, member in sheet_members(archive):
+            if sheets is not None and title not in sheets:
+                continue
+            root = ElementTree.fromstring(archive.read(member))
+            cells[title] = {c.get("r"): _cell_value(c, strings) for c in root.iter(f"{MAIN_NS}c")}
+    return cells
+
+
+_FORMULA_CELL = re.compile(r'<c r="([A-Z]+[0-9]+)"([^>]*)><f>([^<]*)</f>(?:<v\s*/>|<v>[^<]*</v>)?</c>')
+_TYPE_ATTR = re.compile(r'\st="[^"]*"')
+
+
+def _cached(value):
+    """(t attribute, <v> text) for a result, or None to leave the cell alone."""
+    if value is None:
+        return None
+    if isinstance(value, FormulaError):
+        return "e", escape(value)
+    if isinstance(value, bool):
+        return "b", "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) or math.isinf(value) else ("n", repr(value))
+    return "str", escape(str(value))
+
+
+def _with_cached_values(xml, results):
+    def replace(match):
+        coord, attrs, formula = match.groups()
+        cached = _cached(results.get(coord))
+        if cached is None:
+            return match.group(0)
+        kind, text = cached
+        attrs = _TYPE_ATTR.sub("", attrs) + ("" if kind == "n" else f' t="{kind}"')
+        return f'<c r="{coord}"{attrs}><f>{formula}</f><v>{text}</v></c>'
+
+    return _FORMULA_CELL.sub(replace, xml)
+
+
+def rewrite_package(path, transform, output=None):
+    """Copy the xlsx at `path` to `output` (default: in place), passing each member through
+    `transform(name, data)`, which returns the new bytes or None to drop the member.
+
+    Writes a temporary file beside the target and renames it, so a failure
+    leaves the original intact. The result keeps the permissions of the file
+    it replaces, or of `path` when `output` is new.
+    """
+    path = Path(path)
+    output = Path(output or path)
+    fd, tmp = tempfile.mkstemp(dir=output.parent, suffix=".xlsx.tmp")
+    os.close(fd)
+    try:
+        # mkstemp creates the file 0600
+        shutil.copymode(output if output.exists() else path, tmp)
+        with zipfile.ZipFile(path) as source, zipfile.ZipFile(tmp, "w") as target:
+            for info in source.infolist():
+                data = transform(info.filename, source.read(info))
+                if data is not None:
+                    target.writestr(info, data)
+        os.replace(tmp, output)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_cached_values(path):
+    """Evaluate the workbook at `path`, store every formula's result in it and return the values."""
+    results = evaluate(read_cells(path))
+    with zipfile.ZipFile(path) as archive:
+        members = {member: title for title, member in sheet_members(archive)}
+
+    def transform(name, data):
+        title = members.get(name)
+        if title is None:
+            return data
+        return _with_cached_values(data.decode("utf-8"), results[title]).encode("utf-8")
+
+    rewrite_package(path, transform)
+    return results
@@ -0,0 +1,130 @@
+"""
+Goal seek against the projection engine.
+
+A goal is a target for one projection metric by a projection month, e.g.
+total debt under $65,000 by month 12. For each goal the solver reports the
+metric on the current plan, the first month the target holds, and the
+smallest additional monthly payment that meets it in time. The addition is
+new money on top of the current plan (income and the committed extra
+payment both rise by it), so all of it goes down the payoff order.
+
+The addition is found by bisection on whole cents. Each round probes
+PROBES amounts across the bracket as one batched simulation on the
+engine's scenario axis, so a solve takes a few rounds of a few
+milliseconds. Every simulated amount is memoized, and goals checked on the
+same build share the cache (every solve starts with the same bracket).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .bnpl import minimum_schedule
+from .engine import CATEGORIES, PAID_OFF, simulate
+from .money import to_cents
+
+# Debt metrics are met at or below the target, the emergency fund at or above
+METRICS = ("total_debt", "emergency_fund", *CATEGORIES)
+PROBES = 15    # Additional payments simulated per bisection round
+RESOLUTION = 100  # Cents: solves stop once the bracket is a dollar wide
+
+
+@dataclass
+class GoalResult:
+    label: str
+    metric: str
+    target: float
+    month: int                # Projection month the target is due by
+    projected: float          # The metric in that month on the current plan
+    met: bool
+    reached_month: int        # First month the target holds on the current plan, -1 if never
+    extra_needed: float       # Smallest additional payment per month that meets it in time;
+                              # None when the metric is not a debt or the target is below zero
+
+
+def _met(metric, value, target):
+    if metric == "emergency_fund":
+        return value >= target - PAID_OFF
+    return value <= target + PAID_OFF
+
+
+def _series(projection, metric):
+    """(scenarios, months) values of `metric`."""
+    if metric == "total_debt":
+        return projection.total_debt
+    if metric == "emergency_fund":
+        return projection.emergency_fund
+    return projection.group_balances[:, :, CATEGORIES.index(metric)]
+
+
+class GoalSolver:
+    """Memoized minimum-additional-payment solves on the "2026 Projections" assumptions."""
+
+    def __init__(self, inputs, totals, months):
+        portfolio = totals.portfolio
+        self.inputs, self.totals, self.months = inputs, totals, months
+        self.schedule = minimum_schedule(portfolio, inputs.projection_start, months, inputs.bnpl_frequency)
+        # Twice the debt clears every balance and a month's interest in month 1
+        self.ceiling = int(to_cents(2 * portfolio.balance.sum()))
+        self.runs = {}  # Additional payment in cents -> {metric: (months,) values}
+        self.simulations = 0
+
+    def values(self, metric, month, extras):
+        """`metric` in `month` for each additional payment in `extras` (cents)."""
+        missing = sorted({int(e) for e in extras} - set(self.runs))
+        if missing:
+            added = np.asarray(missing) / 100
+            projection = simulate(
+                self.totals.portfolio, self.months,
+                income=self.totals.monthly_income + added, bills=self.totals.monthly_bills,
+                living=self.totals.monthly_living, debt_share=self.inputs.debt_surplus_percent,
+                ef_cap=self.inputs.emergency_fund_target, extra=self.inputs.extra_payment + added,
+                groups=self.totals.portfolio.category_masks(), exact=True,
+                minimum_schedule=self.schedule,
+            )
+            self.simulations += 1
+            for s, extra in enumerate(missing):
+                self.runs[extra] = {m: _series(projection, m)[s] for m in METRICS}
+        return np.asarray([self.runs[int(e)][metric][month - 1] for e in extras])
+
+    def minimum_extra(self, metric, target, month):
+        """Smallest additional payment per month, in dollars, that meets the target by `month`."""
+        if metric == "emergency_fund" or target < 0:
+            return None
+        low, high = 0, self.ceiling
+        met_low, met_high = _met(metric, self.values(metric, month, [low, high]), target)
+        if met_low:
+            return 0.0
+        if not met_high:
+            return None  # Cannot happen for a target >= 0, kept for safety
+        # Invariant: `low` misses the target, `high` meets it
+        while high - low > RESOLUTION:
+            probes = np.unique(np.linspace(low, high, PROBES + 2)[1:-1].round().astype(np.int64))
+            met = _met(metric, self.values(metric, month, probes), target)
+            first = int(met.argmax()) if met.any() else len(probes)
+            high = int(probes[first]) if first < len(probes) else high
+            low = int(probes[first - 1]) if first > 0 else low
+        return high / 100
+
+
+def check_goals(inputs, totals, projection):
+    """A GoalResult per `inputs.goals` entry; `projection` is project()'s result for `inputs`."""
+    for label, metric, target, month in inputs.goals:
+        if metric not in METRICS:
+            raise ValueError(f"goal {label!r}: unknown metric {metric!r} (expected one of {', '.join(METRICS)})")
+        if not 1 <= month <= inputs.payoff_horizon:
+            raise ValueError(f"goal {label!r}: month {month} is outside the {inputs.payoff_horizon}-month horizon")
+    solver = GoalSolver(inputs, totals, max((month for *_, month in inputs.goals), default=1))
+
+    results = []
+    for label, metric, target, month in inputs.goals:
+        series = _series(projection, metric)[0]
+        met = _met(metric, series, target)
+        results.append(GoalResult(
+            label=label, metric=metric, target=target, month=month,
+            projected=round(float(series[month - 1]), 2),
+            met=bool(met[month - 1]),
+            reached_month=int(met.argmax()) + 1 if met.any() else -1,
+            extra_needed=solver.minimum_extra(metric, target, month),
+        ))
+    return results
@@ -0,0 +1,229 @@
+"""
+Append-only snapshot history.
+
+Every build can record its input balances and projection in a SQLite file,
+so earlier figures survive the workbook being rebuilt. Three tables:
+
+* snapshots   - one row per recorded build: user, as_of date, inputs hash
+* balances    - each account's balance at as_of, in cents
+* projections - each category's projected month-end balance, in cents,
+                keyed by (user, calendar month, snapshot)
+
+Rows are only ever inserted; recording inputs identical to a user's
+existing snapshot is a no-op. Every read is an index range (a user's
+snapshots between two dates) or a primary-key lookup (one snapshot's
+projection for one month), so a variance report costs the same with years
+of daily snapshots across many users as with a handful. Writers use WAL
+mode, so parallel batch workers can append to the same file.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+import hashlib
+import sqlite3
+
+import numpy as np
+
+from .engine import CATEGORIES
+from .inputs import derive, project
+from .money import from_cents, to_cents
+
+VARIANCE_MONTHS = 24  # Months shown on the Variance sheet, ending with the latest snapshot
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    as_of TEXT NOT NULL,
+    inputs_hash TEXT NOT NULL,
+    recorded TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_date ON snapshots (user, as_of, id);
+CREATE UNIQUE INDEX IF NOT EXISTS snapshots_by_inputs ON snapshots (user, inputs_hash);
+CREATE TABLE IF NOT EXISTS balances (
+    snapshot INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    account TEXT NOT NULL,
+    category TEXT NOT NULL,
+    cents INTEGER NOT NULL,
+    PRIMARY KEY (snapshot, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS projections (
+    user TEXT NOT NULL,
+    month INTEGER NOT NULL,
+    snapshot INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    cents INTEGER NOT NULL,
+    PRIMARY KEY (user, month, snapshot, category)
+) WITHOUT ROWID;
+"""
+
+
+def month_key(day):
+    """Calendar month as one integer (year * 12 + month - 1), for range reads."""
+    return day.year * 12 + day.month - 1
+
+
+def month_start(key):
+    return date(key // 12, key % 12 + 1, 1)
+
+
+@dataclass
+class VarianceReport:
+    """Actual vs projected balances per calendar month, per CATEGORIES column."""
+    user: str
+    months: np.ndarray        # month_key of each row, ascending
+    as_of: list               # Date of the snapshot taken as the month's actual (its latest)
+    actual: np.ndarray        # (months, categories)
+    projected: np.ndarray     # What the latest snapshot before the month expected; NaN without one
+    projected_on: list        # That snapshot's date, or None
+    planned: np.ndarray       # What the user's first snapshot expected; NaN if it does not reach
+    planned_on: date          # The first snapshot's date, or None
+    snapshot_ids: list        # Every snapshot read, for cache keys
+
+    def __len__(self):
+        return len(self.months)
+
+    def cache_key(self):
+        # Snapshots never change once written, so their ids identify the report
+        return [self.user, self.snapshot_ids]
+
+
+class HistoryStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.con = sqlite3.connect(self.path, timeout=60)
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.executescript(SCHEMA)
+
+    def close(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, user, inputs, totals=None):
+        """Append a snapshot of `inputs` for `user`; returns its id (the existing one if unchanged)."""
+        payload = inputs.to_json().encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+        row = self.con.execute("SELECT id FROM snapshots WHERE user = ? AND inputs_hash = ?",
+                               (user, digest)).fetchone()
+        if row:
+            return row[0]
+
+        totals = totals or derive(inputs)
+        portfolio, projection = project(inputs, totals)
+        months = min(inputs.projection_months, inputs.payoff_horizon)
+        balances = to_cents(portfolio.balance)
+        projected = to_cents(projection.group_balances[0, :months])  # (months, categories)
+        first = month_key(inputs.projection_start)
+
+        with self.con:
+            snapshot = self.con.execute(
+                "INSERT INTO snapshots (user, as_of, inputs_hash, recorded) VALUES (?, ?, ?, ?)",
+                (user, inputs.as_of.isoformat(), digest, datetime.now(timezone.utc).isoformat(timespec="seconds")),
+            ).lastrowid
+            self.con.executemany(
+                "INSERT INTO balances VALUES (?, ?, ?, ?, ?)",
+                [(snapshot, i, name, str(category), int(cents))
+                 for i, (name, category, cents) in enumerate(zip(portfolio.names, portfolio.category, balances))],
+            )
+            self.con.executemany(
+                "INSERT INTO projections VALUES (?, ?, ?, ?, ?)",
+                [(user, first + t, snapshot, category, int(projected[t, g]))
+                 for t in range(months) for g, category in enumerate(CATEGORIES)],
+            )
+        return snapshot
+
+    def _snapshots(self, user, where="", params=(), order="as_of, id", limit=None):
+        sql = f"SELECT id, as_of FROM snapshots WHERE user = ? {where} ORDER BY {order}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [(i, date.fromisoformat(d)) for i, d in self.con.execute(sql, (user, *params))]
+
+    def _projections(self, user, pairs):
+        """{(month, snapshot): (categories,) cents} for (month, snapshot) pairs."""
+        if not pairs:
+            return {}
+        values = ", ".join("(?, ?)" for _ in pairs)
+        rows = self.con.execute(
+            f"WITH wanted (month, snapshot) AS (VALUES {values}) "
+            "SELECT p.month, p.snapshot, p.category, p.cents FROM wanted w "
+            "JOIN projections p ON p.user = ? AND p.month = w.month AND p.snapshot = w.snapshot",
+            [v for pair in pairs for v in pair] + [user],
+        )
+        result = {}
+        for month, snapshot, category, cents in rows:
+            result.setdefault((month, snapshot), np.zeros(len(CATEGORIES), dtype=np.int64))[
+                CATEGORIES.index(category)] = cents
+        return result
+
+    def variance(self, user, until=None, months=VARIANCE_MONTHS):
+        """VarianceReport for the `months` calendar months up to `until` (default: the latest snapshot)."""
+        if until is None:
+            latest = self._snapshots(user, order="as_of DESC, id DESC", limit=1)
+            if not latest:
+                return _empty_report(user)
+            until = latest[0][1]
+        last_key = month_key(until)
+        since = month_start(last_key - months + 1)
+        in_range = self._snapshots(user, "AND as_of >= ? AND as_of <= ?", (since.isoformat(), until.isoformat()))
+        if not in_range:
+            return _empty_report(user)
+        before = self._snapshots(user, "AND as_of < ?", (since.isoformat(),), order="as_of DESC, id DESC", limit=1)
+        first = self._snapshots(user, limit=1)[0]
+        snapshots = before + in_range  # Sorted by (as_of, id)
+
+        ids = np.asarray([i for i, _ in snapshots])
+        days = np.asarray([d.toordinal() for _, d in snapshots])
+        keys = np.asarray([month_key(d) for _, d in snapshots])
+        # The month's actual is its last snapshot; its projection comes from the last one before the month
+        offset = len(before)
+        last_in_month = offset + np.flatnonzero(np.append(np.diff(keys[offset:]) != 0, True))
+        month_keys = keys[last_in_month]
+        starts = np.asarray([month_start(k).toordinal() for k in month_keys])
+        previous = np.searchsorted(days, starts, side="left") - 1
+
+        actual_ids = [int(ids[i]) for i in last_in_month]
+        actual = {snapshot: np.zeros(len(CATEGORIES), dtype=np.int64) for snapshot in actual_ids}
+        for snapshot, category, cents in self.con.execute(
+                f"SELECT snapshot, category, SUM(cents) FROM balances WHERE snapshot IN "
+                f"({', '.join('?' * len(actual_ids))}) GROUP BY snapshot, category", actual_ids):
+            actual[snapshot][CATEGORIES.index(category)] = cents
+
+        pairs = [(int(k), int(ids[p])) for k, p in zip(month_keys, previous) if p >= 0]
+        pairs += [(int(k), first[0]) for k in month_keys if first[1] < month_start(k)]
+        projections = self._projections(user, pairs)
+
+        def lookup(month, snapshot):
+            cents = projections.get((int(month), snapshot))
+            return np.full(len(CATEGORIES), np.nan) if cents is None else from_cents(cents)
+
+        return VarianceReport(
+            user=user,
+            months=month_keys,
+            as_of=[snapshots[i][1] for i in last_in_month],
+            actual=np.stack([from_cents(actual[i]) for i in actual_ids]),
+            projected=np.stack([lookup(k, int(ids[p]) if p >= 0 else None) for k, p in zip(month_keys, previous)]),
+            projected_on=[snapshots[p][1] if p >= 0 else None for p in previous],
+            planned=np.stack([lookup(k, first[0]) for k in month_keys]),
+            planned_on=first[1],
+            snapshot_ids=sorted(set(actual_ids) | {s for _, s in pairs}),
+        )
+
+
+def _empty_report(user):
+    empty = np.zeros((0, len(CATEGORIES)))
+    return VarianceReport(user, np.zeros(0, dtype=int), [], empty, empty, [], empty, None, [])
+
+
+def record_history(path, user, inputs, totals=None):
+    """Record `inputs` for `user` in the store at `path` and return the user's VarianceReport."""
+    with HistoryStore(path) as store:
+        store.record(user, inputs, totals)
+        return store.variance(user)
@@ -0,0 +1,319 @@
+"""
+Model inputs: everything the workbook is built from.
+
+Defaults are the December 27, 2025 snapshot. A JSON file with any subset of
+the fields overrides them, so one file per user is enough for batch builds;
+an app data export (see snapshot.py) can be loaded the same way.
+
+Only raw records live here. Totals (category balances, BNPL payments, total
+debt, monthly income and bills) are derived by `derive()` in one pass and
+shared by every sheet, so they can't drift from the records.
+"""
+
+from dataclasses import asdict, dataclass, field, fields
+from datetime import date
+import json
+
+import numpy as np
+
+from .bnpl import minimum_schedule
+from .engine import CATEGORIES, Portfolio, simulate
+
+SUMMARY_LABELS = {
+    "CREDIT_CARD": "Credit Cards (HIGH PRIORITY)",
+    "AUTO_LOAN": "Auto Loans",
+    "STUDENT_LOAN": "Student Loans",
+    "BNPL": "BNPL (Buy Now Pay Later)",
+    "OTHER": "Other Debt (Loans, Mortgage)",
+}
+
+CATEGORY_NOTES = {
+    "CREDIT_CARD": "24-30% APR - Pay these FIRST",
+    "AUTO_LOAN": "BMW is PAST DUE - $1,204 behind",
+    "STUDENT_LOAN": "Nelnet deferred until Feb 2026",
+    "BNPL": "Self-liquidating by ~Oct 2026",
+}
+
+# Paychecks (or bill payments) per month, as in extract-financial-data.mjs
+PAYCHECKS_PER_MONTH = {"weekly": 4.33, "biweekly": 2.17, "monthly": 1}
+PAYCHECKS_PER_YEAR = {"weekly": 52, "biweekly": 26, "monthly": 12}
+MAX_PROJECTION_MONTHS = 360  # 30 years of "2026 Projections" rows at most
+BILLS_PER_MONTH = {"WEEKLY": 4.33, "BIWEEKLY": 2.17, "MONTHLY": 1, "YEARLY": 1 / 12, "ONCE": 0}
+
+# All debts sorted by APR (avalanche method)
+ALL_DEBTS = [
+    # Credit Cards (highest priority)
+    ("Best Buy Credit Card", 6352.18, 29.99, 230, 8, "CURRENT", 1),
+    ("Bank of America BankAmericacard", 5022.60, 24.99, 239.98, 8, "CURRENT", 2),
+    ("American Express Green Card", 3978.32, 23.99, 170, 14, "CURRENT", 3),
+    ("Navy Federal CashRewards", 487.49, 17.97, 20, 20, "CURRENT", 4),
+
+    # BNPL with interest
+    ("Affirm - 10 payments (due 28th)", 532.54, 32.43, 59.21, 28, "CURRENT", 5),
+    ("Affirm - 4 payments left (due 28th)", 164.20, 32.53, 54.85, 28, "CURRENT", 6),
+    ("Affirm - 3 payments left (due 29th)", 180.59, 32.40, 91.38, 29, "CURRENT", 7),
+    ("Affirm - 10 payments (due 14th)", 591.83, 32.43, 59.21, 14, "CURRENT", 8),
+    ("Affirm - Final Jan 21", 259.91, 22.52, 259.91, 21, "CURRENT", 9),
+    ("Affirm - Final Jan 21 (B)", 34.60, 22.52, 34.60, 21, "CURRENT", 10),
+
+    # Auto Loans
+    ("Navy Federal Auto Loan", 2740.10, 16.85, 201.53, 20, "DEFERRED to Jul 2027", 11),
+    ("LendKey Student Loan", 6214.58, 11.20, 110.69, 1, "PAST DUE - $111", 12),
+    ("BMW Financial Services", 17624.30, 8.98, 437.37, 4, "PAST DUE - $1,204", 13),
+    ("Sallie Mae", 11247.88, 8.13, 192.10, 7, "CURRENT", 14),
+    ("Nelnet Federal Student Loans", 22203.57, 5.00, 226.14, 10, "DEFERRED to Feb 2026", 15),
+
+    # 0% BNPL (pay minimums, they self-liquidate)
+    ("Affirm - 12 payments (due 8th)", 947.28, 0, 78.94, 8, "CURRENT", 16),
+    ("Affirm - 10 payments left (due 27th)", 710.22, 0, 78.95, 27, "CURRENT", 17),
+    ("Affirm - 5 payments (due 17th)", 500, 0, 100, 17, "CURRENT", 18),
+    ("Affirm - 4 payments left (due 27th)", 400.01, 0, 133.33, 27, "CURRENT", 19),
+    ("Affirm - 12 payments (due 8th) B", 355.26, 0, 29.60, 8, "CURRENT", 20),
+    ("Affirm - 12 payments (due 10th)", 355.25, 0, 29.60, 10, "CURRENT", 21),
+    ("Affirm - 4 payments left", 250.01, 0, 83.33, 27, "CURRENT", 22),
+    ("AfterPay - Misc Travel", 190.55, 0, 190.55, 19, "CURRENT", 23),
+    ("Affirm - 3 payments left (due 24th)", 184.58, 0, 93.21, 24, "CURRENT", 24),
+    ("Sezzle - Clearcover (2)", 179.25, 0, 59.75, 7, "CURRENT", 25),
+    ("Sezzle - Jomashop", 126.42, 0, 63.21, 2, "CURRENT", 26),
+    ("Sezzle - Expedia", 108.75, 0, 108.75, 10, "CURRENT", 27),
+    ("Zip - Fashion Nova For Mom", 98.60, 0, 49.30, 29, "CURRENT", 28),
+    ("Zip - Vent De Sud", 47.00, 0, 23.50, 2, "CURRENT", 29),
+    ("Zip - Cash 3", 21.00, 0, 21.00, 18, "CURRENT", 30),
+]
+
+# Recurring non-debt bills: (name, amount, due day, BillFrequency)
+BILLS = [
+    ("Clearcover Insurance", 239, 23, "MONTHLY"),
+    ("iCloud", 15.99, 1, "MONTHLY"),  # Subscription/gym due days not on record; assumed 1st
+    ("Amazon Prime", 9.99, 1, "MONTHLY"),
+    ("Google One", 2.99, 1, "MONTHLY"),
+    ("Gym", 20, 1, "MONTHLY"),
+]
+
+# Every Dollar Budget lines: (name, amount per paycheck, notes), or for a bill
+# (name, amount, notes, BillFrequency), spread over the paychecks by paycheck_allocations
+ALLOCATIONS = [
+    ("BMW Auto Loan (CATCH UP FIRST!)", 437.37, "Due 4th - You're $1,204 behind"),
+    ("Sallie Mae", 192.10, "Due 7th - Current, keep it that way"),
+    ("LendKey (CATCH UP!)", 110.69, "Due 1st - You're $111 behind"),
+    ("Best Buy Credit Card", 230, "Due 8th - PRIORITY: Highest APR"),
+    ("Bank of America", 239.98, "Due 8th - PRIORITY: 2nd highest APR"),
+    ("Amex Green Card", 170, "Due 14th"),
+    ("Navy Federal Credit Card", 20, "Due 20th - Small balance, pay off soon"),
+    ("Clearcover Insurance", 239, "Due 23rd", "MONTHLY"),
+    ("Subscriptions (iCloud, Prime, Google)", 15.99 + 9.99 + 2.99, "Combined subscriptions", "MONTHLY"),
+    ("Gym", 20, "AMK Capital One Fitness", "MONTHLY"),
+]
+
+ACTIONS = [
+    ("WEEK 1", "EMERGENCY TRIAGE (Dec 27 - Jan 3)"),
+    ("", "• Take $250 and put aside $100 for absolute emergencies"),
+    ("", "• Call BMW Financial Services - you are $1,204 past due"),
+    ("", "  - Ask about forbearance or payment arrangement"),
+    ("", "  - Goal: Get them to stop any repo proceedings"),
+    ("", "• Call LendKey - you are $111 past due"),
+    ("", "  - Make minimum payment if you can"),
+    ("", "• DO NOT use any more credit cards or BNPL"),
+    ("", ""),
+    ("JAN 2026", "STABILIZE"),
+    ("", "• Your BNPL is ~$1,800 this month - that's painful but temporary"),
+    ("", "• Pay all minimums on time - no more missed payments"),
+    ("", "• Every dollar from paycheck goes to: Bills → Minimums → Food/Gas → Extra to BMW"),
+    ("", "• Nelnet deferment ends in Feb - prepare for $226/mo increase"),
+    ("", ""),
+    ("FEB-APR", "DEBT AVALANCHE BEGINS"),
+    ("", "• BNPL will drop significantly as loans close out"),
+    ("", "• Once BMW is current, attack Best Buy (29.99% APR)"),
+    ("", "• Target: Pay off Navy Federal $487 balance (quick win)"),
+    ("", ""),
+    ("MAY-AUG", "CREDIT CARD DESTRUCTION"),
+    ("", "• BNPL should be mostly gone by now"),
+    ("", "• All freed-up cash goes to Best Buy → Bank of America → Amex"),
+    ("", "• Start building $1,000 emergency fund (20% of surplus)"),
+    ("", ""),
+    ("SEP-DEC", "MOMENTUM"),
+    ("", "• Credit cards should be significantly lower"),
+    ("", "• Emergency fund at $1,000"),
+    ("", "• Continue avalanche method"),
+    ("", ""),
+    ("END 2026 GOALS", ""),
+    ("", "✓ Emergency fund: $1,000"),
+    ("", "✓ All accounts CURRENT (no past due)"),
+    ("", "✓ BNPL: GONE"),
+    ("", "✓ Credit cards: Reduced by 50%+ (~$8,000 remaining)"),
+    ("", "✓ Total debt: Under $65,000"),
+    ("", ""),
+    ("RULES", "NON-NEGOTIABLE"),
+    ("", "1. NO NEW DEBT - Cut up the credit cards if you have to"),
+    ("", "2. Every dollar has a job BEFORE you spend it"),
+    ("", "3. Check OpenFi every payday - know what's due"),
+    ("", "4. $0 impulse purchases - if it's not budgeted, it doesn't happen"),
+    ("", "5. If you get a windfall (tax refund, bonus), 100% to debt"),
+]
+
+# Targets the Action Plan checks against the projection: (label, metric, target, projection month).
+# metric is "total_debt", "emergency_fund" (at least the target) or a debt category (at most)
+GOALS = [
+    ("Emergency fund: $1,000", "emergency_fund", 1000, 12),
+    ("BNPL: GONE", "BNPL", 0, 12),
+    ("Credit cards: Reduced by 50%+ (~$8,000 remaining)", "CREDIT_CARD", 8000, 12),
+    ("Total debt: Under $65,000", "total_debt", 65000, 12),
+]
+
+DATE_FIELDS = ("as_of", "last_paycheck", "projection_start")
+
+
+@dataclass
+class ModelInputs:
+    as_of: date = date(2025, 12, 27)
+    cash_on_hand: float = 250
+    net_paycheck: float = 3049
+    paycheck_frequency: str = "biweekly"
+    last_paycheck: date = date(2025, 12, 24)  # Biweekly Wednesdays, as in src/lib/pay-periods.ts
+    living_expenses: list = field(default_factory=lambda: [
+        ("Food/Groceries", 400), ("Gas/Transportation", 200), ("Personal/Misc", 150)])
+    paycheck_living: list = field(default_factory=lambda: [
+        ("Groceries/Food", 200), ("Gas", 100), ("Personal/Misc", 75)])
+    all_debts: list = field(default_factory=lambda: list(ALL_DEBTS))
+    debt_types: list = None  # Prisma DebtType per all_debts row; None infers from names
+    bnpl_frequency: dict = None  # BNPL plan name -> weekly/biweekly/monthly; None follows the provider
+    bills: list = field(default_factory=lambda: list(BILLS))
+    category_notes: dict = field(default_factory=lambda: dict(CATEGORY_NOTES))
+    allocations: list = field(default_factory=lambda: list(ALLOCATIONS))
+    actions: list = field(default_factory=lambda: list(ACTIONS))
+    goals: list = field(default_factory=lambda: list(GOALS))
+
+    # Projection assumptions
+    projection_start: date = date(2026, 1, 1)
+    projection_months: int = 24  # Months shown on "2026 Projections", up to MAX_PROJECTION_MONTHS
+    projection_frequency: str = "monthly"  # One "2026 Projections" row per week, two weeks or month
+    payoff_horizon: int = 360  # Months simulated for per-account payoff dates
+    monthly_income: float = None  # None: net_paycheck x paychecks per month
+    monthly_living: float = None  # None: sum of living_expenses
+    debt_surplus_percent: float = 0.8  # Remaining 20% builds the emergency fund
+    extra_payment: float = 0  # Committed to debt every month before the surplus is split
+    emergency_fund_target: float = 1000
+
+    @property
+    def total_debt(self):
+        return derive(self).total_debt
+
+    def to_json(self):
+        data = asdict(self)
+        for key in DATE_FIELDS:
+            data[key] = data[key] and data[key].isoformat()
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+@dataclass
+class Aggregates:
+    """Every derived total, computed once per build and shared by the sheets."""
+    portfolio: Portfolio
+    category_balance: np.ndarray  # Per CATEGORIES
+    category_minimum: np.ndarray
+    total_debt: float
+    total_minimum: float
+    monthly_income: float
+    monthly_bills: float
+    monthly_living: float
+    paychecks_per_month: float
+
+    @property
+    def bnpl_monthly(self):
+        return float(self.category_minimum[CATEGORIES.index("BNPL")])
+
+    def debt_summary(self, notes):
+        """(label, balance, min monthly, notes) rows for the Snapshot breakdown; OTHER only when it holds debt."""
+        return [(SUMMARY_LABELS[c], float(b), float(m), notes.get(c, ""))
+                for c, b, m in zip(CATEGORIES, self.category_balance, self.category_minimum)
+                if c != "OTHER" or self.portfolio.category_mask(c).any()]
+
+
+def derive(inputs, portfolio=None):
+    """Derive every aggregate from the raw records in one vectorized pass."""
+    portfolio = portfolio or Portfolio.from_rows(
+        inputs.all_debts, start=inputs.projection_start, categories=inputs.debt_types)
+    per_category = portfolio.category_masks() @ np.stack([portfolio.balance, portfolio.min_payment], axis=1)
+    per_category = per_category.round(2)
+
+    amounts = np.asarray([amount for _, amount, *_ in inputs.bills], dtype=float)
+    per_month = np.asarray([BILLS_PER_MONTH[freq] for *_, freq in inputs.bills], dtype=float)
+    paychecks = PAYCHECKS_PER_MONTH[inputs.paycheck_frequency]
+    income = inputs.monthly_income
+    living = inputs.monthly_living
+    return Aggregates(
+        portfolio=portfolio,
+        category_balance=per_category[:, 0],
+        category_minimum=per_category[:, 1],
+        total_debt=round(float(portfolio.balance.sum()), 2),
+        total_minimum=round(float(portfolio.min_payment.sum()), 2),
+        monthly_income=round(inputs.net_paycheck * paychecks, 2) if income is None else income,
+        monthly_bills=round(float(amounts @ per_month), 2),
+        monthly_living=sum(amount for _, amount in inputs.living_expenses) if living is None else living,
+        paychecks_per_month=paychecks,
+    )
+
+
+def paycheck_allocations(inputs, totals=None):
+    """(name, amount per paycheck, notes) for each inputs.allocations line.
+
+    A bill line's amount is per its BillFrequency, spread over the month's
+    paychecks, so it follows paycheck_frequency.
+    """
+    totals = totals or derive(inputs)
+    rows = []
+    for name, amount, notes, *frequency in inputs.allocations:
+        if frequency:
+            amount = amount * BILLS_PER_MONTH[frequency[0]] / totals.paychecks_per_month
+        rows.append((name, amount, notes))
+    return rows
+
+
+def project(inputs, totals=None):
+    """Deterministic per-account projection for the workbook's assumptions, in exact cents."""
+    totals = totals or derive(inputs)
+    portfolio = totals.portfolio
+    return portfolio, simulate(
+        portfolio, inputs.payoff_horizon,
+        income=totals.monthly_income, bills=totals.monthly_bills, living=totals.monthly_living,
+        debt_share=inputs.debt_surplus_percent, ef_cap=inputs.emergency_fund_target,
+        extra=inputs.extra_payment, groups=portfolio.category_masks(), exact=True,
+        minimum_schedule=minimum_schedule(portfolio, inputs.projection_start, inputs.payoff_horizon,
+                                          inputs.bnpl_frequency),
+    )
+
+
+def load_inputs(path):
+    """Read a JSON file of ModelInputs fields; missing fields keep their defaults.
+
+    App data exports (a JSON export with a "debts" list, a CSV directory or a
+    SQLite snapshot) go through snapshot.load_snapshot instead.
+    """
+    from .snapshot import is_snapshot, load_snapshot
+
+    if is_snapshot(path):
+        return load_snapshot(path)
+    with open(path, encoding="utf-8") as f:
+        return inputs_from_data(json.load(f), source=path)
+
+
+def inputs_from_data(data, source="inputs"):
+    """ModelInputs from parsed JSON data, e.g. ModelInputs.to_json() output.
+
+    Debt, bill and allocation rows are checked as strictly as snapshot rows.
+    """
+    from .snapshot import check_input_rows
+
+    data = dict(data)
+    known = {f.name: f for f in fields(ModelInputs)}
+    unknown = sorted(set(data) - set(known))
+    if unknown:
+        raise ValueError(f"{source}: unknown input fields {', '.join(unknown)}")
+    for key in DATE_FIELDS:
+        if data.get(key):
+            data[key] = date.fromisoformat(data[key])
+    for key, value in data.items():
+        if isinstance(value, list):
+            data[key] = [tuple(item) if isinstance(item, list) else item for item in value]
+    check_input_rows(data, source)
+    return ModelInputs(**data)
@@ -0,0 +1,309 @@
+"""
+Day-by-day cash-flow ledger.
+
+The monthly engine decides how much goes where; this module places it on a
+calendar. Paychecks land on their actual pay dates, every bill and minimum
+on its due day (clamped to short months) and every BNPL installment on its
+own date (bnpl.py), living costs are spread evenly over each month's days,
+and the month's extra debt/savings allocation leaves on its last day. The
+running checking balance is a single cumsum over the day axis: events are
+scattered into per-day inflow/outflow arrays with np.bincount, so years of
+daily events across many accounts take a few milliseconds.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+
+from .bnpl import installments, minimum_schedule
+from .engine import CATEGORIES, Projection, month_grid, month_labels, simulate
+from .inputs import MAX_PROJECTION_MONTHS, PAYCHECKS_PER_MONTH, derive
+
+PAY_INTERVAL_DAYS = {"weekly": 7, "biweekly": 14}
+BILL_INTERVAL_DAYS = {"WEEKLY": 7, "BIWEEKLY": 14}
+
+
+@dataclass
+class Schedule:
+    """Every dated payment over the horizon as flat parallel arrays.
+
+    `kind` is the debt's category for minimums, "BILL" for bills and "EXTRA"
+    for the month-end extra debt/savings allocation.
+    """
+    start: date
+    days: int
+    month_start: np.ndarray   # Day offset of each month's 1st
+    month_len: np.ndarray
+    day: np.ndarray           # Day offset of each payment
+    amount: np.ndarray
+    name: np.ndarray
+    kind: np.ndarray
+    projection: Projection    # The monthly run the payments come from, with per-account arrays
+
+
+@dataclass
+class Ledger:
+    start: date
+    balance: np.ndarray       # End-of-day checking balance, one slot per day
+    inflow: np.ndarray
+    outflow: np.ndarray
+    schedule: Schedule
+    paydays: np.ndarray       # Day indexes with a paycheck
+
+    def __len__(self):
+        return len(self.balance)
+
+    def day(self, index):
+        return self.start + timedelta(days=int(index))
+
+    @property
+    def negative(self):
+        return self.balance < 0
+
+    def shortfalls(self):
+        """(first day, last day, lowest balance, lowest day) for each run of negative days."""
+        flags = np.concatenate([[False], self.negative, [False]]).astype(np.int8)
+        edges = np.flatnonzero(np.diff(flags))
+        runs = []
+        for first, end in zip(edges[::2], edges[1::2]):
+            low = first + int(np.argmin(self.balance[first:end]))
+            runs.append((first, end - 1, float(self.balance[low]), low))
+        return runs
+
+    def due_on(self, index, limit=3):
+        """Names of the biggest payments due on day `index`."""
+        schedule = self.schedule
+        hits = np.flatnonzero((schedule.day == index) & (schedule.amount > 0))
+        hits = hits[np.argsort(-schedule.amount[hits])][:limit]
+        return [str(schedule.name[i]) for i in hits]
+
+
+def pay_dates(anchor, frequency, start, end):
+    """Day offsets from `start` of every paycheck in [start, end)."""
+    days = (end - start).days
+    if frequency == "monthly":
+        months = np.arange(np.datetime64(start, "M"), np.datetime64(end, "M") + 1)
+        month_len = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(int)
+        dates = months.astype("datetime64[D]") + np.minimum(anchor.day, month_len) - 1
+        offsets = (dates - np.datetime64(start, "D")).astype(int)
+    else:
+        step = PAY_INTERVAL_DAYS[frequency]
+        first = (anchor - start).days % step
+        offsets = np.arange(first, days, step)
+    return offsets[(offsets >= 0) & (offsets < days)]
+
+
+def schedule(inputs, totals=None, months=None):
+    """Dated payments over `months` (default: the projection rows) from projection_start."""
+    totals = totals or derive(inputs)
+    months = months or inputs.projection_months
+    start = inputs.projection_start
+    month_start, month_len = month_grid(start, months)
+    days = int(month_start[-1] + month_len[-1])
+
+    # Minimums actually due each month (deferrals, payoffs) and the surplus split
+    portfolio = totals.portfolio
+    plan = installments(portfolio, start, inputs.bnpl_frequency, days)
+    scheduled = plan.monthly(months)
+    projection = simulate(
+        portfolio, months,
+        income=totals.monthly_income, bills=totals.monthly_bills, living=totals.monthly_living,
+        debt_share=inputs.debt_surplus_percent, ef_cap=inputs.emergency_fund_target,
+        extra=inputs.extra_payment, keep_accounts=True, exact=True,
+        minimum_schedule=minimum_schedule(portfolio, start, months, plan=plan),
+    )
+    minimums = projection.minimums[0]  # (months, accounts)
+
+    # BNPL installments land on their own dates, scaled to what the month actually
+    # charged (less once the waterfall has paid a plan down); the rest on the due day
+    by_installment = (portfolio.category == "BNPL")[None, :] & (scheduled > 0)
+    month = np.searchsorted(month_start, plan.day, side="right") - 1
+    share = np.divide(minimums, scheduled, out=np.zeros_like(minimums), where=by_installment)
+    names = np.asarray(portfolio.names, dtype=object)
+    due = np.minimum(portfolio.due_day[None, :], month_len[:, None]) - 1
+    day_parts = [(month_start[:, None] + due).ravel(), plan.day]
+    amount_parts = [np.where(by_installment, 0, minimums).ravel(), plan.amount * share[month, plan.account]]
+    name_parts = [np.tile(names, months), names[plan.account]]
+    kinds = portfolio.category.astype(object)
+    kind_parts = [np.tile(kinds, months), kinds[plan.account]]
+
+    for name, amount, due_day, frequency in inputs.bills:
+        if frequency in BILL_INTERVAL_DAYS:
+            step = BILL_INTERVAL_DAYS[frequency]
+            bill_days = np.arange((due_day - 1) % step, days, step)
+        else:
+            every = {"MONTHLY": 1, "YEARLY": 12}.get(frequency, months)  # ONCE: first month only
+            bill_days = month_start[::every] + np.minimum(due_day, month_len[::every]) - 1
+        day_parts.append(bill_days)
+        amount_parts.append(np.full(len(bill_days), float(amount)))
+        name_parts.append(np.full(len(bill_days), name, dtype=object))
+        kind_parts.append(np.full(len(bill_days), "BILL", dtype=object))
+
+    # Extra debt payments and savings leave on the month's last day
+    day_parts.append(month_start + month_len - 1)
+    amount_parts.append(projection.to_debt[0] + projection.to_savings[0])
+    name_parts.append(np.full(months, "Extra debt + savings", dtype=object))
+    kind_parts.append(np.full(months, "EXTRA", dtype=object))
+
+    return Schedule(start, days, month_start, month_len,
+                    day=np.concatenate(day_parts).astype(int),
+                    amount=np.concatenate(amount_parts),
+                    name=np.concatenate(name_parts),
+                    kind=np.concatenate(kind_parts),
+                    projection=projection)
+
+
+def simulate_ledger(inputs, totals=None, months=None):
+    """Daily ledger over `months` (default: the projection rows) from projection_start."""
+    totals = totals or derive(inputs)
+    plan = schedule(inputs, totals, months)
+    start, days = plan.start, plan.days
+
+    living = np.repeat(totals.monthly_living / plan.month_len, plan.month_len)
+    outflow = np.bincount(plan.day, weights=plan.amount, minlength=days) + living
+    paydays = pay_dates(inputs.last_paycheck or start, inputs.paycheck_frequency,
+                        start, start + timedelta(days=days))
+    inflow = np.bincount(paydays, minlength=days) * float(inputs.net_paycheck)
+    balance = inputs.cash_on_hand + np.cumsum(inflow - outflow)
+    return Ledger(start, balance, inflow, outflow, plan, paydays)
+
+
+@dataclass
+class PeriodProjection:
+    """The projection in weekly, biweekly or monthly periods from projection_start.
+
+    Flows are what lands in each period; balances are as of its last day.
+    """
+    start: date
+    frequency: str
+    first_day: np.ndarray     # Day offset of each period's first day
+    last_day: np.ndarray      # and of its last day
+    income: np.ndarray
+    bills: np.ndarray
+    debt_minimums: np.ndarray  # Non-BNPL minimums
+    bnpl: np.ndarray          # BNPL installments
+    living: np.ndarray
+    to_debt: np.ndarray       # Extra debt payments
+    to_savings: np.ndarray
+    balances: np.ndarray      # (periods, CATEGORIES)
+    emergency_fund: np.ndarray
+
+    def __len__(self):
+        return len(self.first_day)
+
+    def dates(self):
+        return [self.start + timedelta(days=int(d)) for d in self.first_day]
+
+    def labels(self):
+        if self.frequency == "monthly":
+            return month_labels(self.start, len(self))
+        return [d.strftime("%b %d %Y") for d in self.dates()]
+
+    def end_labels(self):
+        """Labels of each period's last day: the month itself for monthly periods."""
+        if self.frequency == "monthly":
+            return self.labels()
+        return [(self.start + timedelta(days=int(d))).strftime("%b %d %Y") for d in self.last_day]
+
+    @classmethod
+    def from_monthly(cls, start, projection, totals, months):
+        """Projection months as periods, from project()'s result (scenario 0)."""
+        bnpl = CATEGORIES.index("BNPL")
+        minimums = projection.group_minimums[0][:months]
+        month_start, month_len = month_grid(start, months)
+        return cls(
+            start=start, frequency="monthly", first_day=month_start, last_day=month_start + month_len - 1,
+            income=np.full(months, totals.monthly_income), bills=np.full(months, totals.monthly_bills),
+            debt_minimums=minimums.sum(axis=1) - minimums[:, bnpl], bnpl=minimums[:, bnpl],
+            living=np.full(months, totals.monthly_living), to_debt=projection.to_debt[0, :months],
+            to_savings=projection.to_savings[0, :months], balances=projection.group_balances[0, :months],
+            emergency_fund=projection.emergency_fund[0, :months],
+        )
+
+
+def project_periods(inputs, totals=None, frequency="biweekly", months=None):
+    """PeriodProjection over `months` (default: the projection rows) in `frequency` periods.
+
+    Periods start on paydays (every `frequency` days in step with the pay
+    dates), with a short first period up to the first payday, and are split
+    at each Dec 31 so that every period falls in one calendar year. Every
+    payment sits on its date in the schedule, so a balance mid-month is the
+    month-end balance plus that month's payments still to come: the engine
+    posts interest first, minimums leave on their due days and extra
+    payments and savings on the month's last day. Income is the engine's
+    monthly income split evenly over the month's paydays, so the periods of
+    a month add up to the monthly run.
+    """
+    totals = totals or derive(inputs)
+    plan = schedule(inputs, totals, months)
+    start, days, month_start, month_len = plan.start, plan.days, plan.month_start, plan.month_len
+    projection, portfolio = plan.projection, totals.portfolio
+    month_end = month_start + month_len - 1
+    paydays = pay_dates(inputs.last_paycheck or start, inputs.paycheck_frequency,
+                        start, start + timedelta(days=days))
+    step = PAY_INTERVAL_DAYS[frequency]
+    phase = paydays[0] % step if len(paydays) else 0
+    year_starts = month_start[(start.month - 1 + np.arange(len(month_start))) % 12 == 0]
+    first_day = np.unique(np.concatenate([[0], np.arange(phase, days, step), year_starts]))
+    last_day = np.append(first_day[1:], days) - 1
+
+    def per_period(day, amount):
+        period = np.searchsorted(first_day, day, side="right") - 1
+        return np.bincount(period, weights=amount, minlength=len(first_day))
+
+    def where(*kinds):
+        mask = np.isin(plan.kind, kinds)
+        return per_period(plan.day[mask], plan.amount[mask])
+
+    # A month without a payday (monthly pay late in a short month) takes its income on the 1st
+    pay_month = np.searchsorted(month_start, paydays, side="right") - 1
+    per_month = np.bincount(pay_month, minlength=len(month_start))
+    income_days = np.concatenate([paydays, month_start[per_month == 0]])
+    income_each = np.full(len(income_days), float(totals.monthly_income))
+    income_each[:len(paydays)] /= per_month[pay_month]
+    living = np.repeat(totals.monthly_living / month_len, month_len)
+
+    # Payments per category by day, cumulated: month-end balance + what the month still owes
+    masks = portfolio.category_masks()
+    waterfall = (projection.payments[0] - projection.minimums[0]) @ masks.T  # (months, CATEGORIES)
+    month = np.searchsorted(month_start, last_day, side="right") - 1
+    balances = (projection.balances[0] @ masks.T)[month]
+    for g, category in enumerate(CATEGORIES):
+        paid = plan.kind == category
+        daily = np.bincount(np.concatenate([plan.day[paid], month_end]),
+                            weights=np.concatenate([plan.amount[paid], waterfall[:, g]]), minlength=days)
+        paid_by = np.cumsum(daily)
+        balances[:, g] += paid_by[month_end[month]] - paid_by[last_day]
+
+    fund = projection.emergency_fund[0]
+    previous = np.concatenate([[0.0], fund[:-1]])
+    return PeriodProjection(
+        start=start,
+        frequency=frequency,
+        first_day=first_day,
+        last_day=last_day,
+        income=per_period(income_days, income_each),
+        bills=where("BILL"),
+        debt_minimums=where(*(c for c in CATEGORIES if c != "BNPL")),
+        bnpl=where("BNPL"),
+        living=np.add.reduceat(living, first_day),
+        to_debt=per_period(month_end, projection.to_debt[0]),
+        to_savings=per_period(month_end, projection.to_savings[0]),
+        balances=balances,
+        emergency_fund=np.where(last_day == month_end[month], fund[month], previous[month]),
+    )
+
+
+def projection_periods(inputs, totals, projection):
+    """The rows of "2026 Projections": `projection_months` in `projection_frequency` periods."""
+    frequency, months = inputs.projection_frequency, inputs.projection_months
+    if frequency not in PAYCHECKS_PER_MONTH:
+        raise ValueError(f"unknown projection_frequency {frequency!r} "
+                         f"(expected one of {', '.join(PAYCHECKS_PER_MONTH)})")
+    limit = min(MAX_PROJECTION_MONTHS, inputs.payoff_horizon)
+    if not 1 <= months <= limit:
+        raise ValueError(f"projection_months must be between 1 and {limit}, not {months}")
+    if frequency == "monthly":
+        return PeriodProjection.from_monthly(inputs.projection_start, projection, totals, months)
+    return project_periods(inputs, totals, frequency, months)
@@ -0,0 +1,128 @@
+"""
+Fixed-point money.
+
+`simulate(..., exact=True)` runs the projection in integer cents (NumPy
+int64), so every schedule is exact to the cent however many months it
+compounds. The posting rules match the app's column types: balances and
+payments are Decimal(10, 2), APRs Decimal(5, 2), the surplus split
+Decimal(5, 4).
+
+1. Amounts enter as whole cents, APRs as hundredths of a percent and the
+   debt share as basis points, each rounded half up from the given value.
+2. Interest posts monthly on the balance: balance x APR / 1200, rounded
+   half up to the cent.
+3. The savings share of the surplus is rounded half up to the cent. Debt
+   gets the rest, so no cent is lost.
+4. Everything else (minimums, the waterfall, the emergency fund) only adds
+   and subtracts cents, with no rounding.
+
+`simulate_decimal` applies the same rules one Decimal at a time. It is far
+too slow for the workbook but easy to check by hand, and `audit` compares
+the two.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+CENT = Decimal("0.01")
+BASIS_POINT = Decimal("0.0001")
+MONTHLY_RATE = 120000  # APR in hundredths of a percent -> monthly fraction: / 12 / 100 / 100
+
+
+def to_cents(values):
+    """Dollars (or percent) as int64 hundredths, rounded half up.
+
+    The product is rounded to 6 places first, so 1.005 becomes 101 as its
+    decimal spelling says, not 100 as its binary value would.
+    """
+    scaled = np.round(np.asarray(values, dtype=float) * 100, 6)
+    return (np.sign(scaled) * np.floor(np.abs(scaled) + 0.5)).astype(np.int64)
+
+
+def from_cents(cents):
+    return np.asarray(cents) / 100
+
+
+def to_basis_points(share):
+    """A fraction such as debt_surplus_percent as int64 basis points, rounded half up like to_cents."""
+    return np.floor(np.round(np.asarray(share, dtype=float) * 10000, 6) + 0.5).astype(np.int64)
+
+
+def half_up(numerator, denominator):
+    """numerator / denominator rounded half up, for non-negative int64 numerators."""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def to_decimal(value, places=CENT):
+    return Decimal(repr(float(value))).quantize(places, ROUND_HALF_UP)
+
+
+def simulate_decimal(portfolio, months, income, bills=0.0, living=0.0, debt_share=0.8,
+                     ef_cap=1000.0, extra=0.0, emergency_fund=0.0, order=None, first_month=1,
+                     minimum_schedule=None):
+    """One scenario of simulate(exact=True), one Decimal at a time.
+
+    `minimum_schedule` (T, n) is the amount due each month, as for simulate.
+    Returns (balances, funds): per month, the balances in inventory order
+    and the emergency fund after that month's postings.
+    """
+    from .engine import avalanche_order
+
+    order = list(avalanche_order(portfolio) if order is None else order)
+    bal = {i: to_decimal(portfolio.balance[i]) for i in order}
+    apr = {i: to_decimal(portfolio.apr[i]) for i in order}
+    fixed = {i: to_decimal(portfolio.min_payment[i]) for i in order}
+    cash = to_decimal(income) - to_decimal(bills) - to_decimal(living)
+    extra, ef_cap, ef = to_decimal(extra), to_decimal(ef_cap), to_decimal(emergency_fund)
+    savings_share = 1 - to_decimal(debt_share, BASIS_POINT)
+    zero = Decimal(0)
+
+    balances, funds = [], []
+    for t in range(months):
+        minimum = fixed if minimum_schedule is None else {
+            i: to_decimal(minimum_schedule[t][i]) for i in order}
+        for i in order:
+            bal[i] += (bal[i] * apr[i] / 1200).quantize(CENT, ROUND_HALF_UP)
+        paid = zero
+        for i in order:
+            if portfolio.start_month[i] <= first_month + t:
+                due = min(minimum[i], bal[i])
+                bal[i] -= due
+                paid += due
+
+        surplus = cash - paid
+        positive = max(surplus, zero)
+        committed = min(positive, extra)
+        room = max(ef_cap - ef, zero)
+        saved = min(((positive - committed) * savings_share).quantize(CENT, ROUND_HALF_UP), room)
+        left = budget = positive - saved
+        for i in order:
+            pay = min(left, bal[i])
+            bal[i] -= pay
+            left -= pay
+        ef += saved + left + min(surplus, zero)
+
+        balances.append([bal[i] for i in range(len(portfolio))])
+        funds.append(ef)
+    return balances, funds
+
+
+def audit(portfolio, months, **cash_flow):
+    """(month, account, cents, Decimal) wherever the int64 and Decimal runs differ; [] when they agree.
+
+    `cash_flow` takes the single-scenario keywords of simulate_decimal.
+    """
+    from .engine import simulate
+
+    fast = simulate(portfolio, months, exact=True, keep_accounts=True, **cash_flow)
+    reference, funds = simulate_decimal(portfolio, months, **cash_flow)
+    mismatches = []
+    for t in range(months):
+        cents = to_cents(fast.balances[0, t])
+        for i, name in enumerate(portfolio.names):
+            if Decimal(int(cents[i])) / 100 != reference[t][i]:
+                mismatches.append((t + 1, name, int(cents[i]), reference[t][i]))
+        if Decimal(int(to_cents(fast.emergency_fund[0, t]))) / 100 != funds[t]:
+            mismatches.append((t + 1, "emergency fund", int(to_cents(fast.emergency_fund[0, t])), funds[t]))
+    return mismatches
@@ -0,0 +1,107 @@
+"""
+Monte Carlo scenario mode for the debt-free date.
+
+Paths are sampled and simulated in chunks; each chunk is a single batched
+call into the engine (scenario axis = paths), and chunks fan out across a
+process pool. Only float32 month series come back from the workers, so the
+percentile bands are exact over every path.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import os
+
+import numpy as np
+
+from .engine import simulate
+
+PERCENTILES = (10, 50, 90)
+
+
+@dataclass
+class Shocks:
+    """Per-month randomness layered on the deterministic assumptions."""
+    income_sigma: float = 0.03      # Paycheck noise (overtime, withholding changes)
+    income_loss_rate: float = 0.01  # Chance per month of missing a paycheck
+    income_loss: float = 0.46       # Share of monthly income one biweekly check represents
+    overrun_rate: float = 0.25      # Chance per month living costs overrun
+    overrun_scale: float = 0.30     # Mean overrun as a share of living costs
+    apr_sigma: float = 2.0          # Std dev of variable (credit card) APR moves, in points
+
+
+@dataclass
+class MonteCarloResult:
+    paths: int
+    months: int
+    debt_bands: np.ndarray       # (len(PERCENTILES), months)
+    fund_bands: np.ndarray
+    payoff_bands: np.ndarray     # Debt-free month per percentile, months + 1 if beyond horizon
+    debt_free_share: float       # Share of paths debt-free within the horizon
+
+
+def sample_inputs(rng, portfolio, paths, months, income, living, shocks):
+    """Draw (income, living, apr) arrays for `paths` scenarios."""
+    noise = rng.normal(1.0, shocks.income_sigma, (paths, months))
+    missed = rng.random((paths, months)) < shocks.income_loss_rate
+    income_paths = income * noise * np.where(missed, 1.0 - shocks.income_loss, 1.0)
+
+    overrun = rng.random((paths, months)) < shocks.overrun_rate
+    extra_spend = rng.exponential(shocks.overrun_scale, (paths, months))
+    living_paths = living * (1.0 + np.where(overrun, extra_spend, 0.0))
+
+    variable = (portfolio.category == "CREDIT_CARD") & (portfolio.apr > 0)
+    drift = rng.normal(0.0, shocks.apr_sigma, (paths, 1))
+    apr = np.maximum(portfolio.apr + np.where(variable, drift, 0.0), 0.0)
+    return income_paths, living_paths, apr
+
+
+def _run_chunk(task):
+    portfolio, paths, months, seed, kwargs = task
+    rng = np.random.default_rng(seed)
+    shocks = kwargs.pop("shocks")
+    income, living, apr = sample_inputs(
+        rng, portfolio, paths, months, kwargs.pop("income"), kwargs.pop("living"), shocks)
+    result = simulate(portfolio, months, income=income, living=living, apr=apr, **kwargs)
+    return (result.total_debt.astype(np.float32),
+            result.emergency_fund.astype(np.float32),
+            result.payoff_month.astype(np.int16))
+
+
+def run_monte_carlo(portfolio, months, income, living, paths=100_000, bills=0.0,
+                    debt_share=0.8, ef_cap=1000.0, extra=0.0, shocks=None,
+                    seed=2026, workers=None, chunk_size=5_000):
+    """Simulate `paths` randomized scenarios and reduce them to percentile bands.
+
+    `workers=1` runs in-process; otherwise chunks go to a process pool sized
+    to the CPU count. Results are reproducible for a given seed and chunk size.
+    """
+    shocks = shocks or Shocks()
+    sizes = [chunk_size] * (paths // chunk_size)
+    if paths % chunk_size:
+        sizes.append(paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    kwargs = dict(income=income, living=living, bills=bills, debt_share=debt_share,
+                  ef_cap=ef_cap, extra=extra, shocks=shocks)
+    tasks = [(portfolio, size, months, s, dict(kwargs)) for size, s in zip(sizes, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        chunks = [_run_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            chunks = list(pool.map(_run_chunk, tasks))
+
+    debt = np.concatenate([c[0] for c in chunks])
+    fund = np.concatenate([c[1] for c in chunks])
+    payoff = np.concatenate([c[2] for c in chunks]).astype(np.int32)
+    finished = payoff > 0
+    payoff = np.where(finished, payoff, months + 1)
+
+    return MonteCarloResult(
+        paths=paths,
+        months=months,
+        debt_bands=np.percentile(debt, PERCENTILES, axis=0),
+        fund_bands=np.percentile(fund, PERCENTILES, axis=0),
+        payoff_bands=np.percentile(payoff, PERCENTILES, method="nearest"),
+        debt_free_share=float(finished.mean()),
+    )
@@ -0,0 +1,171 @@
+"""
+Strategy optimizer: search payoff orders, surplus splits and emergency-fund
+caps for the Pareto-best allocation policies.
+
+Every candidate is a scenario in one batched engine run. The horizon is
+walked in stages; after each stage, unfinished candidates that a finished
+one already beats on every objective (even under optimistic bounds) are
+dropped, so long tails are only simulated for policies still in contention.
+
+Objectives: total interest (lower), payoff month (lower) and cushion, the
+average emergency fund held while in debt (higher). Without the cushion
+the search would always pick "100% to debt, no emergency fund".
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .engine import PAID_OFF, avalanche_order, priority_order, simulate, snowball_order
+
+DEBT_SHARES = tuple(np.round(np.arange(0.5, 1.0001, 0.05), 2))
+EF_CAPS = (0, 500, 1000, 1500, 2000, 3000, 5000)
+HYBRID_WEIGHTS = tuple(np.round(np.linspace(0.0, 1.0, 21), 2))
+QUICK_WIN_LIMITS = (250, 500, 1000, 2500)
+
+
+@dataclass
+class Policy:
+    name: str
+    order: np.ndarray
+    debt_share: float
+    ef_cap: float
+
+
+@dataclass
+class Evaluation:
+    policy: Policy
+    total_interest: float
+    payoff_month: int        # -1 when not debt-free within the horizon
+    cushion: float
+
+
+def candidate_orders(portfolio):
+    """Named payoff orders: avalanche, snowball, hand priority, hybrids, quick wins."""
+    orders = [
+        ("Avalanche", avalanche_order(portfolio)),
+        ("Snowball", snowball_order(portfolio)),
+        ("Priority column", priority_order(portfolio)),
+    ]
+    n = len(portfolio)
+    apr_rank = np.argsort(np.argsort(-portfolio.apr, kind="stable")) / max(n - 1, 1)
+    balance_rank = np.argsort(np.argsort(portfolio.balance, kind="stable")) / max(n - 1, 1)
+    for w in HYBRID_WEIGHTS:
+        score = w * apr_rank + (1 - w) * balance_rank
+        orders.append((f"Hybrid {w:.0%} APR", np.lexsort((-portfolio.apr, score))))
+    for limit in QUICK_WIN_LIMITS:
+        small = portfolio.balance < limit
+        orders.append((f"Quick wins < ${limit:,}",
+                       np.lexsort((portfolio.balance, -portfolio.apr, ~small))))
+
+    # Drop orderings that collapse to the same permutation
+    unique, seen = [], set()
+    for name, order in orders:
+        key = order.tobytes()
+        if key not in seen:
+            seen.add(key)
+            unique.append((name, order))
+    return unique
+
+
+def candidate_policies(portfolio, debt_shares=DEBT_SHARES, ef_caps=EF_CAPS):
+    return [
+        Policy(name, order, float(share), float(cap))
+        for name, order in candidate_orders(portfolio)
+        for share in debt_shares
+        for cap in ef_caps
+    ]
+
+
+def pareto_front(points):
+    """Indices of non-dominated rows; columns are minimized."""
+    points = np.asarray(points, dtype=float)
+    keep = np.ones(len(points), dtype=bool)
+    for i in range(len(points)):
+        if not keep[i]:
+            continue
+        dominated = (np.all(points <= points[i], axis=1) & np.any(points < points[i], axis=1))
+        if dominated.any():
+            keep[i] = False
+    return np.flatnonzero(keep)
+
+
+def _evaluate(portfolio, policies, income, bills, living, extra, horizon, stage, prune):
+    """Staged batch evaluation; returns (interest, payoff, cushion) arrays.
+
+    Pruned candidates get payoff -2, candidates still in debt at the horizon -1.
+    """
+    count = len(policies)
+    orders = np.stack([p.order for p in policies])
+    shares = np.array([p.debt_share for p in policies])
+    caps = np.array([p.ef_cap for p in policies])
+
+    interest = np.zeros(count)
+    fund_sum = np.zeros(count)
+    payoff = np.full(count, -1)
+    balance = np.broadcast_to(portfolio.balance, (count, len(portfolio))).copy()
+    fund = np.zeros(count)
+    alive = np.arange(count)
+
+    for first in range(1, horizon + 1, stage):
+        months = min(stage, horizon - first + 1)
+        result = simulate(
+            portfolio, months, income=income, bills=bills, living=living, extra=extra,
+            debt_share=shares[alive], ef_cap=caps[alive], order=orders[alive],
+            balance=balance[alive], emergency_fund=fund[alive], first_month=first,
+        )
+        in_debt = np.cumsum(result.total_debt > PAID_OFF, axis=1) == np.arange(1, months + 1)
+        # Interest and cushion only count while still in debt (the payoff month included)
+        counted = np.concatenate([np.ones((len(alive), 1), bool), in_debt[:, :-1]], axis=1)
+        interest[alive] += (result.interest * counted).sum(axis=1)
+        fund_sum[alive] += (result.emergency_fund * counted).sum(axis=1)
+        done = result.payoff_month > 0
+        payoff[alive[done]] = first - 1 + result.payoff_month[done]
+        balance[alive] = result.final_balance
+        fund[alive] = result.emergency_fund[:, -1]
+        alive = alive[~done]
+        if not len(alive):
+            break
+
+        # Prune: a finished policy with no more interest, an earlier payoff and at
+        # least the best cushion this candidate could still reach dominates it
+        finished = np.flatnonzero(payoff > 0)
+        if prune and len(finished):
+            f_interest = interest[finished][None, :]
+            f_cushion = (fund_sum[finished] / payoff[finished])[None, :]
+            best_cushion = np.maximum(caps[alive], fund[alive])[:, None]
+            beaten = ((f_interest <= interest[alive][:, None])
+                      & (f_cushion >= best_cushion)).any(axis=1)
+            payoff[alive[beaten]] = -2  # Pruned, never reported
+            alive = alive[~beaten]
+            if not len(alive):
+                break
+
+    months_held = np.where(payoff > 0, payoff, horizon)
+    return interest, payoff, fund_sum / months_held
+
+
+def optimize(portfolio, income, bills=0.0, living=0.0, policies=None, horizon=360,
+             stage=12, extra=0.0):
+    """Evaluate candidate policies and return the Pareto front, best interest first."""
+    policies = policies or candidate_policies(portfolio)
+    interest, payoff, cushion = _evaluate(
+        portfolio, policies, income, bills, living, extra, horizon, stage, prune=True)
+    reached = np.flatnonzero(payoff > 0)
+    # Policies with identical outcomes (e.g. any split with a $0 cap) collapse to the first
+    points = np.column_stack([interest[reached], payoff[reached], -cushion[reached]])
+    _, first = np.unique(np.round(points, 2), axis=0, return_index=True)
+    reached, points = reached[np.sort(first)], points[np.sort(first)]
+    front = reached[pareto_front(points)]
+    front = front[np.lexsort((payoff[front], interest[front]))]
+    return [
+        Evaluation(policies[i], float(interest[i]), int(payoff[i]), float(cushion[i]))
+        for i in front
+    ]
+
+
+def evaluate(portfolio, policy, income, bills=0.0, living=0.0, horizon=360, extra=0.0):
+    """Full-horizon metrics for a single policy (e.g. the current 80/20 avalanche)."""
+    interest, payoff, cushion = _evaluate(
+        portfolio, [policy], income, bills, living, extra, horizon, horizon, prune=False)
+    return Evaluation(policy, float(interest[0]), int(payoff[0]), float(cushion[0]))
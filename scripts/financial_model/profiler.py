@@ -0,0 +1,151 @@
+"""
+Opt-in build instrumentation.
+
+build_model and save_model wrap every step in `profiler.phase(name)`: the
+shared derivations, each sheet and the final save. A BuildProfiler records
+wall time per phase, the cells written and styled on the sheets each phase
+created and, with `memory=True`, tracemalloc allocation deltas. Phases nest
+(a sheet that first needs the projection contains the "projection" phase).
+The result is written as Chrome trace JSON (open it in Perfetto or
+chrome://tracing; the same file carries a flat "phases" summary) or, with
+`cprofile=True`, as a cProfile dump for pstats/snakeviz.
+
+Without a profiler the hooks are a shared nullcontext and cost nothing.
+"""
+
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+
+
+class NullProfiler:
+    def phase(self, name, wb=None):
+        return nullcontext()
+
+
+NO_PROFILER = NullProfiler()
+
+
+def sheet_stats(ws):
+    """(cells written, cells with a style) of a worksheet or StreamingSheet."""
+    counts = getattr(type(ws), "counts", None)
+    if counts is not None:
+        return counts.fget(ws)
+    cells = ws._cells.values()
+    return len(cells), sum(1 for cell in cells if cell.has_style)
+
+
+class BuildProfiler:
+    """Records the phases of one build; use as a context manager.
+
+    `memory=True` traces allocations (several times slower; the timings are
+    then only good for comparing phases with each other). `cprofile=True`
+    runs cProfile over the outermost phases.
+    """
+
+    def __init__(self, memory=False, cprofile=False):
+        self.memory = memory
+        self.profile = cProfile.Profile() if cprofile else None
+        self.phases = []
+        self._stack = []
+        self._origin = time.perf_counter()
+        self._started_tracing = False
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name, wb=None):
+        """Time the enclosed step; sheets it adds to `wb` (or retitles, like the
+        default first sheet) are credited to it."""
+        record = dict(name=name, depth=len(self._stack))
+        titles = {id(ws): ws.title for ws in wb.worksheets} if wb is not None else None
+        if self.memory:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            record["_memory_start"] = current
+            record["_peak"] = current
+        if self.profile is not None and not self._stack:
+            self.profile.enable()
+        self._stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            end = time.perf_counter()
+            self._stack.pop()
+            if self.profile is not None and not self._stack:
+                self.profile.disable()
+            record["start"] = start - self._origin
+            record["seconds"] = end - start
+            if wb is not None:
+                record["_sheets"] = [ws for ws in wb.worksheets if titles.get(id(ws)) != ws.title]
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, record.pop("_peak"))
+                start_bytes = record.pop("_memory_start")
+                record["allocated_kb"] = round((current - start_bytes) / 1024, 1)
+                record["peak_kb"] = round((peak - start_bytes) / 1024, 1)
+                if self._stack:  # reset_peak() above hid this peak from the enclosing phase
+                    self._stack[-1]["_peak"] = max(self._stack[-1]["_peak"], peak)
+            self.phases.append(record)
+
+    def report(self):
+        """Phase summaries in start order; cell counts are read now, after streaming sheets finish."""
+        rows = []
+        for record in sorted(self.phases, key=lambda r: r["start"]):
+            row = {k: v for k, v in record.items() if not k.startswith("_")}
+            row["start"] = round(row["start"], 6)
+            row["seconds"] = round(row["seconds"], 6)
+            sheets = record.get("_sheets")
+            if sheets is not None:
+                stats = [sheet_stats(ws) for ws in sheets]
+                row["cells"] = sum(cells for cells, _ in stats)
+                row["styled"] = sum(styled for _, styled in stats)
+            rows.append(row)
+        return rows
+
+    def trace(self):
+        """Chrome trace-event document, with the flat report under "phases"."""
+        phases = self.report()
+        pid = os.getpid()
+        events = [dict(name=row["name"], ph="X", pid=pid, tid=0,
+                       ts=round(row["start"] * 1e6), dur=round(row["seconds"] * 1e6),
+                       args={k: v for k, v in row.items() if k not in ("name", "start", "seconds", "depth")})
+                  for row in phases]
+        return dict(traceEvents=events, displayTimeUnit="ms", phases=phases)
+
+    def write(self, path):
+        """Save a `.prof` path as a cProfile dump, anything else as a JSON trace."""
+        path = Path(path)
+        if path.suffix == ".prof":
+            if self.profile is None:
+                raise ValueError(f"{path}: this profiler was created without cprofile=True")
+            self.profile.dump_stats(path)
+        else:
+            path.write_text(json.dumps(self.trace(), indent=1) + "\n", encoding="utf-8")
+        return path
+
+    def format(self):
+        """Indented table of the phases for the console."""
+        lines = [f"{'phase':<34} {'seconds':>8} {'cells':>8} {'styled':>8}"
+                 + (f" {'alloc KB':>10} {'peak KB':>10}" if self.memory else "")]
+        for row in self.report():
+            name = "  " * row["depth"] + row["name"] + (" (cached)" if row.get("cached") else "")
+            line = f"{name:<34} {row['seconds']:>8.3f} {row.get('cells', ''):>8} {row.get('styled', ''):>8}"
+            if self.memory:
+                line += f" {row['allocated_kb']:>10} {row['peak_kb']:>10}"
+            lines.append(line)
+        return "\n".join(lines)
@@ -0,0 +1,285 @@
+"""
+Refinance and consolidation offers.
+
+An offer is a balance transfer (fee, promo APR for some months, then a
+regular APR), a personal consolidation loan or an auto refinance (fixed
+payment over a term, origination fee). A plan moves some all_debts accounts
+onto some offers; each offer's fee is added to what it takes on. Plans are
+ranked by interest saved over the payoff horizon (fees count as interest)
+against keeping every account as it is, and by the change in required
+payments per paycheck.
+
+Every account-to-offer assignment is too many plans to try, so the search
+grows plans one move at a time:
+
+* a move is only a candidate if the account's category fits the offer, its
+  balance fits the offer's limit and the offer's APR (promo or regular) is
+  below the account's; federal student loans are never moved, and moves
+  that save nothing on their own are dropped;
+* each round extends the BEAM best plans of the previous round by their
+  BRANCH most promising moves (by single-move saving), and a plan is only
+  extended again if its last move saved more interest.
+
+Each round is one batched engine run: every offer is an extra account slot,
+a plan's moved accounts start at zero and its offer slots at the moved
+balance plus fee, and minimums are per plan. Runs go in 12-month stages
+(promo ends are stage boundaries, where the offer APRs switch) and stop
+once every plan is debt-free. Minimums are each row's fixed payment; BNPL
+installment schedules are not used here, for the baseline either.
+"""
+
+from dataclasses import dataclass, field, fields
+import json
+
+import numpy as np
+
+from .engine import PAID_OFF, Portfolio, simulate
+from .inputs import derive
+from .optimizer import pareto_front
+
+OFFER_KINDS = ("balance_transfer", "consolidation_loan", "auto_refinance")
+# Debt categories each kind of offer can take; consolidation loans can take
+# private student loans but federal ones (see federal_loan) would lose their protections
+ELIGIBLE = {
+    "balance_transfer": ("CREDIT_CARD",),
+    "consolidation_loan": ("CREDIT_CARD", "BNPL", "STUDENT_LOAN"),
+    "auto_refinance": ("AUTO_LOAN",),
+}
+# The bucket an offer's new account lands in
+OFFER_CATEGORY = {"balance_transfer": "CREDIT_CARD", "consolidation_loan": "CREDIT_CARD",
+                  "auto_refinance": "AUTO_LOAN"}
+FEDERAL_SERVICERS = ("federal", "nelnet", "mohela", "aidvantage", "fedloan", "direct loan")
+BEAM = 16    # Plans extended per round
+BRANCH = 8   # Moves tried per extended plan
+STAGE = 12   # Months simulated between checks for all plans being debt-free
+
+DEFAULT_OFFERS = [
+    {"name": "0% balance transfer (18 mo, 3% fee)", "kind": "balance_transfer", "apr": 24.99,
+     "promo_apr": 0, "promo_months": 18, "fee_percent": 3, "limit": 10000},
+    {"name": "Personal loan 11.99% (36 mo)", "kind": "consolidation_loan", "apr": 11.99,
+     "term_months": 36, "fee_percent": 4, "limit": 25000},
+    {"name": "Auto refinance 5.99% (48 mo)", "kind": "auto_refinance", "apr": 5.99, "term_months": 48},
+]
+
+
+@dataclass
+class Offer:
+    name: str
+    kind: str
+    apr: float                  # Percent; after the promo period for balance transfers
+    fee_percent: float = 0      # Of the moved balance, added to it
+    limit: float = None         # Most the offer takes on, fee included; None for no limit
+    promo_apr: float = None     # Balance transfers: APR for the first promo_months
+    promo_months: int = 0
+    term_months: int = None     # Loans: the moved balance is paid off in equal payments
+    min_percent: float = 2      # Balance transfers: minimum payment as a percent of the moved balance
+    accounts: int = None        # Most accounts moved onto it; auto refinances take one
+
+    def __post_init__(self):
+        if self.kind not in OFFER_KINDS:
+            raise ValueError(f"offer {self.name!r}: unknown kind {self.kind!r} "
+                             f"(expected one of {', '.join(OFFER_KINDS)})")
+        if self.kind != "balance_transfer" and not self.term_months:
+            raise ValueError(f"offer {self.name!r}: a {self.kind} needs term_months")
+        if self.accounts is None and self.kind == "auto_refinance":
+            self.accounts = 1
+
+    @property
+    def lowest_apr(self):
+        return self.apr if self.promo_apr is None or not self.promo_months else min(self.apr, self.promo_apr)
+
+    def payment(self, principal):
+        """Minimum payment on `principal` moved onto the offer, fee included."""
+        if self.kind == "balance_transfer":
+            return np.round(principal * self.min_percent / 100, 2)
+        rate = self.apr / 1200
+        if rate == 0:
+            return np.round(principal / self.term_months, 2)
+        return np.round(principal * rate / (1 - (1 + rate) ** -self.term_months), 2)
+
+
+@dataclass
+class RefinancePlan:
+    moves: tuple              # (account name, offer name) pairs
+    interest: float           # Over the payoff horizon, fees included
+    interest_saved: float     # Against moving nothing
+    per_paycheck: float       # Change in required payments per paycheck in month 1; negative frees cash
+    payoff_month: int         # -1 when not debt-free within the horizon
+    pareto: bool = field(default=False)  # No other plan saves more AND frees more cash per paycheck
+
+
+def offers_from_data(data, source="offers"):
+    """Offers from a parsed JSON list of Offer fields."""
+    known = {f.name for f in fields(Offer)}
+    offers = []
+    for i, item in enumerate(data):
+        unknown = sorted(set(item) - known)
+        if unknown:
+            raise ValueError(f"{source}: offer {i + 1}: unknown fields {', '.join(unknown)}")
+        offers.append(Offer(**item))
+    names = [o.name for o in offers]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{source}: offer names must be unique")
+    return offers
+
+
+def load_offers(path):
+    with open(path, encoding="utf-8") as f:
+        return offers_from_data(json.load(f), source=path)
+
+
+class _Batch:
+    """Simulates plans (lists of (account, offer) index pairs) in one engine run per call."""
+
+    def __init__(self, inputs, totals, offers):
+        portfolio = totals.portfolio
+        n, k = len(portfolio), len(offers)
+        self.inputs, self.totals, self.offers, self.n = inputs, totals, offers, n
+        # Every offer is an extra account, empty until a plan moves balances onto it
+        self.portfolio = Portfolio(
+            names=portfolio.names + [o.name for o in offers],
+            balance=np.concatenate([portfolio.balance, np.zeros(k)]),
+            apr=np.concatenate([portfolio.apr, [o.apr for o in offers]]),
+            min_payment=np.concatenate([portfolio.min_payment, np.zeros(k)]),
+            due_day=np.concatenate([portfolio.due_day, np.ones(k, dtype=int)]),
+            priority=np.concatenate([portfolio.priority, np.arange(k) + portfolio.priority.max(initial=0) + 1]),
+            category=np.concatenate([portfolio.category, [OFFER_CATEGORY[o.kind] for o in offers]]),
+            start_month=np.concatenate([portfolio.start_month, np.ones(k, dtype=int)]),
+        )
+        self.fee = np.asarray([o.fee_percent / 100 for o in offers])
+        self.promo = [(j, o.promo_apr, o.promo_months) for j, o in enumerate(offers)
+                      if o.promo_apr is not None and o.promo_months]
+
+    def moved(self, plan):
+        """(offers,) balances moved onto each offer under `plan` and (offers,) fees on them."""
+        principal = np.zeros(len(self.offers))
+        for account, offer in plan:
+            principal[offer] += self.portfolio.balance[account]
+        return principal, np.round(principal * self.fee, 2)
+
+    def run(self, plans):
+        """(interest with fees, month-1 minimums, payoff month) arrays, one entry per plan."""
+        n, S = self.n, len(plans)
+        balance = np.broadcast_to(self.portfolio.balance, (S, len(self.portfolio))).copy()
+        minimum = np.broadcast_to(self.portfolio.min_payment, balance.shape).copy()
+        fees = np.zeros(S)
+        for s, plan in enumerate(plans):
+            principal, fee = self.moved(plan)
+            taken = principal + fee
+            fees[s] = fee.sum()
+            balance[s, [account for account, _ in plan]] = 0
+            balance[s, n:] = taken
+            minimum[s, n:] = [o.payment(b) for o, b in zip(self.offers, taken)]
+
+        assumptions = dict(income=self.totals.monthly_income, bills=self.totals.monthly_bills,
+                           living=self.totals.monthly_living, extra=self.inputs.extra_payment,
+                           debt_share=self.inputs.debt_surplus_percent, ef_cap=self.inputs.emergency_fund_target)
+        horizon = self.inputs.payoff_horizon
+        breaks = sorted({m + 1 for *_, m in self.promo if m < horizon}
+                        | set(range(1, horizon + 1, STAGE)))
+        interest, first_minimum = fees, None
+        payoff = np.full(S, -1)
+        fund = np.zeros(S)
+        for first, end in zip(breaks, breaks[1:] + [horizon + 1]):
+            apr = self.portfolio.apr.copy()
+            for j, promo_apr, months in self.promo:
+                if first <= months:
+                    apr[n + j] = promo_apr
+            # Avalanche on this stage's APRs: a 0% transfer is paid down last until its promo ends
+            order = np.lexsort((self.portfolio.balance, -apr))
+            result = simulate(self.portfolio, end - first, balance=balance, emergency_fund=fund,
+                              first_month=first, order=order, apr=apr, min_payment=minimum,
+                              exact=True, **assumptions)
+            interest = interest + result.interest.sum(axis=1)
+            if first_minimum is None:
+                first_minimum = result.minimums_paid[:, 0]
+            done = (payoff < 0) & (result.payoff_month > 0)
+            payoff[done] = first - 1 + result.payoff_month[done]
+            balance, fund = result.final_balance, result.emergency_fund[:, -1]
+            if (result.total_debt[:, -1] <= PAID_OFF).all():
+                break
+        return interest, first_minimum, payoff
+
+
+def federal_loan(name, category):
+    """Whether an account is a federal student loan, which no private offer may take."""
+    lowered = name.lower()
+    return category == "STUDENT_LOAN" and any(k in lowered for k in FEDERAL_SERVICERS)
+
+
+def candidate_moves(portfolio, offers):
+    """(account, offer) index pairs that could lower the account's interest."""
+    private = np.asarray([not federal_loan(name, category)
+                          for name, category in zip(portfolio.names, portfolio.category)], dtype=bool)
+    moves = []
+    for j, offer in enumerate(offers):
+        fits = portfolio.balance * (1 + offer.fee_percent / 100) <= (np.inf if offer.limit is None else offer.limit)
+        eligible = (np.isin(portfolio.category, ELIGIBLE[offer.kind]) & private & (portfolio.balance > PAID_OFF)
+                    & (portfolio.apr > offer.lowest_apr) & fits)
+        moves += [(int(i), j) for i in np.flatnonzero(eligible)]
+    return moves
+
+
+def evaluate_offers(inputs, offers, totals=None, top=20):
+    """(baseline, plans): moving nothing, and the `top` plans by interest saved.
+
+    Plans that are Pareto-best on interest saved and cash freed per paycheck
+    are flagged; ties on interest saved go to the plan freeing more cash.
+    """
+    totals = totals or derive(inputs)
+    portfolio = totals.portfolio
+    offers = [o if isinstance(o, Offer) else Offer(**o) for o in offers]
+    batch = _Batch(inputs, totals, offers)
+
+    def fits(plan):
+        taken = sum(batch.moved(plan))
+        counts = np.bincount([o for _, o in plan], minlength=len(offers))
+        return all((offer.limit is None or taken[j] <= offer.limit + PAID_OFF)
+                   and (offer.accounts is None or counts[j] <= offer.accounts)
+                   for j, offer in enumerate(offers))
+
+    (base_interest,), (base_minimum,), (base_payoff,) = batch.run([()])
+    results = {}  # Plan (sorted move tuple) -> (interest, month-1 minimums, payoff)
+
+    def evaluate(plans):
+        plans = [p for p in dict.fromkeys(plans) if p not in results]
+        if plans:
+            for plan, *outcome in zip(plans, *batch.run(plans)):
+                results[plan] = tuple(outcome)
+        return plans
+
+    singles = [(move,) for move in candidate_moves(portfolio, offers)]
+    evaluate(singles)
+    # Moves that save nothing on their own are never added to a plan
+    saving = {plan[0]: base_interest - results[plan][0] for plan in singles}
+    moves = sorted((m for m, saved in saving.items() if saved > 0), key=lambda m: -saving[m])
+
+    frontier = sorted((p for p in singles if saving[p[0]] > 0), key=lambda p: results[p][0])[:BEAM]
+    while frontier:
+        extended = []
+        for plan in frontier:
+            moved = {account for account, _ in plan}
+            branches = [tuple(sorted(plan + (m,))) for m in moves if m[0] not in moved]
+            extended += [p for p in branches if fits(p)][:BRANCH]
+        new = evaluate(extended)
+        # Keep extending only plans whose latest move lowered the interest
+        improved = [p for p in new if any(results[p][0] < results[p[:i] + p[i + 1:]][0] - PAID_OFF
+                                          for i in range(len(p)) if p[:i] + p[i + 1:] in results)]
+        frontier = sorted(improved, key=lambda p: results[p][0])[:BEAM]
+
+    def plan_of(plan, interest, minimum, payoff):
+        return RefinancePlan(
+            moves=tuple((portfolio.names[a], offers[o].name) for a, o in plan),
+            interest=round(float(interest), 2),
+            interest_saved=round(float(base_interest - interest), 2),
+            per_paycheck=round(float(minimum - base_minimum) / totals.paychecks_per_month, 2),
+            payoff_month=int(payoff),
+        )
+
+    plans = [plan_of(plan, *outcome) for plan, outcome in results.items()]
+    plans = [p for p in plans if p.interest_saved > 0]
+    if plans:
+        for i in pareto_front([(-p.interest_saved, p.per_paycheck) for p in plans]):
+            plans[i].pareto = True
+    plans.sort(key=lambda p: (-p.interest_saved, p.per_paycheck))
+    return plan_of((), base_interest, base_minimum, base_payoff), plans[:top]
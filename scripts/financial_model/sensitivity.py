@@ -0,0 +1,125 @@
+"""
+Two-way what-if sensitivity grid.
+
+Sweeps two inputs at once, e.g. extra monthly payment x living costs, and
+reports the debt-free month and total interest of every combination. Every
+grid point is one scenario on the engine's scenario axis, so a 50 x 50 grid
+is one batched simulation of 2,500 scenarios rather than 2,500 calls.
+Scenarios are split into chunks that keep the engine's (scenarios, months)
+and (scenarios, accounts) arrays small, and the chunks fan out across a
+process pool when there are several.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import os
+
+import numpy as np
+
+from .bnpl import minimum_schedule
+from .engine import simulate
+
+GRID_STEPS = 21
+# Scenarios x max(accounts, months) per chunk
+CHUNK_CELLS = 250_000
+
+
+@dataclass(frozen=True)
+class Axis:
+    label: str
+    kind: str        # "currency" or "percent"
+    low: float       # Range as absolute values, or with relative=True
+    high: float      # as multiples of the current value
+    relative: bool = False
+
+
+AXES = {
+    "extra_payment": Axis("Extra Payment / Mo", "currency", 0, 2000),
+    "living": Axis("Living / Mo", "currency", 0.5, 1.5, relative=True),
+    "net_paycheck": Axis("Net Paycheck", "currency", 0.7, 1.3, relative=True),
+    "debt_share": Axis("Debt Share of Surplus", "percent", 0.5, 1.0),
+}
+
+
+@dataclass
+class SensitivityGrid:
+    x: str
+    y: str
+    x_values: np.ndarray
+    y_values: np.ndarray
+    current: tuple                # (x, y) values of the inputs as they are
+    payoff_month: np.ndarray      # (len(y_values), len(x_values)), -1 when not within the horizon
+    total_interest: np.ndarray    # Same shape, over the payoff horizon
+
+
+def current_values(inputs, totals):
+    """Each axis's value for `inputs` as they are."""
+    return {
+        "extra_payment": inputs.extra_payment,
+        "living": totals.monthly_living,
+        "net_paycheck": inputs.net_paycheck,
+        "debt_share": inputs.debt_surplus_percent,
+    }
+
+
+def axis_values(axis, current, steps=GRID_STEPS):
+    spec = AXES[axis]
+    scale = current if spec.relative else 1
+    values = np.linspace(spec.low * scale, spec.high * scale, steps)
+    return values.round(4 if spec.kind == "percent" else 2)
+
+
+def _run_chunk(task):
+    portfolio, months, schedule, kwargs = task
+    result = simulate(portfolio, months, minimum_schedule=schedule, **kwargs)
+    return result.payoff_month.astype(np.int32), result.total_interest
+
+
+def sweep(inputs, totals, x="extra_payment", y="living", steps=GRID_STEPS, x_values=None,
+          y_values=None, workers=None):
+    """Simulate every (x, y) combination on the "2026 Projections" assumptions.
+
+    Axes are AXES keys; values default to `steps` points across each axis's
+    range. `workers=1` runs in-process.
+    """
+    for axis in (x, y):
+        if axis not in AXES:
+            raise ValueError(f"unknown sensitivity axis {axis!r} (expected one of {', '.join(AXES)})")
+    if x == y:
+        raise ValueError(f"sensitivity axes must differ, got {x!r} twice")
+    current = current_values(inputs, totals)
+    x_values = axis_values(x, current[x], steps) if x_values is None else np.asarray(x_values, dtype=float)
+    y_values = axis_values(y, current[y], steps) if y_values is None else np.asarray(y_values, dtype=float)
+
+    # Row-major grid: scenario k is (y_values[k // nx], x_values[k % nx])
+    grid = {x: np.tile(x_values, len(y_values)), y: np.repeat(y_values, len(x_values))}
+    params = dict(income=totals.monthly_income, bills=totals.monthly_bills, living=totals.monthly_living,
+                  debt_share=inputs.debt_surplus_percent, ef_cap=inputs.emergency_fund_target,
+                  extra=inputs.extra_payment)
+    axis_params = {"extra_payment": "extra", "living": "living", "debt_share": "debt_share"}
+    for axis, values in grid.items():
+        if axis == "net_paycheck":
+            params["income"] = values * totals.paychecks_per_month
+        else:
+            params[axis_params[axis]] = values
+
+    portfolio, months = totals.portfolio, inputs.payoff_horizon
+    schedule = minimum_schedule(portfolio, inputs.projection_start, months, inputs.bnpl_frequency)
+    scenarios = len(x_values) * len(y_values)
+    size = max(1, CHUNK_CELLS // max(len(portfolio), months, 1))
+    tasks = [(portfolio, months, schedule, {k: v[start:start + size] if np.ndim(v) else v for k, v in params.items()})
+             for start in range(0, scenarios, size)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        chunks = [_run_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            chunks = list(pool.map(_run_chunk, tasks))
+
+    shape = (len(y_values), len(x_values))
+    return SensitivityGrid(
+        x=x, y=y, x_values=x_values, y_values=y_values, current=(current[x], current[y]),
+        payoff_month=np.concatenate([c[0] for c in chunks]).reshape(shape),
+        total_interest=np.concatenate([c[1] for c in chunks]).reshape(shape),
+    )
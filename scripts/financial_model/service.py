@@ -0,0 +1,262 @@
+"""
+Local HTTP service that answers projections on demand.
+
+    GET  /projection[?income=&extra_payment=&debt_share=]  summary and monthly series (JSON)
+    POST /scenario   {"income": 7000, "extra_payment": 250, "debt_share": 0.9}
+                     the same for the overrides, plus the change against the baseline
+    GET  /workbook[?income=&extra_payment=&debt_share=]    the .xlsx
+
+`income` is monthly income, `extra_payment` a monthly amount committed to
+debt before the surplus split and `debt_share` the debt side of that split.
+
+Builds are CPU-bound, so they run in a process pool and the event loop only
+parses requests and writes responses. Every result is keyed by its kind and
+its inputs. Requests for a key that is already being computed await that
+computation instead of starting another, and finished results are kept in
+an LRU, so a dashboard polling one scenario costs one build. The baseline
+is reloaded, off the event loop, whenever the inputs file changes.
+
+Bad request parameters get a 400; anything that fails on the server's side
+(the inputs file, a build) is a 500.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from urllib.parse import parse_qsl, urlsplit
+import asyncio
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import os
+
+from .cache import normalized
+from .inputs import ModelInputs, load_inputs
+from .summary import projection_summary
+
+DEFAULT_PORT = 8787
+DEFAULT_RESULTS = 128
+MAX_BODY = 64 * 1024
+SCENARIO_FIELDS = {"income": "monthly_income", "extra_payment": "extra_payment",
+                   "debt_share": "debt_surplus_percent"}
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def apply_scenario(inputs, overrides):
+    """`inputs` with scenario overrides ({"income": ..., ...}) applied; ValueError on bad ones."""
+    unknown = sorted(set(overrides) - set(SCENARIO_FIELDS))
+    if unknown:
+        raise ValueError(f"unknown scenario fields {', '.join(unknown)} "
+                         f"(expected {', '.join(SCENARIO_FIELDS)})")
+    values = {}
+    for key, value in overrides.items():
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{key} must be a number, got {value!r}") from None
+        if not math.isfinite(number) or number < 0 or (key == "debt_share" and number > 1):
+            raise ValueError(f"{key} out of range: {value!r}")
+        values[SCENARIO_FIELDS[key]] = number
+    return replace(inputs, **values)
+
+
+# Run in the worker processes
+def _projection(inputs):
+    return projection_summary(inputs, series=True)
+
+
+def _workbook(inputs):
+    from .workbook import build_model
+
+    buffer = io.BytesIO()
+    build_model(inputs).save(buffer)
+    return buffer.getvalue()
+
+
+WORK = {"projection": _projection, "workbook": _workbook}
+
+
+def _difference(baseline, scenario):
+    def minus(a, b):
+        return None if a is None or b is None else round(a - b, 2)
+
+    return {
+        "debt_free": baseline["debt_free"],
+        "months_to_debt_free": minus(scenario["months_to_debt_free"], baseline["months_to_debt_free"]),
+        "interest_saved": minus(baseline["interest"]["horizon"], scenario["interest"]["horizon"]),
+        "emergency_fund": minus(scenario["end_of_projection"]["emergency_fund"],
+                                baseline["end_of_projection"]["emergency_fund"]),
+    }
+
+
+class ModelService:
+    """Coalescing, LRU-cached front for projection and workbook builds."""
+
+    def __init__(self, inputs_path=None, workers=None, results=DEFAULT_RESULTS):
+        self.inputs_path = inputs_path
+        # Forked workers would inherit the open client sockets, and a closed
+        # connection would not end until the worker did
+        context = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+        self.pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(context))
+        self.results = results
+        self.stats = dict(builds=0, hits=0, coalesced=0)
+        self._done = OrderedDict()
+        self._pending = {}
+        self._inputs = None
+        self._mtime = None
+        self.routes = {
+            "/projection": ("GET", self.projection),
+            "/scenario": ("POST", self.scenario),
+            "/workbook": ("GET", self.workbook),
+        }
+
+    async def inputs(self):
+        """Baseline inputs, reloaded in a thread when the inputs file's modification time changes."""
+        if self.inputs_path is None:
+            if self._inputs is None:
+                self._inputs = ModelInputs()
+            return self._inputs
+        try:
+            mtime = os.stat(self.inputs_path).st_mtime_ns
+            if mtime != self._mtime:
+                loaded = await asyncio.get_running_loop().run_in_executor(None, load_inputs, self.inputs_path)
+                self._inputs, self._mtime = loaded, mtime
+        except (OSError, ValueError) as e:
+            raise HTTPError(500, f"cannot load {self.inputs_path}: {e}") from None
+        return self._inputs
+
+    async def scenario_inputs(self, overrides):
+        """(baseline, baseline with `overrides`); bad overrides are the client's error."""
+        baseline = await self.inputs()
+        try:
+            return baseline, apply_scenario(baseline, overrides)
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+
+    async def result(self, kind, inputs):
+        """WORK[kind](inputs), from the LRU, an identical build in flight or a new one."""
+        payload = json.dumps(normalized(inputs), sort_keys=True)
+        key = (kind, hashlib.sha256(payload.encode()).hexdigest())
+        if key in self._done:
+            self._done.move_to_end(key)
+            self.stats["hits"] += 1
+            return self._done[key]
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.get_running_loop().run_in_executor(self.pool, WORK[kind], inputs)
+            pending.add_done_callback(lambda future: self._finish(key, future))
+            self._pending[key] = pending
+            self.stats["builds"] += 1
+        else:
+            self.stats["coalesced"] += 1
+        # A client that disconnects must not cancel the build others are awaiting
+        return await asyncio.shield(pending)
+
+    def _finish(self, key, future):
+        del self._pending[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._done[key] = future.result()
+        while len(self._done) > self.results:
+            self._done.popitem(last=False)
+
+    async def projection(self, query, body):
+        _, inputs = await self.scenario_inputs(query)
+        return await self.result("projection", inputs)
+
+    async def scenario(self, query, body):
+        try:
+            overrides = json.loads(body or b"{}")
+        except ValueError as e:
+            raise HTTPError(400, f"body is not JSON: {e}") from None
+        if not isinstance(overrides, dict):
+            raise HTTPError(400, "body must be a JSON object of scenario fields")
+        baseline, scenario_inputs = await self.scenario_inputs({**query, **overrides})
+        before, after = await asyncio.gather(self.result("projection", baseline),
+                                             self.result("projection", scenario_inputs))
+        return dict(scenario={**query, **overrides}, **after, vs_baseline=_difference(before, after))
+
+    async def workbook(self, query, body):
+        _, inputs = await self.scenario_inputs(query)
+        return await self.result("workbook", inputs)
+
+    async def _respond(self, reader):
+        request = (await reader.readline()).decode("latin-1").split()
+        if len(request) != 3:
+            raise HTTPError(400, "malformed request line")
+        method, target, _ = request
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = headers.get("content-length") or "0"
+        if not length.isdigit():
+            raise HTTPError(400, f"bad Content-Length {length!r}")
+        length = int(length)
+        if length > MAX_BODY:
+            raise HTTPError(413, f"body over {MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        route = self.routes.get(url.path)
+        if route is None:
+            raise HTTPError(404, f"no route {url.path} (try {', '.join(self.routes)})")
+        if method != route[0]:
+            raise HTTPError(405, f"{url.path} takes {route[0]}")
+        return await route[1](dict(parse_qsl(url.query)), body)
+
+    async def handle(self, reader, writer):
+        """asyncio.start_server callback: one request per connection."""
+        headers = {}
+        try:
+            result = await self._respond(reader)
+            status = 200
+        except HTTPError as e:
+            status, result = e.status, {"error": str(e)}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:  # A failed build must not take the service down
+            status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+        if isinstance(result, bytes):
+            headers["Content-Type"] = XLSX
+            headers["Content-Disposition"] = 'attachment; filename="financial_model.xlsx"'
+            body = result
+        else:
+            headers["Content-Type"] = "application/json"
+            body = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        head = [f"HTTP/1.1 {status} {REASONS[status]}", f"Content-Length: {len(body)}", "Connection: close",
+                *(f"{name}: {value}" for name, value in headers.items())]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _warm_up(self):
+        await self.result("projection", await self.inputs())
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, ready=None):
+        """Serve until cancelled; `ready(sockets)` is called once listening."""
+        server = await asyncio.start_server(self.handle, host, port)
+        # Start a worker and warm its imports before the first real request
+        warmup = asyncio.ensure_future(self._warm_up())
+        warmup.add_done_callback(lambda task: task.cancelled() or task.exception())
+        if ready is not None:
+            ready(server.sockets)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
@@ -0,0 +1,412 @@
+"""
+App data snapshots: build ModelInputs from the Prisma `User`/`Debt`/`Bill` rows.
+
+Three layouts are read, all using the Prisma field names:
+
+* a JSON export: {"user": {...}, "debts": [...], "bills": [...]}, with an
+  optional "exportedAt" timestamp
+* a directory of CSVs: debts.csv, bills.csv and an optional one-row user.csv
+* a local SQLite copy of the database (tables "User", "Debt", "Bill")
+
+Rows are validated up front and every problem is reported together. Inactive
+debts, PAID_OFF debts and bills linked to a debt (already counted as a
+minimum payment) are dropped, the same filters extract-financial-data.mjs uses.
+
+A snapshot is as of its export time, or else its latest updatedAt, so the
+same export always builds the same inputs (and hits the build cache).
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+import csv
+import json
+import sqlite3
+
+import numpy as np
+
+from .bnpl import FREQUENCIES as BNPL_FREQUENCIES
+from .engine import CATEGORIES, Portfolio, avalanche_order, debt_bucket
+from .inputs import BILLS_PER_MONTH, PAYCHECKS_PER_MONTH, ModelInputs
+
+DEBT_TYPES = ("CREDIT_CARD", "AUTO_LOAN", "STUDENT_LOAN", "PERSONAL_LOAN", "BNPL", "MORTGAGE", "OTHER")
+DEBT_STATUSES = ("CURRENT", "DEFERRED", "PAST_DUE", "IN_COLLECTIONS", "PAID_OFF")
+BILL_CATEGORIES = ("SUBSCRIPTION", "UTILITY", "LOAN", "BNPL", "INSURANCE", "CREDIT_CARD", "OTHER")
+BILL_FREQUENCIES = tuple(BILLS_PER_MONTH)
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+NON_NEGATIVE = dict(check=lambda v: v >= 0, message="is negative")
+DAY_OF_MONTH = dict(check=lambda v: 1 <= v <= 31, message="is not a day of the month")
+PERCENTAGE = dict(check=lambda v: 0 <= v <= 100, message="is not a percentage")
+
+
+@dataclass
+class DebtRecord:
+    name: str
+    type: str
+    status: str
+    balance: float
+    apr: float
+    min_payment: float
+    due_day: int
+    past_due: float = 0.0
+    deferred_until: date = None
+    frequency: str = None  # BNPL paymentFrequency
+
+
+@dataclass
+class BillRecord:
+    name: str
+    category: str
+    amount: float
+    due_day: int
+    frequency: str
+
+
+@dataclass
+class Snapshot:
+    user: dict
+    debts: list
+    bills: list
+    as_of: date = None  # exportedAt, else the latest updatedAt; None when the export has neither
+
+
+def is_snapshot(path):
+    """True for a CSV directory, a SQLite file or a JSON export with a "debts" list."""
+    path = Path(path)
+    if path.is_dir() or path.suffix.lower() in SQLITE_SUFFIXES:
+        return True
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return isinstance(data, dict) and isinstance(data.get("debts"), list)
+
+
+# ============== READERS ==============
+def read_json(path):
+    """(user, debts, bills, exportedAt) from a JSON export."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("user") or {}, data.get("debts", []), data.get("bills", []), data.get("exportedAt")
+
+
+def _read_csv(path):
+    if not path.exists():
+        return []
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def read_csv_dir(path):
+    path = Path(path)
+    if not (path / "debts.csv").exists():
+        raise ValueError(f"{path}: no debts.csv")
+    users = _read_csv(path / "user.csv")
+    return (users[0] if users else {}), _read_csv(path / "debts.csv"), _read_csv(path / "bills.csv")
+
+
+def read_sqlite(path, user_id=None):
+    con = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    con.row_factory = sqlite3.Row
+    try:
+        if user_id is None:
+            row = con.execute('SELECT * FROM "User" LIMIT 1').fetchone()
+        else:
+            row = con.execute('SELECT * FROM "User" WHERE id = ?', (user_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"{path}: no user{'' if user_id is None else ' ' + user_id}")
+        user = dict(row)
+        debts = [dict(r) for r in con.execute('SELECT * FROM "Debt" WHERE userId = ?', (user["id"],))]
+        bills = [dict(r) for r in con.execute('SELECT * FROM "Bill" WHERE userId = ?', (user["id"],))]
+    finally:
+        con.close()
+    return user, debts, bills
+
+
+# ============== VALIDATION ==============
+def _number(value):
+    # Prisma serializes Decimal as a string; CSV cells are always strings
+    return None if value is None or value == "" else float(value)
+
+
+def _integer(value):
+    number = _number(value)
+    return None if number is None else int(number)
+
+
+def _flag(value, default=True):
+    if value is None or value == "":
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "t", "yes")
+    return bool(value)
+
+
+def _date(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):  # Prisma's SQLite DateTime: epoch milliseconds
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc).date()
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date()
+
+
+class _Checker:
+    """Collects every problem in a snapshot so they are reported together."""
+
+    def __init__(self, source):
+        self.source = source
+        self.errors = []
+
+    def field(self, where, row, key, parse, required=True, check=None, message=""):
+        try:
+            value = parse(row.get(key))
+        except (TypeError, ValueError):
+            self.errors.append(f"{where}.{key}: cannot read {row.get(key)!r}")
+            return None
+        if value is None:
+            if required:
+                self.errors.append(f"{where}.{key}: missing")
+            return None
+        if check and not check(value):
+            self.errors.append(f"{where}.{key}: {value!r} {message}")
+        return value
+
+    def choice(self, where, row, key, choices, default=None):
+        value = row.get(key) or default
+        if value not in choices:
+            self.errors.append(f"{where}.{key}: {value!r} is not one of {', '.join(choices)}")
+        return value
+
+    def raise_if_any(self, what="snapshot"):
+        if self.errors:
+            raise ValueError(f"{self.source}: invalid {what}\n  " + "\n  ".join(self.errors))
+
+
+def parse_snapshot(user, debts, bills, source="snapshot", exported_at=None):
+    """Validate raw Prisma-shaped rows into a Snapshot of typed records."""
+    checker = _Checker(source)
+    rows = [("user", user), *((f"debts[{i}]", row) for i, row in enumerate(debts)),
+            *((f"bills[{i}]", row) for i, row in enumerate(bills))]
+    updated = [checker.field(where, row, "updatedAt", _date, required=False) for where, row in rows]
+    exported = checker.field("export", {"exportedAt": exported_at}, "exportedAt", _date, required=False)
+
+    debt_records = []
+    for i, row in enumerate(debts):
+        where = f"debts[{i}]"
+        status = checker.choice(where, row, "status", DEBT_STATUSES, default="CURRENT")
+        if not _flag(row.get("isActive")) or status == "PAID_OFF":
+            continue
+        name = (row.get("name") or "").strip()
+        if not name:
+            checker.errors.append(f"{where}.name: missing")
+        debt_records.append(DebtRecord(
+            name=name,
+            type=checker.choice(where, row, "type", DEBT_TYPES),
+            status=status,
+            balance=checker.field(where, row, "currentBalance", _number, **NON_NEGATIVE),
+            apr=checker.field(where, row, "interestRate", _number, **PERCENTAGE),
+            min_payment=checker.field(where, row, "minimumPayment", _number, **NON_NEGATIVE),
+            due_day=checker.field(where, row, "dueDay", _integer, **DAY_OF_MONTH),
+            past_due=checker.field(where, row, "pastDueAmount", _number, required=False) or 0.0,
+            deferred_until=checker.field(where, row, "deferredUntil", _date, required=False),
+            frequency=row.get("paymentFrequency") and checker.choice(where, row, "paymentFrequency",
+                                                                     BNPL_FREQUENCIES),
+        ))
+
+    bill_records = []
+    for i, row in enumerate(bills):
+        where = f"bills[{i}]"
+        if not _flag(row.get("isActive")) or row.get("debtId"):
+            continue
+        bill_records.append(BillRecord(
+            name=(row.get("name") or "").strip() or f"Bill {i + 1}",
+            category=checker.choice(where, row, "category", BILL_CATEGORIES, default="OTHER"),
+            amount=checker.field(where, row, "amount", _number, **NON_NEGATIVE),
+            due_day=checker.field(where, row, "dueDay", _integer, **DAY_OF_MONTH),
+            frequency=checker.choice(where, row, "frequency", BILL_FREQUENCIES, default="MONTHLY"),
+        ))
+
+    checker.choice("user", user, "paycheckFrequency", tuple(PAYCHECKS_PER_MONTH), default="biweekly")
+    checker.field("user", user, "paycheckAmount", _number, required=False, **NON_NEGATIVE)
+    checker.field("user", user, "paycheckDay", _integer, required=False,
+                  check=lambda v: 0 <= v <= 6, message="is not a weekday (0=Sun ... 6=Sat)")
+    checker.field("user", user, "lastPaycheckDate", _date, required=False)
+    checker.field("user", user, "debtSurplusPercent", _number, required=False,
+                  check=lambda v: 0 <= v <= 1, message="is not a fraction")
+    checker.raise_if_any()
+    as_of = exported or max(filter(None, updated), default=None)
+    return Snapshot(user, debt_records, bill_records, as_of)
+
+
+# ============== MODEL INPUT ROWS ==============
+# Positional fields of the ModelInputs row lists; an allocation's frequency is optional
+DEBT_ROW = ("name", "balance", "apr", "min_payment", "due_day", "status", "priority")
+BILL_ROW = ("name", "amount", "due_day", "frequency")
+ALLOCATION_ROW = ("name", "amount", "notes", "frequency")
+TEXT = dict(check=lambda v: v.strip(), message="is blank")
+
+
+def _json_number(value):
+    # Inputs JSON is typed: unlike export cells, numbers may not be strings
+    if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+        raise TypeError(value)
+    return value
+
+
+def _json_integer(value):
+    if _json_number(value) is not None and value != int(value):
+        raise ValueError(value)
+    return value
+
+
+def _string(value):
+    if value is not None and not isinstance(value, str):
+        raise TypeError(value)
+    return value
+
+
+def check_input_rows(data, source="inputs"):
+    """Check the all_debts, debt_types, bills and allocations rows of inputs `data` like snapshot rows.
+
+    Raises ValueError listing every problem.
+    """
+    checker = _Checker(source)
+
+    def rows(key, names, optional=0):
+        for i, row in enumerate(data.get(key) or ()):
+            where = f"{key}[{i}]"
+            if isinstance(row, (list, tuple)) and len(names) - optional <= len(row) <= len(names):
+                yield where, dict(zip(names, row))
+            else:
+                checker.errors.append(f"{where}: expected ({', '.join(names)}), got {row!r}")
+
+    for where, row in rows("all_debts", DEBT_ROW):
+        checker.field(where, row, "name", _string, **TEXT)
+        checker.field(where, row, "balance", _json_number, **NON_NEGATIVE)
+        checker.field(where, row, "apr", _json_number, **PERCENTAGE)
+        checker.field(where, row, "min_payment", _json_number, **NON_NEGATIVE)
+        checker.field(where, row, "due_day", _json_integer, **DAY_OF_MONTH)
+        checker.field(where, row, "status", _string)
+        checker.field(where, row, "priority", _json_integer)
+    for where, row in rows("bills", BILL_ROW):
+        checker.field(where, row, "name", _string, **TEXT)
+        checker.field(where, row, "amount", _json_number, **NON_NEGATIVE)
+        checker.field(where, row, "due_day", _json_integer, **DAY_OF_MONTH)
+        checker.choice(where, row, "frequency", BILL_FREQUENCIES)
+    for where, row in rows("allocations", ALLOCATION_ROW, optional=1):
+        checker.field(where, row, "name", _string, **TEXT)
+        checker.field(where, row, "amount", _json_number, **NON_NEGATIVE)
+        checker.field(where, row, "notes", _string)
+        if "frequency" in row:
+            checker.choice(where, row, "frequency", BILL_FREQUENCIES)
+
+    debt_types = data.get("debt_types")
+    if debt_types is not None:
+        for i, debt_type in enumerate(debt_types):
+            checker.choice(f"debt_types[{i}]", {"type": debt_type}, "type", DEBT_TYPES)
+        if data.get("all_debts") is not None and len(debt_types) != len(data["all_debts"]):
+            checker.errors.append(f"debt_types: {len(debt_types)} types for {len(data['all_debts'])} debts")
+    checker.raise_if_any("inputs")
+
+
+# ============== SNAPSHOT -> MODEL INPUTS ==============
+def _ordinal(day):
+    suffix = "th" if 11 <= day % 100 <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+    return f"{day}{suffix}"
+
+
+def _status_text(debt):
+    if debt.status == "PAST_DUE":
+        return f"PAST DUE - ${debt.past_due:,.0f}" if debt.past_due else "PAST DUE"
+    if debt.status == "DEFERRED" and debt.deferred_until:
+        return f"DEFERRED to {debt.deferred_until:%b %Y}"
+    return debt.status.replace("_", " ")
+
+
+def _category_notes(debts):
+    notes = {}
+    for category in CATEGORIES:
+        members = [d for d in debts if debt_bucket(d.type) == category]
+        past_due = [d for d in members if d.status == "PAST_DUE"]
+        deferred = [d for d in members if d.status == "DEFERRED" and d.deferred_until]
+        if past_due:
+            notes[category] = "; ".join(f"{d.name} is PAST DUE - ${d.past_due:,.0f} behind" for d in past_due)
+        elif deferred:
+            notes[category] = "; ".join(f"{d.name} deferred until {d.deferred_until:%b %Y}" for d in deferred)
+        elif members:
+            low, high = min(d.apr for d in members), max(d.apr for d in members)
+            notes[category] = f"{low:.0f}-{high:.0f}% APR" if high > low else f"{high:.0f}% APR"
+    return notes
+
+
+def to_inputs(snapshot, as_of=None, **overrides):
+    """ModelInputs for a validated Snapshot; `overrides` replace any field.
+
+    `as_of` defaults to the snapshot's own date, and to today only when the
+    export carries none.
+    """
+    as_of = as_of or snapshot.as_of or date.today()
+    user = snapshot.user
+    frequency = user.get("paycheckFrequency") or "biweekly"
+    paychecks = PAYCHECKS_PER_MONTH[frequency]
+
+    rows = [(d.name, d.balance, d.apr, d.min_payment, d.due_day, _status_text(d), 0)
+            for d in snapshot.debts]
+    order = avalanche_order(Portfolio.from_rows(rows)) if rows else np.arange(0)
+    all_debts = [rows[i][:6] + (rank,) for rank, i in enumerate(order, 1)]
+    debt_types = [snapshot.debts[i].type for i in order]
+
+    allocations = []
+    for (name, _, _, minpay, due, status, _), debt_type in zip(all_debts, debt_types):
+        if debt_type == "BNPL" or status.startswith("DEFERRED"):
+            continue  # BNPL has its own line; deferred loans have nothing due yet
+        notes = f"Due {_ordinal(due)}" + (f" - You're {status[len('PAST DUE - '):]} behind"
+                                          if status.startswith("PAST DUE - ") else "")
+        allocations.append((name, minpay, notes))
+    for bill in snapshot.bills:
+        if BILLS_PER_MONTH[bill.frequency]:
+            allocations.append((bill.name, bill.amount, f"Due {_ordinal(bill.due_day)}", bill.frequency))
+
+    values = dict(
+        as_of=as_of,
+        cash_on_hand=0,
+        paycheck_frequency=frequency,
+        all_debts=all_debts,
+        debt_types=debt_types,
+        bnpl_frequency={d.name: d.frequency for d in snapshot.debts if d.type == "BNPL" and d.frequency} or None,
+        bills=[(b.name, b.amount, b.due_day, b.frequency) for b in snapshot.bills],
+        category_notes=_category_notes(snapshot.debts),
+        allocations=allocations,
+        projection_start=date(as_of.year + as_of.month // 12, as_of.month % 12 + 1, 1),
+    )
+    last_paycheck = _date(user.get("lastPaycheckDate"))
+    if last_paycheck is None and _integer(user.get("paycheckDay")) is not None:
+        # paycheckDay is 0=Sun ... 6=Sat; take the latest such day on or before as_of
+        weekday = (_integer(user["paycheckDay"]) - 1) % 7  # date.weekday(): 0=Mon
+        last_paycheck = as_of - timedelta(days=(as_of.weekday() - weekday) % 7)
+    values["last_paycheck"] = last_paycheck
+    if _number(user.get("paycheckAmount")) is not None:
+        values["net_paycheck"] = _number(user["paycheckAmount"])
+    budget = _number(user.get("discretionaryBudgetMonthly"))
+    if budget is not None:
+        values["living_expenses"] = [("Living/Discretionary", budget)]
+        values["paycheck_living"] = [("Living/Discretionary", round(budget / paychecks, 2))]
+    if _number(user.get("debtSurplusPercent")) is not None:
+        values["debt_surplus_percent"] = _number(user["debtSurplusPercent"])
+    if _number(user.get("emergencyFundTarget")) is not None:
+        values["emergency_fund_target"] = _number(user["emergencyFundTarget"])
+    values.update(overrides)
+    return ModelInputs(**values)
+
+
+def load_snapshot(path, user_id=None, as_of=None, **overrides):
+    """ModelInputs from a JSON export, CSV directory or SQLite snapshot at `path`."""
+    path = Path(path)
+    exported_at = None
+    if path.is_dir():
+        user, debts, bills = read_csv_dir(path)
+    elif path.suffix.lower() in SQLITE_SUFFIXES:
+        user, debts, bills = read_sqlite(path, user_id)
+    else:
+        user, debts, bills, exported_at = read_json(path)
+    snapshot = parse_snapshot(user, debts, bills, source=str(path), exported_at=exported_at)
+    return to_inputs(snapshot, as_of=as_of, **overrides)
@@ -0,0 +1,128 @@
+"""
+Streaming (write-only) workbook output.
+
+openpyxl's write-only worksheets take whole rows through `append`, while the
+sheet builders address cells as `ws['B7']`. StreamingSheet bridges the two:
+it buffers only the row currently being written and flushes it as soon as a
+later row is touched, so the builders run unchanged and peak memory no
+longer grows with rows x columns. Rows must be written top to bottom.
+"""
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import column_index_from_string
+from openpyxl.utils.cell import coordinate_from_string
+
+
+class StreamingSheet:
+    def __init__(self, ws):
+        self._ws = ws
+        self._row = 1  # Row currently buffered
+        self._cells = {}
+        self._written = 0
+        self._styled = 0
+
+    def __getattr__(self, name):
+        # title, column_dimensions, freeze_panes, ... come from the real sheet
+        return getattr(self._ws, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._ws, name, value)
+
+    def _cell(self, coordinate):
+        column, row = coordinate_from_string(coordinate)
+        if row < self._row:
+            raise ValueError(f"{self._ws.title}!{coordinate}: row {row} was already streamed")
+        while row > self._row:
+            self._flush()
+        col = column_index_from_string(column)
+        if col not in self._cells:
+            self._cells[col] = WriteOnlyCell(self._ws)
+        return self._cells[col]
+
+    def _count(self, cells):
+        for cell in cells:
+            if cell is not None:
+                self._written += 1
+                self._styled += getattr(cell, "has_style", False)
+
+    def _flush(self):
+        self._count(self._cells.values())
+        width = max(self._cells, default=0)
+        self._ws.append([self._cells.get(col) for col in range(1, width + 1)])
+        self._cells = {}
+        self._row += 1
+
+    def __getitem__(self, coordinate):
+        return self._cell(coordinate)
+
+    def __setitem__(self, coordinate, value):
+        self._cell(coordinate).value = value
+
+    def append(self, values):
+        if self._cells:
+            self._flush()
+        self._count(values)
+        self._ws.append(values)
+        self._row += 1
+
+    def merge_cells(self, range_string):
+        self._ws.merged_cells.add(range_string)
+
+    @property
+    def counts(self):
+        """(cells written, cells with a style) so far."""
+        return self._written, self._styled
+
+    def close(self):
+        if self._cells:
+            self._flush()
+
+
+class StreamingWorkbook:
+    """Write-only Workbook whose sheets are StreamingSheets.
+
+    Each sheet is finished (its last row flushed) when the next one is created
+    or the workbook is saved; a sheet cannot be revisited afterwards.
+    """
+
+    def __init__(self):
+        self._wb = Workbook(write_only=True)
+        self._sheets = []
+
+    @property
+    def active(self):
+        return self._sheets[0] if self._sheets else self.create_sheet()
+
+    @property
+    def worksheets(self):
+        return list(self._sheets)
+
+    @property
+    def sheetnames(self):
+        return self._wb.sheetnames
+
+    @property
+    def named_styles(self):
+        return self._wb.named_styles
+
+    def add_named_style(self, style):
+        self._wb.add_named_style(style)
+
+    def create_sheet(self, title=None):
+        if self._sheets:
+            self._sheets[-1].close()
+        sheet = StreamingSheet(self._wb.create_sheet(title))
+        self._sheets.append(sheet)
+        return sheet
+
+    def __getitem__(self, title):
+        return next(s for s in self._sheets if s.title == title)
+
+    def save(self, filename):
+        if self._sheets:
+            self._sheets[-1].close()
+        self._wb.save(filename)
@@ -0,0 +1,105 @@
+"""
+Shared named-style registry for the workbook.
+
+Colours and fonts are defined once below and bundled into NamedStyles that
+are registered on the workbook up front. Cells then take a style by name
+through `style()`, which copies a cached style array onto the cell instead
+of building and de-duplicating a fresh Font/Fill per cell.
+"""
+
+from copy import copy
+from weakref import WeakKeyDictionary
+
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils.cell import get_column_letter, range_boundaries
+
+# Color constants (finance industry standard)
+NAVY = "1F4E79"
+BLUE_FONT = Font(color="0000FF")  # Inputs/assumptions
+BLACK_FONT = Font(color="000000", bold=False)  # Formulas
+GREEN_FONT = Font(color="008000")  # Cross-sheet links
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill("solid", fgColor=NAVY)
+INPUT_FILL = PatternFill("solid", fgColor="FFFFCC")
+ALERT_FILL = PatternFill("solid", fgColor="FFCCCC")
+SUCCESS_FILL = PatternFill("solid", fgColor="CCFFCC")
+PRIORITY_FILL = PatternFill("solid", fgColor="FFE4B5")  # Orange for high priority
+THIN_BORDER = Border(
+    left=Side(style='thin'), right=Side(style='thin'),
+    top=Side(style='thin'), bottom=Side(style='thin')
+)
+
+CURRENCY = '"$"#,##0.00'
+PERCENT = '0.00%'
+
+BOLD = Font(bold=True)
+
+STYLES = [
+    NamedStyle("Input Currency", number_format=CURRENCY, font=BLUE_FONT, fill=INPUT_FILL),
+    NamedStyle("Input Percent", number_format=PERCENT, font=BLUE_FONT, fill=INPUT_FILL),
+    NamedStyle("Input", font=BLUE_FONT, fill=INPUT_FILL),
+    NamedStyle("Currency", number_format=CURRENCY, font=DEFAULT_FONT),
+    NamedStyle("Percent", number_format=PERCENT, font=DEFAULT_FONT),
+    NamedStyle("Total Currency", number_format=CURRENCY, font=BOLD),
+    NamedStyle("Gain Currency", number_format=CURRENCY, font=Font(bold=True, color="008000")),
+    NamedStyle("Surplus Currency", number_format=CURRENCY, font=Font(bold=True, size=14),
+               fill=SUCCESS_FILL),
+    NamedStyle("Header", font=HEADER_FONT, fill=HEADER_FILL,
+               alignment=Alignment(horizontal='center')),
+    NamedStyle("Title", font=Font(bold=True, size=14, color=NAVY)),
+    NamedStyle("Title Large", font=Font(bold=True, size=16, color=NAVY)),
+    NamedStyle("Section", font=Font(bold=True, size=12)),
+    NamedStyle("Bold", font=BOLD),
+    NamedStyle("Note", font=Font(italic=True)),
+    NamedStyle("Alert", fill=ALERT_FILL, font=DEFAULT_FONT),
+    NamedStyle("Alert Bold", font=BOLD, fill=ALERT_FILL),
+    NamedStyle("Alert Currency", number_format=CURRENCY, fill=ALERT_FILL, font=DEFAULT_FONT),
+    NamedStyle("Alert Percent", number_format=PERCENT, fill=ALERT_FILL, font=DEFAULT_FONT),
+    NamedStyle("Success", fill=SUCCESS_FILL, font=DEFAULT_FONT),
+    NamedStyle("Success Bold", font=BOLD, fill=SUCCESS_FILL),
+    NamedStyle("Success Currency", number_format=CURRENCY, fill=SUCCESS_FILL, font=DEFAULT_FONT),
+    NamedStyle("Priority", fill=PRIORITY_FILL, font=DEFAULT_FONT),
+    NamedStyle("Date", number_format="mmm d, yyyy", font=DEFAULT_FONT),
+]
+
+
+def register_styles(wb):
+    """Add every named style to `wb` (idempotent)."""
+    for named in STYLES:
+        if named.name not in wb.named_styles:
+            wb.add_named_style(named)
+    return wb
+
+
+_ARRAYS = WeakKeyDictionary()  # Workbook -> {style name: StyleArray}
+
+
+def _style_array(wb, name):
+    arrays = _ARRAYS.setdefault(wb, {})
+    if name not in arrays:
+        arrays[name] = wb._named_styles[name].as_tuple()
+    return arrays[name]
+
+
+def style(ws, cells, name):
+    """Apply a registered style to one cell ('B7') or a block ('C5:O5')."""
+    array = _style_array(ws.parent, name)
+    if ":" not in cells:
+        ws[cells]._style = copy(array)
+        return
+    min_col, min_row, max_col, max_row = range_boundaries(cells)
+    for row in range(min_row, max_row + 1):
+        for col in range(min_col, max_col + 1):
+            ws[f"{get_column_letter(col)}{row}"]._style = copy(array)
+
+
+def format_currency(ws, cell, is_input=False):
+    style(ws, cell, "Input Currency" if is_input else "Currency")
+
+def format_percent(ws, cell, is_input=False):
+    style(ws, cell, "Input Percent" if is_input else "Percent")
+
+def set_header(ws, cell, value):
+    ws[cell] = value
+    style(ws, cell, "Header")
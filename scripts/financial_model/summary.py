@@ -0,0 +1,73 @@
+"""
+JSON summary of the projection.
+
+The numbers scripts and cron jobs usually want (totals, debt by category,
+the debt-free month, interest over the horizon) come straight from
+derive() and the simulation. This module imports numpy but never openpyxl,
+so `build-financial-model.py summary` starts in a fraction of the time a
+workbook build needs.
+"""
+
+from .engine import CATEGORIES, month_labels
+from .inputs import derive, project
+
+
+def _money(value):
+    return round(float(value), 2) + 0.0
+
+
+def projection_summary(inputs, totals=None, series=False):
+    """Plain-data summary of `inputs`, ready for json.dumps.
+
+    With `series=True` it also lists every projection month (the rows of
+    "2026 Projections") under "series".
+    """
+    totals = totals or derive(inputs)
+    portfolio, result = project(inputs, totals)
+    horizon = inputs.payoff_horizon
+    labels = month_labels(inputs.projection_start, horizon)
+    shown = min(inputs.projection_months, horizon)
+
+    def when(month):
+        return labels[month - 1] if month > 0 else None
+
+    payoff = int(result.payoff_month[0])
+    surplus = totals.monthly_income - totals.monthly_bills - totals.monthly_living - totals.total_minimum
+    summary = {
+        "as_of": inputs.as_of.isoformat(),
+        "monthly": {
+            "income": _money(totals.monthly_income),
+            "bills": _money(totals.monthly_bills),
+            "living": _money(totals.monthly_living),
+            "minimums": _money(totals.total_minimum),
+            "surplus": _money(surplus),
+        },
+        "debt": {
+            "total": _money(totals.total_debt),
+            "by_category": {c: _money(b) for c, b in zip(CATEGORIES, totals.category_balance)},
+        },
+        "debt_free": when(payoff),
+        "months_to_debt_free": payoff if payoff > 0 else None,
+        "interest": {
+            f"first_{shown}_months": _money(result.interest[0, :shown].sum()),
+            "horizon": _money(result.total_interest[0]),
+        },
+        "end_of_projection": {
+            "month": labels[shown - 1],
+            "total_debt": _money(result.total_debt[0, shown - 1]),
+            "emergency_fund": _money(result.emergency_fund[0, shown - 1]),
+        },
+        "accounts": [
+            {"name": name, "balance": _money(balance), "paid_off": when(int(month))}
+            for name, balance, month in zip(portfolio.names, portfolio.balance, result.account_payoff[0])
+        ],
+    }
+    if series:
+        summary["series"] = [
+            {"month": labels[t], "total_debt": _money(result.total_debt[0, t]),
+             "emergency_fund": _money(result.emergency_fund[0, t]), "interest": _money(result.interest[0, t]),
+             "minimums": _money(result.minimums_paid[0, t]), "to_debt": _money(result.to_debt[0, t]),
+             "to_savings": _money(result.to_savings[0, t])}
+            for t in range(shown)
+        ]
+    return summary
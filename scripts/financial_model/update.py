@@ -0,0 +1,390 @@
+"""
+Update an existing workbook in place.
+
+Every workbook carries the inputs and options it was built from (the hidden
+`_model` sheet). `update_model` diffs new inputs against them and, for each
+sheet whose input fields changed (SHEET_FIELDS), builds the sheet twice as
+SheetRecords: from the stored inputs and from the new ones. Only the cells
+where the two differ are spliced into that sheet's XML; every other part of
+the file is copied byte for byte. Notes typed next to the model, comments,
+charts, manual formatting and overrides of generated values the update does
+not touch all survive, and changing a few inputs costs a few small sheet
+builds instead of a full build and save. A patched cell keeps the user's
+formatting unless it still has the style the generator gave it.
+
+Row outline levels (the collapsible year groups of a long projection) are
+patched along with the cells. Inserting or deleting rows in a generated
+sheet moves cells away from the coordinates the generator knows; rebuild
+such a workbook instead.
+"""
+
+from datetime import date, datetime, time
+from numbers import Real
+from pathlib import Path
+from xml.sax.saxutils import escape
+import re
+import zipfile
+
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.utils.cell import coordinate_from_string
+from openpyxl.utils.datetime import to_excel
+
+from .cache import SheetRecord, _style_book, generator_version, normalized
+from .formulas import read_cells, rewrite_package, sheet_members, write_cached_values
+from .inputs import inputs_from_data
+from .profiler import NO_PROFILER
+from .workbook import (
+    MODEL_INFO_SHEET,
+    SHEET_FIELDS,
+    _Shared,
+    model_info_chunks,
+    model_sheets,
+    parse_model_info,
+)
+
+_SHEET_DATA = re.compile(r'<sheetData\s*/>|<sheetData>(.*?)</sheetData>', re.S)
+_ROW = re.compile(r'<row\b([^>]*?)(?:/>|>(.*?)</row>)', re.S)
+_CELL = re.compile(r'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_XF = re.compile(r'<xf\b([^>]*?)(?:/>|>(.*?)</xf>)', re.S)
+_ATTR = re.compile(r'([\w:]+)="([^"]*)"')
+_DIMENSION = re.compile(r'<dimension ref="([^"]+)"\s*/>')
+_MERGES = re.compile(r'<mergeCells\b[^>]*?(?:/>|>(.*?)</mergeCells>)', re.S)
+_MERGE_REF = re.compile(r'<mergeCell ref="([^"]+)"\s*/>')
+_SHEET_FORMAT = re.compile(r'<sheetFormatPr\b([^>]*?)/>')
+# Row outline attributes a builder sets through ws.row_dimensions, by their XML names
+_ROW_OUTLINE = {"outline_level": "outlineLevel", "hidden": "hidden", "collapsed": "collapsed"}
+_CACHED_RESULT = re.compile(r'</f><v>[^<]')
+# Elements that follow <mergeCells> in a worksheet (CT_Worksheet order)
+_AFTER_MERGES = ("phoneticPr", "conditionalFormatting", "dataValidations", "hyperlinks", "printOptions",
+                 "pageMargins", "pageSetup", "headerFooter", "rowBreaks", "colBreaks", "customProperties",
+                 "cellWatches", "ignoredErrors", "smartTags", "drawing", "legacyDrawing",
+                 "legacyDrawingHF", "picture", "oleObjects", "controls", "webPublishItems",
+                 "tableParts", "extLst")
+
+
+class _Text(str):
+    """A cell value stored as text even if it starts with "="."""
+
+
+def _attrs(text):
+    return dict(_ATTR.findall(text or ""))
+
+
+def _position(coordinate):
+    column, row = coordinate_from_string(coordinate)
+    return row, column_index_from_string(column)
+
+
+def _comparable(value):
+    if isinstance(value, datetime) and value.time() == time(0):
+        return value.date()
+    return value
+
+
+def _style_name(recorded):
+    if recorded is None or recorded._style is None:
+        return "Normal"
+    return _style_book()._named_styles[recorded._style.xfId].name
+
+
+class _Styles:
+    """Named styles and cell formats of styles.xml, appending formats the file lacks."""
+
+    def __init__(self, xml):
+        self.xml = xml
+        self.named = {a["name"]: int(a["xfId"])
+                      for a in map(_attrs, re.findall(r'<cellStyle\b([^>]*?)/>', xml))}
+        self.base = _XF.findall(self._block("cellStyleXfs"))
+        self.formats = _XF.findall(self._block("cellXfs"))
+        self.added = []
+        self._index = {}
+
+    def _block(self, tag):
+        match = re.search(rf'<{tag}\b[^>]*>(.*?)</{tag}>', self.xml, re.S)
+        return match.group(1) if match else ""
+
+    @staticmethod
+    def _key(attrs, inner, xf_id):
+        return (attrs.get("numFmtId", "0"), attrs.get("fontId", "0"), attrs.get("fillId", "0"),
+                attrs.get("borderId", "0"), str(xf_id), re.sub(r"\s+", "", inner or ""))
+
+    def key_of(self, index):
+        """Format key of cellXfs[index]; compares equal to named_key() for a plain named style."""
+        attrs, inner = self.formats[index] if index < len(self.formats) else ("", "")
+        attrs = _attrs(attrs)
+        return self._key(attrs, inner, attrs.get("xfId", "0"))
+
+    def named_key(self, name):
+        xf_id = self.named[name]
+        attrs, inner = self.base[xf_id]
+        return self._key(_attrs(attrs), inner, xf_id)
+
+    def index(self, name):
+        """cellXfs index that applies named style `name` and nothing else."""
+        if name not in self._index:
+            key = self.named_key(name)
+            found = next((i for i in range(len(self.formats)) if self.key_of(i) == key), None)
+            if found is None:
+                attrs, inner = self.base[self.named[name]]
+                attrs = _attrs(attrs)
+                flags = "".join(f' apply{flag}="1"' for flag in ("NumberFormat", "Font", "Fill", "Border"))
+                if inner:
+                    flags += ' applyAlignment="1"'
+                fields = "".join(f' {a}="{attrs.get(a, "0")}"' for a in ("numFmtId", "fontId", "fillId", "borderId"))
+                fields += f' xfId="{self.named[name]}"{flags}'
+                self.formats.append((fields, inner))
+                self.added.append(f'<xf{fields}>{inner}</xf>' if inner else f'<xf{fields}/>')
+                found = len(self.formats) - 1
+            self._index[name] = found
+        return self._index[name]
+
+    def text(self):
+        if not self.added:
+            return self.xml
+        count = len(self.formats)
+        xml = re.sub(r'<cellXfs\b[^>]*>', f'<cellXfs count="{count}">', self.xml, count=1)
+        return xml.replace("</cellXfs>", "".join(self.added) + "</cellXfs>", 1)
+
+
+def _cell_xml(coordinate, value, s):
+    style = f' s="{s}"' if s else ""
+    if value is None:
+        return f'<c r="{coordinate}"{style}/>' if s else None
+    if isinstance(value, str) and not isinstance(value, _Text) and value.startswith("=") and len(value) > 1:
+        return f'<c r="{coordinate}"{style}><f>{escape(value[1:])}</f></c>'
+    if isinstance(value, bool):
+        return f'<c r="{coordinate}"{style} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (date, datetime)):
+        value = to_excel(value)
+    if isinstance(value, Real):
+        number = "%.16g" % value  # As openpyxl writes numbers
+        return f'<c r="{coordinate}"{style} t="n"><v>{number}</v></c>'
+    text = str(value)
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<c r="{coordinate}"{style} t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+
+def _with_style(cell, s):
+    match = _CELL.match(cell)
+    attrs = _attrs(match.group(1))
+    attrs.pop("s", None)
+    if s:
+        attrs["s"] = str(s)
+    head = "".join(f' {k}="{v}"' for k, v in attrs.items())
+    return f'<c{head}>{match.group(2)}</c>' if match.group(2) is not None else f'<c{head}/>'
+
+
+
+def _patch_cells(xml, edits, styles):
+    """Splice `edits` ({(row, col): (coordinate, value, set_value, old style, new style)}) into sheet XML."""
+    match = _SHEET_DATA.search(xml)
+    rows = {}
+    for row in _ROW.finditer(match.group(1) or ""):
+        attrs = _attrs(row.group(1))
+        rows[int(attrs["r"])] = (attrs, row.group(0), row.group(2))
+
+    by_row = {}
+    for (r, c), edit in edits.items():
+        by_row.setdefault(r, {})[c] = edit
+    for r, row_edits in by_row.items():
+        attrs, _, inner = rows.get(r, ({"r": str(r)}, None, ""))
+        cells = {}
+        for cell in _CELL.finditer(inner or ""):
+            cells[_position(_attrs(cell.group(1))["r"])[1]] = cell.group(0)
+        for c, (coordinate, value, set_value, old_style, new_style) in row_edits.items():
+            current = cells.get(c)
+            s = styles.index(new_style)
+            if current is not None:
+                existing = int(_attrs(_CELL.match(current).group(1)).get("s", 0))
+                if styles.key_of(existing) != styles.named_key(old_style):
+                    s = existing  # Formatted by hand: keep it
+            if set_value:
+                cell = _cell_xml(coordinate, value, s)
+            else:
+                cell = _with_style(current, s) if current is not None else _cell_xml(coordinate, None, s)
+            if cell is None:
+                cells.pop(c, None)
+            else:
+                cells[c] = cell
+        attrs.pop("spans", None)  # Optional hint, stale once cells move
+        head = "".join(f' {k}="{v}"' for k, v in attrs.items())
+        body = "".join(cells[c] for c in sorted(cells))
+        rows[r] = (attrs, f'<row{head}>{body}</row>' if body or len(attrs) > 1 else "", body)
+
+    data = "".join(rows[r][1] for r in sorted(rows))
+    xml = xml[:match.start()] + (f'<sheetData>{data}</sheetData>' if data else '<sheetData/>') + xml[match.end():]
+    return _with_dimension(xml, rows)
+
+
+def _with_dimension(xml, rows):
+    # Cells are in column order within a row, so each row's last cell is its widest
+    last = [_position(inner[at + 6:inner.index('"', at + 6)]) for _, row, inner in rows.values()
+            if row and inner for at in [inner.rfind('<c r="')] if at >= 0]
+    if not last:
+        return xml
+    ref = f'A1:{get_column_letter(max(c for _, c in last))}{max(r for r, _ in last)}'
+    return _DIMENSION.sub(f'<dimension ref="{ref}"/>', xml, count=1)
+
+
+def _patch_merges(xml, remove, add):
+    if not remove and not add:
+        return xml
+    match = _MERGES.search(xml)
+    refs = _MERGE_REF.findall(match.group(1) or "") if match else []
+    refs = [ref for ref in refs if ref not in remove] + [ref for ref in add if ref not in refs]
+    block = (f'<mergeCells count="{len(refs)}">' + "".join(f'<mergeCell ref="{ref}"/>' for ref in refs)
+             + '</mergeCells>') if refs else ""
+    if match:
+        return xml[:match.start()] + block + xml[match.end():]
+    following = [m.start() for tag in _AFTER_MERGES for m in [re.search(rf'<{tag}\b', xml)] if m]
+    at = min(following, default=xml.rindex("</worksheet>"))
+    return xml[:at] + block + xml[at:]
+
+
+def _outline_attr(value):
+    if value is True:
+        return "1"
+    return str(value) if value else None
+
+
+def _patch_outline(xml, old, new):
+    """Set the row outline attributes (and sheet outline depth) of SheetRecord `new` where `old` differs."""
+    def outline(record, r):
+        dimension = record.row_dimensions.get(r)
+        return vars(dimension) if dimension is not None else {}
+
+    changed = {r for r in old.row_dimensions.keys() | new.row_dimensions.keys() if outline(old, r) != outline(new, r)}
+    if changed:
+        match = _SHEET_DATA.search(xml)
+        rows = {}
+        for row in _ROW.finditer(match.group(1) or ""):
+            attrs = _attrs(row.group(1))
+            rows[int(attrs["r"])] = (attrs, row.group(2))
+        for r in changed:
+            attrs, _ = rows.setdefault(r, ({"r": str(r)}, None))
+            for name, attr in _ROW_OUTLINE.items():
+                value = _outline_attr(outline(new, r).get(name))
+                if value is None:
+                    attrs.pop(attr, None)
+                else:
+                    attrs[attr] = value
+        data = ""
+        for r in sorted(rows):
+            attrs, inner = rows[r]
+            head = "".join(f' {k}="{v}"' for k, v in attrs.items())
+            data += f'<row{head}>{inner}</row>' if inner is not None else f'<row{head}/>'
+        xml = xml[:match.start()] + (f'<sheetData>{data}</sheetData>' if data else '<sheetData/>') + xml[match.end():]
+
+    level = getattr(new.sheet_format, "outlineLevelRow", None)
+    if level != getattr(old.sheet_format, "outlineLevelRow", None):
+        match = _SHEET_FORMAT.search(xml)
+        if match:
+            attrs = _attrs(match.group(1))
+            attrs.pop("outlineLevelRow", None)
+            if level:
+                attrs["outlineLevelRow"] = str(level)
+            head = "".join(f' {k}="{v}"' for k, v in attrs.items())
+            xml = xml[:match.start()] + f'<sheetFormatPr{head}/>' + xml[match.end():]
+    return xml
+
+
+def _sheet_edits(old, new):
+    """Edits for the cells where SheetRecords `old` and `new` differ."""
+    edits = {}
+    for coordinate in old.cells.keys() | new.cells.keys():
+        before, after = old.cells.get(coordinate), new.cells.get(coordinate)
+        old_value = before.value if before is not None else None
+        new_value = after.value if after is not None else None
+        old_style, new_style = _style_name(before), _style_name(after)
+        set_value = _comparable(old_value) != _comparable(new_value)
+        if set_value or old_style != new_style:
+            edits[_position(coordinate)] = (coordinate, new_value, set_value, old_style, new_style)
+    return edits
+
+
+def _record(build):
+    record = SheetRecord()
+    build(record.book)
+    return record
+
+
+def _without_calc_chain(name, data):
+    # Excel's list of formula cells; it must not name cells that are no longer formulas
+    if name == "xl/calcChain.xml":
+        return None
+    if name == "xl/_rels/workbook.xml.rels":
+        return re.sub(rb'<Relationship\b[^>]*calcChain\.xml"[^>]*/>', b"", data)
+    if name == "[Content_Types].xml":
+        return re.sub(rb'<Override\b[^>]*calcChain\.xml"[^>]*/>', b"", data)
+    if name == "xl/workbook.xml":  # Let Excel recalculate what the patch did not
+        data = re.sub(rb'\sfullCalcOnLoad="[^"]*"', b"", data)
+        return re.sub(rb'<calcPr\b', b'<calcPr fullCalcOnLoad="1"', data, count=1)
+    return data
+
+
+def update_model(inputs, path, output=None, cached_values=None, profiler=None):
+    """Patch the workbook at `path` for new `inputs`, saving to `output` (default: in place).
+
+    Returns {sheet title: cells written} for the sheets that were affected.
+    Raises ValueError if `path` was not built by this generator. Formula
+    results are re-evaluated when `cached_values` is set or, by default,
+    when the patched sheets already held cached results.
+
+    If the generator itself changed since the file was built, every sheet is
+    diffed, with the stored inputs rendered by the current code.
+    """
+    path, output = Path(path), Path(output or path)
+    profiler = profiler or NO_PROFILER
+    with profiler.phase("read"):
+        stored = read_cells(path, sheets={MODEL_INFO_SHEET}).get(MODEL_INFO_SHEET)
+        if not stored:
+            raise ValueError(f"{path}: not built by this generator (no {MODEL_INFO_SHEET} sheet); rebuild it")
+        info = parse_model_info(value for _, value in sorted(stored.items(), key=lambda kv: _position(kv[0])))
+        with zipfile.ZipFile(path) as archive:
+            members = dict(sheet_members(archive))
+            styles = _Styles(archive.read("xl/styles.xml").decode("utf-8"))
+            sheets = {title: archive.read(member).decode("utf-8") for title, member in members.items()}
+
+    old_inputs = inputs_from_data(info["inputs"], source=f"{path} {MODEL_INFO_SHEET}")
+    old_data, new_data = info["inputs"], normalized(inputs)
+    changed = {f for f in new_data if new_data[f] != old_data.get(f)}
+    everything = info["generator"] != generator_version()
+
+    old_sheets = dict(model_sheets(_Shared(old_inputs, profiler), **info["options"]))
+    new_sheets = dict(model_sheets(_Shared(inputs, profiler), **info["options"]))
+    patched, replaced = {}, {}
+    for title, build in new_sheets.items():
+        if title not in sheets or not (everything or changed & set(SHEET_FIELDS[title])):
+            continue
+        with profiler.phase(f"patch: {title}"):
+            old, new = _record(old_sheets[title]), _record(build)
+            edits = _sheet_edits(old, new)
+            xml = _patch_cells(sheets[title], edits, styles)
+            xml = _patch_merges(xml, set(old.merges) - set(new.merges), [m for m in new.merges
+                                                                         if m not in old.merges])
+            xml = _patch_outline(xml, old, new)
+            patched[title] = len(edits)
+            if cached_values is None and _CACHED_RESULT.search(sheets[title]):
+                cached_values = True
+            replaced[members[title]] = xml
+
+    if not changed and not everything and output == path:
+        return patched
+    chunks = model_info_chunks(inputs, info["options"])
+    old_chunks = sorted(_position(c) for c in stored)
+    info_edits = {(r, 1): (f'A{r}', _Text(chunks[r - 1]) if r <= len(chunks) else None, True, "Normal", "Normal")
+                  for r in range(1, max(len(chunks), len(old_chunks)) + 1)}
+    replaced[members[MODEL_INFO_SHEET]] = _patch_cells(sheets[MODEL_INFO_SHEET], info_edits, styles)
+    replaced["xl/styles.xml"] = styles.text()
+
+    def transform(name, data):
+        if name in replaced:
+            return replaced[name].encode("utf-8")
+        return _without_calc_chain(name, data)
+
+    with profiler.phase("write"):
+        rewrite_package(path, transform, output)
+    if cached_values:
+        with profiler.phase("cached values"):
+            write_cached_values(output)
+    return patched
@@ -0,0 +1,1057 @@
+"""
+Workbook builder: turns ModelInputs into the six-sheet financial model.
+
+Nothing here runs at import time; `build_model(inputs)` returns an openpyxl
+Workbook and leaves saving to the caller, `save_model` builds and saves
+through an optional BuildCache.
+"""
+
+from datetime import date, timedelta
+from functools import cached_property
+import json
+import math
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+from .bnpl import installments
+from .cache import SheetRecord, generator_version, normalized
+from .engine import CATEGORIES, CATEGORY_LABELS, PAID_OFF, avalanche_order, month_labels
+from .formulas import write_cached_values
+from .goals import check_goals
+from .inputs import PAYCHECKS_PER_YEAR, ModelInputs, derive, paycheck_allocations, project
+from .ledger import projection_periods, simulate_ledger
+from .montecarlo import PERCENTILES, run_monte_carlo
+from .optimizer import Policy, evaluate, optimize
+from .paychecks import KIND_LABELS, paycheck_plan
+from .profiler import NO_PROFILER
+from .sensitivity import AXES, sweep
+from .streaming import StreamingWorkbook
+from .styles import format_currency, format_percent, register_styles, set_header, style
+
+MONTE_CARLO_MONTHS = 60
+PAY_PERIOD_LENGTHS = {"weekly": "1 week", "biweekly": "2 weeks", "monthly": "1 month"}
+
+
+# ============== SHEET 1: SNAPSHOT ==============
+def build_snapshot(wb, inputs, totals):
+    ws1 = wb.active
+    ws1.title = "Snapshot"
+    ws1.column_dimensions['A'].width = 35
+    ws1.column_dimensions['B'].width = 18
+    ws1.column_dimensions['C'].width = 18
+    ws1.column_dimensions['D'].width = 50
+
+    # Title
+    ws1['A1'] = f"FINANCIAL SNAPSHOT - {inputs.as_of:%B} {inputs.as_of.day}, {inputs.as_of.year}".upper()
+    style(ws1, 'A1', "Title Large")
+    ws1.merge_cells('A1:D1')
+
+    # Current Reality
+    ws1['A3'] = "CURRENT REALITY"
+    style(ws1, 'A3', "Section")
+
+    ws1['A4'] = "Cash on Hand (as of today)"
+    ws1['B4'] = inputs.cash_on_hand
+    format_currency(ws1, 'B4', True)
+
+    paychecks_per_year = PAYCHECKS_PER_YEAR[inputs.paycheck_frequency]
+    ws1['A5'] = f"Net Paycheck ({inputs.paycheck_frequency})"
+    ws1['B5'] = inputs.net_paycheck
+    format_currency(ws1, 'B5', True)
+
+    ws1['A6'] = "Monthly Income (approx)"
+    ws1['B6'] = f"=B5*{paychecks_per_year}/12"
+    format_currency(ws1, 'B6')
+
+    ws1['A7'] = "Annual Income"
+    ws1['B7'] = f"=B5*{paychecks_per_year}"
+    format_currency(ws1, 'B7')
+
+    # Total Debt by Category
+    ws1['A9'] = "TOTAL DEBT BREAKDOWN"
+    style(ws1, 'A9', "Section")
+
+    set_header(ws1, 'A10', "Debt Category")
+    set_header(ws1, 'B10', "Balance")
+    set_header(ws1, 'C10', "Min Monthly")
+    set_header(ws1, 'D10', "Notes")
+
+    row = 11
+    for name, balance, minpay, notes in totals.debt_summary(inputs.category_notes):
+        ws1[f'A{row}'] = name
+        ws1[f'B{row}'] = balance
+        format_currency(ws1, f'B{row}')
+        ws1[f'C{row}'] = minpay
+        format_currency(ws1, f'C{row}')
+        ws1[f'D{row}'] = notes
+        if "PAST DUE" in notes or "HIGH" in notes:
+            style(ws1, f'A{row}', "Alert")
+        row += 1
+
+    ws1[f'A{row}'] = "TOTAL DEBT"
+    style(ws1, f'A{row}', "Bold")
+    ws1[f'B{row}'] = f"=SUM(B11:B{row-1})"
+    ws1[f'C{row}'] = f"=SUM(C11:C{row-1})"
+    style(ws1, f'B{row}:C{row}', "Total Currency")
+    total_debt_row = row
+
+    # Monthly Budget Summary
+    row += 2
+    ws1[f'A{row}'] = "MONTHLY CASH FLOW"
+    style(ws1, f'A{row}', "Section")
+
+    row += 1
+    ws1[f'A{row}'] = "Monthly Income"
+    ws1[f'B{row}'] = "=B6"
+    format_currency(ws1, f'B{row}')
+
+    row += 1
+    ws1[f'A{row}'] = "(-) Fixed Bills (Insurance, Subscriptions)"
+    ws1[f'B{row}'] = -totals.monthly_bills
+    format_currency(ws1, f'B{row}', True)
+
+    row += 1
+    ws1[f'A{row}'] = "(-) Debt Minimum Payments"
+    ws1[f'B{row}'] = f"=-C{total_debt_row}"
+    format_currency(ws1, f'B{row}')
+
+    row += 1
+    income_row = row - 3
+    bills_row = row - 2
+    debt_row = row - 1
+    ws1[f'A{row}'] = "Available for Spending/Savings/Extra Debt"
+    ws1[f'B{row}'] = f"=B{income_row}+B{bills_row}+B{debt_row}"
+    style(ws1, f'B{row}', "Gain Currency")
+    surplus_row = row
+
+    # Living Expenses Estimate
+    row += 2
+    ws1[f'A{row}'] = "ESTIMATED LIVING EXPENSES"
+    style(ws1, f'A{row}', "Section")
+
+    living_start = row + 1
+    for name, amount in inputs.living_expenses:
+        row += 1
+        ws1[f'A{row}'] = name
+        ws1[f'B{row}'] = amount
+        format_currency(ws1, f'B{row}', True)
+
+    row += 1
+    ws1[f'A{row}'] = "Total Variable Spending"
+    ws1[f'B{row}'] = f"=SUM(B{living_start}:B{row-1})"
+    format_currency(ws1, f'B{row}')
+    living_row = row
+
+    # TRUE remaining for extra debt paydown
+    row += 2
+    ws1[f'A{row}'] = "TRUE MONTHLY SURPLUS FOR DEBT ATTACK"
+    style(ws1, f'A{row}', "Bold")
+    ws1[f'B{row}'] = f"=B{surplus_row}-B{living_row}"
+    style(ws1, f'B{row}', "Surplus Currency")
+    return ws1
+
+
+# ============== SHEET 2: DEBT DETAIL ==============
+def build_debt_detail(wb, inputs, projection, plan):
+    ws2 = wb.create_sheet("Debt Detail")
+    ws2.column_dimensions['A'].width = 40
+    ws2.column_dimensions['B'].width = 15
+    ws2.column_dimensions['C'].width = 10
+    ws2.column_dimensions['D'].width = 15
+    ws2.column_dimensions['E'].width = 12
+    ws2.column_dimensions['F'].width = 20
+    ws2.column_dimensions['G'].width = 15
+    ws2.column_dimensions['H'].width = 14
+    ws2.column_dimensions['I'].width = 28
+
+    ws2['A1'] = "COMPLETE DEBT INVENTORY - Sorted by Interest Rate (Avalanche Method)"
+    style(ws2, 'A1', "Title")
+    ws2.merge_cells('A1:I1')
+
+    headers = ["Account Name", "Balance", "APR %", "Min Payment", "Due Day", "Status", "Priority", "Payoff",
+               "BNPL Installments"]
+    for col, h in enumerate(headers, 1):
+        set_header(ws2, f"{get_column_letter(col)}3", h)
+
+    horizon_labels = month_labels(inputs.projection_start, inputs.payoff_horizon)
+    account_payoff = projection.account_payoff[0]
+    counts, last_days = plan.counts(), plan.last_day()
+
+    row = 4
+    for i, (name, balance, apr, minpay, due, status, priority) in enumerate(inputs.all_debts):
+        payoff = account_payoff[i]
+        ws2[f'A{row}'] = name
+        ws2[f'B{row}'] = balance
+        format_currency(ws2, f'B{row}')
+        ws2[f'C{row}'] = apr / 100
+        format_percent(ws2, f'C{row}')
+        ws2[f'D{row}'] = minpay
+        format_currency(ws2, f'D{row}')
+        ws2[f'E{row}'] = due
+        ws2[f'F{row}'] = status
+        ws2[f'G{row}'] = priority
+        ws2[f'H{row}'] = horizon_labels[payoff - 1] if payoff > 0 else "Not in 30 yrs"
+        if counts[i]:
+            last = inputs.projection_start + timedelta(days=int(last_days[i]))
+            ws2[f'I{row}'] = f"{counts[i]} {plan.frequency[i]}, last {last:%b} {last.day}, {last.year}"
+
+        if "PAST DUE" in status:
+            style(ws2, f'A{row}:I{row}', "Alert")
+            style(ws2, f'B{row}', "Alert Currency")
+            style(ws2, f'C{row}', "Alert Percent")
+            style(ws2, f'D{row}', "Alert Currency")
+        elif priority <= 4:
+            style(ws2, f'A{row}', "Priority")
+        row += 1
+
+    # Total
+    ws2[f'A{row}'] = "TOTAL"
+    style(ws2, f'A{row}', "Bold")
+    ws2[f'B{row}'] = f"=SUM(B4:B{row-1})"
+    style(ws2, f'B{row}', "Total Currency")
+    ws2[f'D{row}'] = f"=SUM(D4:D{row-1})"
+    style(ws2, f'D{row}', "Total Currency")
+    return ws2
+
+
+# ============== SHEET 3: EVERY-DOLLAR BUDGET ==============
+def build_budget(wb, inputs, totals, periods):
+    ws3 = wb.create_sheet("Every Dollar Budget")
+    ws3.column_dimensions['A'].width = 35
+    ws3.column_dimensions['B'].width = 18
+    ws3.column_dimensions['C'].width = 18
+    ws3.column_dimensions['D'].width = 45
+
+    ws3['A1'] = f"{inputs.paycheck_frequency.upper()} PAY PERIOD BUDGET - Every Dollar Assigned"
+    style(ws3, 'A1', "Title")
+    ws3.merge_cells('A1:D1')
+
+    ws3['A3'] = (f"This budget is for ONE pay period ({PAY_PERIOD_LENGTHS[inputs.paycheck_frequency]}). "
+                 f"You get paid {inputs.paycheck_frequency}.")
+    style(ws3, 'A3', "Note")
+
+    row = 5
+    ws3[f'A{row}'] = "INCOME"
+    style(ws3, f'A{row}', "Section")
+
+    row += 1
+    ws3[f'A{row}'] = "Net Paycheck"
+    ws3[f'B{row}'] = inputs.net_paycheck
+    format_currency(ws3, f'B{row}', True)
+    income_cell = row
+
+    row += 2
+    ws3[f'A{row}'] = "ALLOCATIONS (Bills + Debt Minimums)"
+    style(ws3, f'A{row}', "Section")
+
+    row += 1
+    set_header(ws3, f'A{row}', "Expense")
+    set_header(ws3, f'B{row}', "Per Paycheck")
+    set_header(ws3, f'C{row}', "Monthly Equiv")
+    set_header(ws3, f'D{row}', "Notes")
+
+    alloc_start = row + 1
+    for name, amount, notes in paycheck_allocations(inputs, totals):
+        row += 1
+        ws3[f'A{row}'] = name
+        ws3[f'B{row}'] = amount
+        format_currency(ws3, f'B{row}')
+        ws3[f'C{row}'] = f"=B{row}*{totals.paychecks_per_month}"
+        format_currency(ws3, f'C{row}')
+        ws3[f'D{row}'] = notes
+        if "CATCH UP" in name or "PRIORITY" in notes:
+            style(ws3, f'A{row}', "Alert")
+
+    alloc_end = row
+
+    # BNPL varies by paycheck: show what is actually due before the next one
+    row += 2
+    ws3[f'A{row}'] = "BNPL PAYMENTS (varies by period)"
+    style(ws3, f'A{row}', "Section")
+
+    row += 1
+    first = next(p for p in periods if p.number > 0)
+    ws3[f'A{row}'] = f"BNPL due {first.start:%b} {first.start.day} - {first.end:%b} {first.end.day}"
+    ws3[f'B{row}'] = first.bnpl
+    format_currency(ws3, f'B{row}', True)
+    ws3[f'D{row}'] = "Exact for this paycheck - every period is on Paycheck Plan"
+    bnpl_row = row
+
+    # Living Expenses
+    row += 2
+    ws3[f'A{row}'] = "LIVING EXPENSES"
+    style(ws3, f'A{row}', "Section")
+
+    living_start = row + 1
+    for name, amount in inputs.paycheck_living:
+        row += 1
+        ws3[f'A{row}'] = name
+        ws3[f'B{row}'] = amount
+        format_currency(ws3, f'B{row}', True)
+    living_end = row
+
+    # Summary
+    row += 2
+    ws3[f'A{row}'] = "SUMMARY"
+    style(ws3, f'A{row}', "Section")
+
+    row += 1
+    ws3[f'A{row}'] = "Income"
+    ws3[f'B{row}'] = f"=B{income_cell}"
+    format_currency(ws3, f'B{row}')
+
+    row += 1
+    ws3[f'A{row}'] = "(-) Fixed Allocations"
+    ws3[f'B{row}'] = f"=-SUM(B{alloc_start}:B{alloc_end})"
+    format_currency(ws3, f'B{row}')
+
+    row += 1
+    ws3[f'A{row}'] = "(-) BNPL Payments"
+    ws3[f'B{row}'] = f"=-B{bnpl_row}"
+    format_currency(ws3, f'B{row}')
+
+    row += 1
+    ws3[f'A{row}'] = "(-) Living Expenses"
+    ws3[f'B{row}'] = f"=-SUM(B{living_start}:B{living_end})"
+    format_currency(ws3, f'B{row}')
+
+    row += 1
+    summary_start = row - 4
+    ws3[f'A{row}'] = "EXTRA FOR DEBT ATTACK OR SAVINGS"
+    style(ws3, f'A{row}', "Bold")
+    ws3[f'B{row}'] = f"=SUM(B{summary_start}:B{row-1})"
+    style(ws3, f'B{row}', "Surplus Currency")
+    return ws3
+
+
+# ============== SHEET 4: PAYCHECK PLAN ==============
+def build_paycheck_plan(wb, inputs, periods):
+    ws = wb.create_sheet("Paycheck Plan")
+    ws.column_dimensions['A'].width = 14
+    ws.column_dimensions['B'].width = 40
+    for col in 'CDEFGH':
+        ws.column_dimensions[col].width = 14
+
+    ws['A1'] = "PAYCHECK PLAN - EVERY OBLIGATION IN THE PERIOD IT IS DUE"
+    style(ws, 'A1', "Title")
+    ws.merge_cells('A1:H1')
+    ws['A2'] = "Each period runs from payday to the day before the next payday"
+    style(ws, 'A2', "Note")
+
+    headers = ["Payday", "Period", "Paycheck", "Bills", "Debt Mins", "BNPL", "Living", "Left Over"]
+    for col, h in enumerate(headers, 1):
+        set_header(ws, f"{get_column_letter(col)}4", h)
+
+    living = sum(amount for _, amount in inputs.paycheck_living)
+    row = 5
+    for period in periods:
+        ws[f'A{row}'] = period.start
+        style(ws, f'A{row}', "Date")
+        label = "Before first paycheck (cash on hand)" if period.number == 0 else f"Paycheck {period.number}"
+        ws[f'B{row}'] = f"{label}: {period.start:%b} {period.start.day} - {period.end:%b} {period.end.day}"
+        ws[f'C{row}'] = period.paycheck
+        ws[f'D{row}'] = period.bills
+        ws[f'E{row}'] = period.debt
+        ws[f'F{row}'] = period.bnpl
+        ws[f'G{row}'] = 0 if period.number == 0 else living
+        ws[f'H{row}'] = f"=C{row}-SUM(D{row}:G{row})"
+        style(ws, f'C{row}:H{row}', "Currency")
+        row += 1
+
+    # One block per period with each obligation on its due date
+    for period in periods:
+        row += 1
+        label = "BEFORE FIRST PAYCHECK" if period.number == 0 else f"PAYCHECK {period.number}"
+        ws[f'A{row}'] = f"{label} - {period.start:%a %b} {period.start.day} to {period.end:%a %b} {period.end.day}, {period.end.year}"
+        style(ws, f'A{row}', "Section")
+
+        row += 1
+        ws[f'B{row}'] = "Cash on hand" if period.number == 0 else "Net paycheck"
+        ws[f'D{row}'] = period.paycheck
+        format_currency(ws, f'D{row}', True)
+        income_row = row
+
+        row += 1
+        for col, h in enumerate(["Due", "Obligation", "Type", "Amount"], 1):
+            set_header(ws, f"{get_column_letter(col)}{row}", h)
+        first_item = row + 1
+        for due, name, kind, amount in period.items:
+            row += 1
+            ws[f'A{row}'] = due
+            style(ws, f'A{row}', "Date")
+            ws[f'B{row}'] = name
+            ws[f'C{row}'] = KIND_LABELS[kind]
+            ws[f'D{row}'] = round(amount, 2)
+            format_currency(ws, f'D{row}')
+        last_item = row
+
+        row += 1
+        ws[f'B{row}'] = "Living expenses"
+        ws[f'D{row}'] = 0 if period.number == 0 else living
+        format_currency(ws, f'D{row}', True)
+
+        row += 1
+        ws[f'B{row}'] = "Left over for extra debt / savings"
+        style(ws, f'B{row}', "Bold")
+        due = f"-SUM(D{first_item}:D{last_item})" if period.items else ""
+        ws[f'D{row}'] = f"=D{income_row}{due}-D{row-1}"
+        style(ws, f'D{row}', "Gain Currency")
+        row += 1
+    return ws
+
+
+# ============== SHEET 5: 2026 PROJECTIONS ==============
+PROJECTION_TITLES = {"weekly": "WEEK-BY-WEEK", "biweekly": "TWO-WEEK", "monthly": "MONTH-BY-MONTH"}
+FLAT_ROWS = 24  # Projections with more rows get a rollup row per year, with its detail rows grouped
+
+
+def build_projections(wb, inputs, totals, periods):
+    ws4 = wb.create_sheet("2026 Projections")
+    ws4.column_dimensions['A'].width = 5
+    ws4.column_dimensions['B'].width = 12
+    # Personal loans, mortgages and other debt get column P, only when there are any
+    other = bool(totals.portfolio.category_mask("OTHER").any())
+    for col in range(3, 17 if other else 16):
+        ws4.column_dimensions[get_column_letter(col)].width = 13
+    compact = len(periods) > FLAT_ROWS
+    if compact:
+        ws4.sheet_format.outlineLevelRow = 1
+
+    end = month_labels(inputs.projection_start, inputs.projection_months)[-1]
+    ws4['A1'] = f"{PROJECTION_TITLES[periods.frequency]} PROJECTION TO {end.upper()}"
+    style(ws4, 'A1', "Title")
+    ws4.merge_cells('A1:N1')
+
+    share = inputs.debt_surplus_percent
+    ws4['A2'] = (f"Assumptions: Minimums on every account; surplus split {share * 100:g}% to highest-APR debt "
+                 f"(avalanche) / {(1 - share) * 100:g}% to emergency fund until ${inputs.emergency_fund_target:,.0f}")
+    style(ws4, 'A2', "Note")
+
+    # Monthly projection headers
+    set_header(ws4, 'A4', "#")
+    set_header(ws4, 'B4', "Month" if periods.frequency == "monthly" else "Starting")
+    set_header(ws4, 'C4', "Income")
+    set_header(ws4, 'D4', "Bills")
+    set_header(ws4, 'E4', "Debt Mins")
+    set_header(ws4, 'F4', "BNPL")
+    set_header(ws4, 'G4', "Living")
+    set_header(ws4, 'H4', "Extra Debt $")
+    set_header(ws4, 'I4', "Savings $")
+    set_header(ws4, 'J4', "Credit Cards")
+    set_header(ws4, 'K4', "Auto Loans")
+    set_header(ws4, 'L4', "Student Loans")
+    set_header(ws4, 'M4', "BNPL Bal")
+    set_header(ws4, 'N4', "Total Debt")
+    set_header(ws4, 'O4', "Emergency Fund")
+    if other:
+        set_header(ws4, 'P4', "Other Debt")
+
+    # Every value below comes from the per-account simulation (scenario 0),
+    # summed per category inside the engine loop
+    flows = dict(zip("CDEFGHI", (periods.income, periods.bills, periods.debt_minimums, periods.bnpl,
+                                 periods.living, periods.to_debt, periods.to_savings)))
+    balance_cols = dict(zip(CATEGORIES if other else CATEGORIES[:-1], ['J', 'K', 'L', 'M', 'P']))
+    total = "=" + "+".join(f"{col}{{0}}" for col in balance_cols.values())
+    last_col = 'P' if other else 'O'
+    labels, end_labels = periods.labels(), periods.end_labels()
+    years = [d.year for d in periods.dates()]
+
+    # Rows come in calendar years; a compact layout closes each with a rollup
+    # row (flows summed, balances at year end) and folds the detail rows under it
+    row = 5
+    year_end = {}  # Year -> (row with its closing balances, label of its last day)
+    for t, label in enumerate(labels):
+        if t == 0 or years[t] != years[t - 1]:
+            first = row
+        ws4[f'A{row}'] = t + 1
+        ws4[f'B{row}'] = label
+        for col, values in flows.items():
+            ws4[f'{col}{row}'] = round(float(values[t]), 2)
+        for i, col in enumerate(balance_cols.values()):
+            ws4[f'{col}{row}'] = round(float(periods.balances[t, i]), 2)
+        ws4[f'N{row}'] = total.format(row)
+        ws4[f'O{row}'] = round(float(periods.emergency_fund[t]), 2)
+
+        style(ws4, f'C{row}:{last_col}{row}', "Currency")
+        year_end[years[t]] = (row, end_labels[t])
+
+        if compact:
+            ws4.row_dimensions[row].outline_level = 1
+            ws4.row_dimensions[row].hidden = True
+            if t + 1 == len(labels) or years[t + 1] != years[t]:
+                last = row
+                row += 1
+                ws4[f'B{row}'] = str(years[t])
+                style(ws4, f'B{row}', "Bold")
+                for col in flows:
+                    ws4[f'{col}{row}'] = f"=SUM({col}{first}:{col}{last})"
+                for col in (*balance_cols.values(), 'O'):
+                    ws4[f'{col}{row}'] = f"={col}{last}"
+                ws4[f'N{row}'] = total.format(row)
+                style(ws4, f'C{row}:{last_col}{row}', "Total Currency")
+                ws4.row_dimensions[row].collapsed = True
+                year_end[years[t]] = (row, end_labels[t])
+
+        row += 1
+
+    # Summary at bottom, at the end of the first calendar year (or of the projection, if sooner)
+    first_year = years[0]
+    closing, label = year_end[first_year]
+    row += 2
+    ws4[f'A{row}'] = f"END OF {first_year} PROJECTIONS"
+    style(ws4, f'A{row}', "Section")
+    ws4.merge_cells(f'A{row}:N{row}')
+
+    row += 1
+    ws4[f'B{row}'] = f"Projected Total Debt ({label})"
+    ws4[f'N{row}'] = f"=N{closing}"
+    style(ws4, f'N{row}', "Total Currency")
+
+    row += 1
+    ws4[f'B{row}'] = "Debt Paid Off"
+    ws4[f'N{row}'] = f"={totals.total_debt:.2f}-N{closing}"
+    style(ws4, f'N{row}', "Gain Currency")
+
+    row += 1
+    ws4[f'B{row}'] = "Emergency Fund"
+    ws4[f'O{row}'] = f"=O{closing}"
+    style(ws4, f'O{row}', "Success Currency")
+    return ws4
+
+
+# ============== SHEET 6: ACTION PLAN ==============
+def build_action_plan(wb, inputs, goals):
+    ws5 = wb.create_sheet("Action Plan")
+    ws5.column_dimensions['A'].width = 8
+    ws5.column_dimensions['B'].width = 70
+    for col in 'CDEF':
+        ws5.column_dimensions[col].width = 14
+
+    ws5['A1'] = "YOUR ACTION PLAN - GETTING OUT OF THIS MESS"
+    style(ws5, 'A1', "Title Large")
+    ws5.merge_cells('A1:B1')
+
+    row = 3
+    for period, action in inputs.actions:
+        ws5[f'A{row}'] = period
+        ws5[f'B{row}'] = action
+        if period in ["WEEK 1", "RULES"]:
+            style(ws5, f'A{row}', "Alert Bold")
+            style(ws5, f'B{row}', "Alert")
+        elif period in ["END 2026 GOALS"]:
+            style(ws5, f'A{row}', "Success Bold")
+            style(ws5, f'B{row}', "Success")
+        elif period:
+            style(ws5, f'A{row}', "Bold")
+        row += 1
+
+    if not goals:
+        return ws5
+    row += 1
+    ws5[f'A{row}'] = "VERIFIED GOALS - checked against the 2026 Projections math"
+    style(ws5, f'A{row}', "Section")
+    ws5.merge_cells(f'A{row}:F{row}')
+    row += 1
+    for col, h in zip('ABCDEF', ["By", "Goal", "Projected", "Status", "Reached", "Min Extra / Mo"]):
+        set_header(ws5, f'{col}{row}', h)
+
+    labels = month_labels(inputs.projection_start, inputs.payoff_horizon)
+    for goal in goals:
+        row += 1
+        ws5[f'A{row}'] = labels[goal.month - 1]
+        ws5[f'B{row}'] = goal.label
+        ws5[f'C{row}'] = goal.projected
+        style(ws5, f'C{row}', "Currency")
+        ws5[f'D{row}'] = "On track" if goal.met else "Off track"
+        style(ws5, f'D{row}', "Success Bold" if goal.met else "Alert Bold")
+        ws5[f'E{row}'] = labels[goal.reached_month - 1] if goal.reached_month > 0 else "Not in 30 yrs"
+        if goal.extra_needed is None:
+            ws5[f'F{row}'] = "n/a"
+        else:
+            ws5[f'F{row}'] = goal.extra_needed
+            style(ws5, f'F{row}', "Currency")
+    row += 1
+    ws5[f'B{row}'] = ("Min Extra / Mo: the least new money per month, on top of the current plan and all "
+                      "to debt, that meets the goal in time")
+    style(ws5, f'B{row}', "Note")
+    return ws5
+
+
+# ============== OPTIONAL: MONTE CARLO ==============
+def add_monte_carlo_sheet(wb, inputs, result):
+    ws = wb.create_sheet("Monte Carlo")
+    ws.column_dimensions['A'].width = 5
+    ws.column_dimensions['B'].width = 12
+    for col in range(3, 9):
+        ws.column_dimensions[get_column_letter(col)].width = 14
+
+    ws['A1'] = f"MONTE CARLO - {result.paths:,} SIMULATED PATHS"
+    style(ws, 'A1', "Title")
+    ws.merge_cells('A1:H1')
+    ws['A2'] = "Randomized paychecks (incl. missed checks), living-cost overruns and credit card APR moves"
+    style(ws, 'A2', "Note")
+
+    labels = month_labels(inputs.projection_start, result.months + 1)
+    ws['A3'] = "Debt-free by (P10 / P50 / P90):"
+    ws['D3'] = " / ".join(
+        labels[m - 1] if m <= result.months else f"After {labels[-2]}"
+        for m in result.payoff_bands
+    )
+    ws['G3'] = "Debt-free in horizon"
+    ws['H3'] = result.debt_free_share
+    format_percent(ws, 'H3')
+
+    headers = ["#", "Month"] + [f"Debt P{p}" for p in PERCENTILES] + [f"Fund P{p}" for p in PERCENTILES]
+    for col, h in enumerate(headers, 1):
+        set_header(ws, f"{get_column_letter(col)}5", h)
+
+    row = 6
+    for t in range(result.months):
+        ws[f'A{row}'] = t + 1
+        ws[f'B{row}'] = labels[t]
+        values = list(result.debt_bands[:, t]) + list(result.fund_bands[:, t])
+        for col, value in enumerate(values, 3):
+            cell = f"{get_column_letter(col)}{row}"
+            ws[cell] = round(float(value), 2)
+            format_currency(ws, cell)
+        row += 1
+    return ws
+
+
+# ============== OPTIONAL: STRATEGY OPTIMIZER ==============
+def add_strategy_sheet(wb, inputs, current, front):
+    ws = wb.create_sheet("Strategy Optimizer")
+    ws.column_dimensions['A'].width = 24
+    for col in 'BCDEFG':
+        ws.column_dimensions[col].width = 15
+
+    ws['A1'] = "STRATEGY OPTIMIZER - PARETO-BEST ALLOCATION POLICIES"
+    style(ws, 'A1', "Title")
+    ws.merge_cells('A1:G1')
+    ws['A2'] = "No other policy has lower interest, an earlier debt-free month AND a bigger average emergency fund"
+    style(ws, 'A2', "Note")
+
+    headers = ["Payoff Order", "Debt Share", "EF Cap", "Total Interest", "Debt-Free",
+               "Avg Emergency Fund", "Interest vs Current"]
+    for col, h in enumerate(headers, 1):
+        set_header(ws, f"{get_column_letter(col)}4", h)
+
+    labels = month_labels(inputs.projection_start, inputs.payoff_horizon)
+    row = 5
+    for evaluation in [current] + front:
+        policy = evaluation.policy
+        ws[f'A{row}'] = policy.name
+        ws[f'B{row}'] = policy.debt_share
+        format_percent(ws, f'B{row}')
+        ws[f'C{row}'] = policy.ef_cap
+        format_currency(ws, f'C{row}')
+        ws[f'D{row}'] = round(evaluation.total_interest, 2)
+        format_currency(ws, f'D{row}')
+        ws[f'E{row}'] = labels[evaluation.payoff_month - 1] if evaluation.payoff_month > 0 else "Not in 30 yrs"
+        ws[f'F{row}'] = round(evaluation.cushion, 2)
+        format_currency(ws, f'F{row}')
+        ws[f'G{row}'] = f"=D{row}-$D$5"
+        format_currency(ws, f'G{row}')
+        if evaluation is current:
+            style(ws, f'A{row}', "Input")
+            style(ws, f'B{row}', "Input Percent")
+            style(ws, f'C{row}:D{row}', "Input Currency")
+            style(ws, f'E{row}', "Input")
+            style(ws, f'F{row}:G{row}', "Input Currency")
+        row += 1
+    return ws
+
+
+# ============== OPTIONAL: SENSITIVITY ==============
+def _axis_label(axis, value):
+    if axis.kind == "percent":
+        return f"{value * 100:g}%"
+    return f"${value:,.0f}"
+
+
+def add_sensitivity_sheet(wb, inputs, grid):
+    ws = wb.create_sheet("Sensitivity")
+    x_axis, y_axis = AXES[grid.x], AXES[grid.y]
+    last = get_column_letter(len(grid.x_values) + 1)
+    ws.column_dimensions['A'].width = 24
+    for col in range(2, len(grid.x_values) + 2):
+        ws.column_dimensions[get_column_letter(col)].width = 11
+
+    ws['A1'] = f"SENSITIVITY - {y_axis.label.upper()} x {x_axis.label.upper()}"
+    style(ws, 'A1', "Title")
+    ws.merge_cells(f'A1:{last}1')
+    ws['A2'] = (f"Each cell is a full {inputs.payoff_horizon}-month simulation of every account on the "
+                "2026 Projections assumptions; highlighted cells are the current inputs")
+    style(ws, 'A2', "Note")
+
+    labels = month_labels(inputs.projection_start, inputs.payoff_horizon)
+    is_current = [[math.isclose(x, grid.current[0], abs_tol=0.005) and math.isclose(y, grid.current[1], abs_tol=0.005)
+                   for x in grid.x_values] for y in grid.y_values]
+    row = 4
+    for title in ("DEBT-FREE MONTH", "TOTAL INTEREST"):
+        ws[f'A{row}'] = title
+        style(ws, f'A{row}', "Section")
+        row += 1
+        set_header(ws, f'A{row}', f"{y_axis.label} \\ {x_axis.label}")
+        for col, x in enumerate(grid.x_values, 2):
+            set_header(ws, f"{get_column_letter(col)}{row}", _axis_label(x_axis, x))
+        for i, y in enumerate(grid.y_values):
+            row += 1
+            ws[f'A{row}'] = _axis_label(y_axis, y)
+            style(ws, f'A{row}', "Bold")
+            for j in range(len(grid.x_values)):
+                cell = f"{get_column_letter(j + 2)}{row}"
+                if title == "TOTAL INTEREST":
+                    ws[cell] = round(float(grid.total_interest[i, j]), 2)
+                    style(ws, cell, "Input Currency" if is_current[i][j] else "Currency")
+                    continue
+                month = int(grid.payoff_month[i, j])
+                ws[cell] = labels[month - 1] if month > 0 else "Not in 30 yrs"
+                if is_current[i][j]:
+                    style(ws, cell, "Input")
+                elif month <= 0:
+                    style(ws, cell, "Alert")
+        row += 2
+    return ws
+
+
+# ============== OPTIONAL: VARIANCE ==============
+def add_variance_sheet(wb, inputs, report):
+    ws = wb.create_sheet("Variance")
+    ws.column_dimensions['A'].width = 11
+    ws.column_dimensions['B'].width = 14
+    for col in 'CDEFGHIJKL':
+        ws.column_dimensions[col].width = 14
+
+    ws['A1'] = "ACTUAL VS PROJECTED - TOTAL DEBT BY MONTH"
+    style(ws, 'A1', "Title")
+    ws.merge_cells('A1:L1')
+    ws['A2'] = ("Actual: the last snapshot recorded in the month. Projected: what the last snapshot before "
+                "the month expected for its end. Positive variance = more debt than expected")
+    style(ws, 'A2', "Note")
+    if not len(report):
+        ws['A4'] = "No snapshots recorded yet"
+        return ws
+    ws['A3'] = f"Plan: the first snapshot, {report.planned_on:%b} {report.planned_on.day}, {report.planned_on.year}"
+    style(ws, 'A3', "Note")
+
+    headers = ["Month", "Actual As Of", "Actual Debt", "Projected", "Variance", "Plan", "vs Plan",
+               *(f"{CATEGORY_LABELS[c].replace(' Bal', '')} Var" for c in CATEGORIES)]
+    for col, h in enumerate(headers, 1):
+        set_header(ws, f"{get_column_letter(col)}5", h)
+
+    def variance_style(value):
+        return "Alert Currency" if value > PAID_OFF else "Gain Currency" if value < -PAID_OFF else "Currency"
+
+    row = 5
+    actual_total = report.actual.sum(axis=1)
+    for i, key in enumerate(report.months):
+        row += 1
+        ws[f'A{row}'] = date(key // 12, key % 12 + 1, 1).strftime("%b %Y")
+        ws[f'B{row}'] = report.as_of[i]
+        style(ws, f'B{row}', "Date")
+        ws[f'C{row}'] = round(float(actual_total[i]), 2)
+        style(ws, f'C{row}', "Currency")
+        for expected, value_col, diff_col in ((report.projected[i], 'D', 'E'), (report.planned[i], 'F', 'G')):
+            if math.isnan(expected.sum()):
+                continue
+            ws[f'{value_col}{row}'] = round(float(expected.sum()), 2)
+            style(ws, f'{value_col}{row}', "Currency")
+            ws[f'{diff_col}{row}'] = f"=C{row}-{value_col}{row}"
+            style(ws, f'{diff_col}{row}', variance_style(actual_total[i] - expected.sum()))
+        if not math.isnan(report.projected[i].sum()):
+            for g, col in enumerate('HIJKL'):
+                difference = report.actual[i, g] - report.projected[i, g]
+                ws[f'{col}{row}'] = round(float(difference), 2)
+                style(ws, f'{col}{row}', variance_style(difference))
+    return ws
+
+
+# ============== OPTIONAL: CASH CALENDAR ==============
+def add_cash_calendar_sheet(wb, inputs, ledger):
+    ws = wb.create_sheet("Cash Calendar")
+    ws.column_dimensions['A'].width = 14
+    for col in 'BCDEFGHI':
+        ws.column_dimensions[col].width = 12
+    ws.column_dimensions['J'].width = 60
+
+    ws['A1'] = "DAILY CASH CALENDAR - END-OF-DAY CHECKING BALANCE"
+    style(ws, 'A1', "Title")
+    ws.merge_cells('A1:J1')
+    ws['A2'] = ("Paychecks on pay dates; bills and minimums on their due days; living costs spread daily; "
+                "each month's extra debt/savings on its last day")
+    style(ws, 'A2', "Note")
+
+    shortfalls = ledger.shortfalls()
+    low = int(ledger.balance.argmin())
+    ws['A3'] = "Days below $0"
+    ws['C3'] = int(ledger.negative.sum())
+    ws['E3'] = "Lowest"
+    ws['F3'] = round(float(ledger.balance[low]), 2)
+    style(ws, 'F3', "Alert Currency" if ledger.balance[low] < 0 else "Currency")
+    ws['G3'] = ledger.day(low)
+    style(ws, 'G3', "Date")
+
+    headers = ["Week of", "Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Week Low", "Paydays / Shortfalls"]
+    for col, h in enumerate(headers, 1):
+        set_header(ws, f"{get_column_letter(col)}5", h)
+
+    # Weeks run Sunday to Saturday; days outside the ledger stay blank
+    lead = (ledger.start.weekday() + 1) % 7
+    paydays = set(ledger.paydays.tolist())
+    row = 6
+    for week_start in range(-lead, len(ledger), 7):
+        days = range(max(week_start, 0), min(week_start + 7, len(ledger)))
+        ws[f'A{row}'] = ledger.day(week_start)
+        style(ws, f'A{row}', "Date")
+        for d in days:
+            cell = f"{get_column_letter(d - week_start + 2)}{row}"
+            ws[cell] = round(float(ledger.balance[d]), 2)
+            style(ws, cell, "Alert Currency" if ledger.balance[d] < 0 else "Currency")
+        ws[f'I{row}'] = round(float(ledger.balance[days.start:days.stop].min()), 2)
+        style(ws, f'I{row}', "Alert Currency" if ws[f'I{row}'].value < 0 else "Total Currency")
+        notes = [f"Payday {ledger.day(d):%a %d}" for d in days if d in paydays]
+        notes += [f"Short {ledger.day(d):%a %d}" for d in days if ledger.negative[d] and not ledger.negative[d - 1:d].any()]
+        ws[f'J{row}'] = ", ".join(notes)
+        row += 1
+
+    row += 1
+    ws[f'A{row}'] = "SHORTFALLS"
+    style(ws, f'A{row}', "Section")
+    row += 1
+    for col, h in enumerate(["From", "To", "Lowest", "Lowest On", "Due on the first day"], 1):
+        set_header(ws, f"{get_column_letter(col)}{row}", h)
+    for first, last, lowest, lowest_day in shortfalls:
+        row += 1
+        ws[f'A{row}'] = ledger.day(first)
+        ws[f'B{row}'] = ledger.day(last)
+        style(ws, f'A{row}:B{row}', "Date")
+        ws[f'C{row}'] = round(lowest, 2)
+        style(ws, f'C{row}', "Alert Currency")
+        ws[f'D{row}'] = ledger.day(lowest_day)
+        style(ws, f'D{row}', "Date")
+        ws[f'E{row}'] = ", ".join(ledger.due_on(first))
+    if not shortfalls:
+        row += 1
+        ws[f'A{row}'] = "Balance never goes below $0"
+        style(ws, f'A{row}', "Success")
+    return ws
+
+
+# Input fields each sheet reads (directly or through derive()/project()).
+# With a cache, a sheet is rebuilt only when one of its fields changes.
+TOTALS_FIELDS = ("net_paycheck", "paycheck_frequency", "living_expenses", "all_debts", "debt_types",
+                 "bills", "monthly_income", "monthly_living", "projection_start")
+PROJECTION_FIELDS = TOTALS_FIELDS + ("payoff_horizon", "debt_surplus_percent", "emergency_fund_target",
+                                     "extra_payment", "bnpl_frequency")
+PAYCHECK_FIELDS = PROJECTION_FIELDS + ("last_paycheck", "cash_on_hand", "paycheck_living")
+SHEET_FIELDS = {
+    "Snapshot": TOTALS_FIELDS + ("as_of", "cash_on_hand", "category_notes"),
+    "Debt Detail": PROJECTION_FIELDS,
+    "Every Dollar Budget": PAYCHECK_FIELDS + ("allocations",),
+    "Paycheck Plan": PAYCHECK_FIELDS,
+    "2026 Projections": PROJECTION_FIELDS + ("projection_months", "projection_frequency", "last_paycheck"),
+    "Action Plan": PROJECTION_FIELDS + ("actions", "goals"),
+    "Monte Carlo": PROJECTION_FIELDS,
+    "Strategy Optimizer": PROJECTION_FIELDS,
+    "Cash Calendar": PROJECTION_FIELDS + ("cash_on_hand", "last_paycheck", "projection_months"),
+    "Sensitivity": PROJECTION_FIELDS,
+    "Variance": (),  # Built from the history store; its cache key is the report's snapshots
+}
+
+
+# Hidden sheet with the inputs and options a workbook was built from, so that
+# update.update_model can regenerate what the file held and patch only the difference
+MODEL_INFO_SHEET = "_model"
+INFO_CHUNK = 32000  # Under Excel's 32,767-character cell limit
+
+
+def model_info_chunks(inputs, options):
+    """The `_model` sheet's column A: JSON of the generator version, inputs and options."""
+    payload = json.dumps(dict(generator=generator_version(), inputs=normalized(inputs), options=options),
+                         sort_keys=True, ensure_ascii=False)
+    return [payload[i:i + INFO_CHUNK] for i in range(0, len(payload), INFO_CHUNK)]
+
+
+def parse_model_info(chunks):
+    """{"generator", "inputs", "options"} from the `_model` sheet's column A, top to bottom."""
+    return json.loads("".join(chunk for chunk in chunks if chunk))
+
+
+def write_model_info(wb, inputs, options):
+    ws = wb.create_sheet(MODEL_INFO_SHEET)
+    ws.sheet_state = "veryHidden"
+    for row, chunk in enumerate(model_info_chunks(inputs, options), start=1):
+        cell = ws[f'A{row}']
+        cell.value = chunk
+        cell.data_type = "s"  # A chunk starting with "=" is still text
+    return ws
+
+
+class _Shared:
+    """Derived data shared by the sheets, computed on first use so cached sheets skip it."""
+
+    def __init__(self, inputs, profiler=NO_PROFILER):
+        self.inputs = inputs
+        self.profiler = profiler
+
+    @cached_property
+    def totals(self):
+        with self.profiler.phase("derive"):
+            return derive(self.inputs)
+
+    @cached_property
+    def projection(self):
+        totals = self.totals
+        with self.profiler.phase("projection"):
+            return project(self.inputs, totals)[1]
+
+    @cached_property
+    def installments(self):
+        inputs = self.inputs
+        with self.profiler.phase("bnpl installments"):
+            return installments(self.totals.portfolio, inputs.projection_start, inputs.bnpl_frequency)
+
+    @cached_property
+    def projection_periods(self):
+        projection = self.projection
+        with self.profiler.phase("projection periods"):
+            return projection_periods(self.inputs, self.totals, projection)
+
+    @cached_property
+    def goals(self):
+        projection = self.projection
+        with self.profiler.phase("goals"):
+            return check_goals(self.inputs, self.totals, projection)
+
+    @cached_property
+    def periods(self):
+        totals = self.totals
+        with self.profiler.phase("paycheck plan"):
+            return paycheck_plan(self.inputs, totals)
+
+    @property
+    def portfolio(self):
+        return self.totals.portfolio
+
+    @property
+    def cash_flow(self):
+        return dict(income=self.totals.monthly_income, bills=self.totals.monthly_bills,
+                    living=self.totals.monthly_living, extra=self.inputs.extra_payment)
+
+
+def model_sheets(shared, monte_carlo_paths=0, optimize_strategy=False, cash_calendar=False,
+                 sensitivity=None, workers=None, variance=None):
+    """(title, build) pairs for every sheet of the model, in workbook order."""
+    inputs = shared.inputs
+
+    def monte_carlo(wb):
+        return add_monte_carlo_sheet(wb, inputs, run_monte_carlo(
+            shared.portfolio, MONTE_CARLO_MONTHS, paths=monte_carlo_paths,
+            debt_share=inputs.debt_surplus_percent, ef_cap=inputs.emergency_fund_target,
+            workers=workers, **shared.cash_flow,
+        ))
+
+    def strategy(wb):
+        portfolio = shared.portfolio
+        current = evaluate(portfolio, Policy("Current (Avalanche)", avalanche_order(portfolio),
+                                             inputs.debt_surplus_percent, inputs.emergency_fund_target),
+                           horizon=inputs.payoff_horizon, **shared.cash_flow)
+        return add_strategy_sheet(wb, inputs, current,
+                                  optimize(portfolio, horizon=inputs.payoff_horizon, **shared.cash_flow))
+
+    sheets = [
+        ("Snapshot", lambda wb: build_snapshot(wb, inputs, shared.totals)),
+        ("Debt Detail", lambda wb: build_debt_detail(wb, inputs, shared.projection, shared.installments)),
+        ("Every Dollar Budget", lambda wb: build_budget(wb, inputs, shared.totals, shared.periods)),
+        ("Paycheck Plan", lambda wb: build_paycheck_plan(wb, inputs, shared.periods)),
+        ("2026 Projections", lambda wb: build_projections(wb, inputs, shared.totals, shared.projection_periods)),
+        ("Action Plan", lambda wb: build_action_plan(wb, inputs, shared.goals)),
+    ]
+    if monte_carlo_paths:
+        sheets.append(("Monte Carlo", monte_carlo))
+    if optimize_strategy:
+        sheets.append(("Strategy Optimizer", strategy))
+    if cash_calendar:
+        sheets.append(("Cash Calendar",
+                       lambda wb: add_cash_calendar_sheet(wb, inputs, simulate_ledger(inputs, shared.totals))))
+    if sensitivity:
+        x, y = sensitivity
+        sheets.append(("Sensitivity",
+                       lambda wb: add_sensitivity_sheet(wb, inputs, sweep(inputs, shared.totals, x, y,
+                                                                          workers=workers))))
+    if variance is not None:
+        sheets.append(("Variance", lambda wb: add_variance_sheet(wb, inputs, variance)))
+    return sheets
+
+
+def build_model(inputs=None, monte_carlo_paths=0, optimize_strategy=False, cash_calendar=False,
+                sensitivity=None, workers=None, write_only=False, cache=None, profiler=None, variance=None):
+    """Build the financial model workbook for `inputs` (defaults to the current snapshot).
+
+    With `write_only=True` every sheet is streamed row by row through
+    openpyxl's write-only mode; the result can only be saved, once.
+    With a BuildCache, sheets whose input fields are unchanged are replayed
+    from it instead of being rebuilt. A BuildProfiler records each step.
+    `sensitivity` is a pair of sensitivity.AXES names, e.g.
+    ("extra_payment", "living"), for a two-way what-if grid sheet.
+    `variance` is a history.VarianceReport for an actual-vs-projected sheet.
+    """
+    inputs = inputs or ModelInputs()
+    profiler = profiler or NO_PROFILER
+    inputs_data = normalized(inputs) if cache else None
+    sheets = model_sheets(_Shared(inputs, profiler), monte_carlo_paths, optimize_strategy, cash_calendar,
+                          sensitivity, workers, variance)
+    sheet_options = {"Monte Carlo": monte_carlo_paths, "Sensitivity": sensitivity and list(sensitivity),
+                     "Variance": variance.cache_key() if variance is not None else None}
+
+    wb = register_styles(StreamingWorkbook() if write_only else Workbook())
+    for i, (title, build) in enumerate(sheets):
+        with profiler.phase(f"sheet: {title}", wb) as phase:
+            if cache is None:
+                build(wb)
+                continue
+            key = cache.key("sheet", title, {f: inputs_data[f] for f in SHEET_FIELDS[title]},
+                            sheet_options.get(title))
+            record = cache.load_sheet(key)
+            if phase is not None:
+                phase["cached"] = record is not None
+            if record is None:
+                record = SheetRecord()
+                build(record.book)
+                cache.store_sheet(key, record)
+            record.replay(wb, first=i == 0)
+    write_model_info(wb, inputs, dict(monte_carlo_paths=monte_carlo_paths, optimize_strategy=optimize_strategy,
+                                      cash_calendar=cash_calendar, sensitivity=sensitivity and list(sensitivity)))
+    return wb
+
+
+def save_model(inputs, output, cache=None, profiler=None, cached_values=False, **options):
+    """Build `inputs` and save to `output`; returns True if it was served from `cache`.
+
+    A build with the same inputs, sheet options and generator version is
+    copied straight from the cache without building anything. With
+    `cached_values=True` every formula's result is evaluated and stored in
+    the file, so readers other than Excel see numbers instead of blanks.
+    """
+    inputs = inputs or ModelInputs()
+    profiler = profiler or NO_PROFILER
+
+    def write(wb):
+        with profiler.phase("save"):
+            wb.save(output)
+        if cached_values:
+            with profiler.phase("cached values"):
+                write_cached_values(output)
+
+    if cache is None:
+        write(build_model(inputs, profiler=profiler, **options))
+        return False
+    key = cache.workbook_key(inputs, cached_values, **options)
+    with profiler.phase("cache fetch"):
+        if cache.fetch(key, output):
+            return True
+    write(build_model(inputs, cache=cache, profiler=profiler, **options))
+    cache.store(key, output)
+    return False
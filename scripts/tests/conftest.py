@@ -0,0 +1,44 @@
+"""
+Tests for the financial_model package behind scripts/build-financial-model.py.
+
+Run from the repo root with `python -m pytest scripts/tests`.
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from financial_model import ModelInputs, derive  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def inputs():
+    return ModelInputs()
+
+
+@pytest.fixture(scope="session")
+def totals(inputs):
+    return derive(inputs)
+
+
+def workbook_state(wb, skip=("_model",)):
+    """Everything a reader sees in a workbook, per sheet: cell values and styles, merges, row outlines."""
+    state = {}
+    for ws in wb.worksheets:
+        if ws.title in skip:
+            continue
+        cells = {cell.coordinate: (cell.value, cell.number_format, cell.font.b, cell.fill.fgColor.rgb)
+                 for row in ws.iter_rows() for cell in row if cell.value is not None or cell.has_style}
+        rows = {r: (d.outline_level, bool(d.hidden)) for r, d in ws.row_dimensions.items()
+                if d.outline_level or d.hidden}
+        state[ws.title] = dict(cells=cells, merges=sorted(map(str, ws.merged_cells.ranges)), rows=rows,
+                               widths={c: d.width for c, d in ws.column_dimensions.items() if d.width})
+    return state
+
+
+@pytest.fixture(scope="session")
+def state_of():
+    return workbook_state
@@ -0,0 +1,70 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from financial_model.bnpl import installments, minimum_schedule, plan_frequency
+from financial_model.engine import Portfolio, month_grid
+
+START = date(2026, 1, 1)
+
+
+def plan_of(*rows, **kwargs):
+    return installments(Portfolio.from_rows(list(rows)), START, **kwargs)
+
+
+def test_evenly_split_plans_keep_their_installment_count():
+    # $355.26 in 12 payments of $29.60 leaves 6 cents: paid with the 12th, not as a 13th
+    plan = plan_of(("Affirm - 12 payments B", 355.26, 0, 29.60, 8, "CURRENT", 1))
+    assert len(plan) == 12
+    assert int(plan.cents.sum()) == 35526
+    assert plan.cents.tolist() == [2960] * 11 + [2966]
+    assert plan.day[-1] == (date(2026, 12, 8) - START).days
+
+
+def test_a_real_final_installment_is_kept():
+    plan = plan_of(("Affirm - 6 payments", 520, 0, 100, 28, "CURRENT", 1))
+    assert plan.cents.tolist() == [10000] * 5 + [2000]
+
+
+def test_monthly_plans_fall_on_their_due_day():
+    plan = plan_of(("Affirm - Feb", 300, 0, 100, 31, "CURRENT", 1))
+    assert [(START.toordinal() + int(d)) for d in plan.day] == [
+        date(2026, 1, 31).toordinal(), date(2026, 2, 28).toordinal(), date(2026, 3, 31).toordinal()]
+
+
+def test_pay_in_4_providers_bill_every_two_weeks():
+    assert plan_frequency("Sezzle - Jomashop") == "biweekly"
+    assert plan_frequency("AfterPay - Travel") == "biweekly"
+    assert plan_frequency("Affirm - 10 payments") == "monthly"
+    assert plan_frequency("Affirm - 10 payments", {"Affirm - 10 payments": "weekly"}) == "weekly"
+
+    plan = plan_of(("Sezzle - Shoes", 200, 0, 50, 5, "CURRENT", 1))
+    assert np.diff(plan.day).tolist() == [14, 14, 14]
+    with pytest.raises(ValueError, match="unknown BNPL payment frequency"):
+        plan_of(("Zip - Shoes", 200, 0, 50, 5, "CURRENT", 1), frequencies={"Zip - Shoes": "daily"})
+
+
+def test_plans_with_an_apr_accrue_interest():
+    plan = plan_of(("Affirm - 12% plan", 1000, 12, 100, 1, "CURRENT", 1))
+    assert int(plan.cents.sum()) > 100000
+    assert plan.cents[0] == 10000
+
+
+def test_totals_and_the_monthly_schedule(inputs, totals):
+    portfolio = totals.portfolio
+    plan = installments(portfolio, inputs.projection_start, inputs.bnpl_frequency)
+    assert list(plan.day) == sorted(plan.day)
+    assert (plan.counts() > 0).sum() == (portfolio.category == "BNPL").sum()
+    monthly = plan.monthly(24)
+    in_24_months = plan.day < (date(2028, 1, 1) - inputs.projection_start).days
+    assert int(np.rint(monthly.sum() * 100)) == int(plan.cents[in_24_months].sum())
+
+    schedule = minimum_schedule(portfolio, inputs.projection_start, 24, inputs.bnpl_frequency, plan=plan)
+    bnpl = portfolio.category == "BNPL"
+    month_start, _ = month_grid(inputs.projection_start, 24)
+    ended = month_start[:, None] > plan.last_day()[None, :]
+    assert ended[:, bnpl].any() and not ended[0, bnpl].any()
+    # Plans pay their installments, then (like every other account) the row's fixed minimum
+    np.testing.assert_array_equal(schedule[~ended & bnpl], monthly[~ended & bnpl])
+    np.testing.assert_array_equal(schedule[ended | ~bnpl], np.tile(portfolio.min_payment, (24, 1))[ended | ~bnpl])
@@ -0,0 +1,30 @@
+from dataclasses import replace
+
+from openpyxl import load_workbook
+import pytest
+
+from financial_model import BuildCache, build_model
+
+
+@pytest.mark.parametrize("frequency", ["monthly", "weekly"])
+def test_replayed_sheets_match_a_fresh_build(tmp_path, inputs, state_of, frequency):
+    inputs = replace(inputs, projection_frequency=frequency)
+    cache = BuildCache(tmp_path / "cache")
+    fresh = tmp_path / "fresh.xlsx"
+    build_model(inputs, cash_calendar=True).save(fresh)
+
+    for name in ("stored.xlsx", "replayed.xlsx"):  # The first build records every sheet, the second replays them
+        build_model(inputs, cash_calendar=True, cache=cache).save(tmp_path / name)
+    expected = state_of(load_workbook(fresh))
+    assert bool(expected["2026 Projections"]["rows"]) == (frequency == "weekly")  # Yearly groups
+    assert state_of(load_workbook(tmp_path / "stored.xlsx")) == expected
+    assert state_of(load_workbook(tmp_path / "replayed.xlsx")) == expected
+
+
+def test_changed_inputs_rebuild_only_their_sheets(tmp_path, inputs, state_of):
+    cache = BuildCache(tmp_path / "cache")
+    build_model(inputs, cache=cache)
+    changed = replace(inputs, extra_payment=300)
+    build_model(changed, cache=cache).save(tmp_path / "cached.xlsx")
+    build_model(changed).save(tmp_path / "fresh.xlsx")
+    assert state_of(load_workbook(tmp_path / "cached.xlsx")) == state_of(load_workbook(tmp_path / "fresh.xlsx"))
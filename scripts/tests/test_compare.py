@@ -0,0 +1,49 @@
+from dataclasses import replace
+
+import pytest
+
+from financial_model.compare import DEFAULT_SCENARIOS, apply_overrides, build_comparison, compare_scenarios
+from financial_model.summary import projection_summary
+
+
+def test_overrides_fields_debts_and_added_income(inputs, totals):
+    changed = apply_overrides(inputs, {"extra_payment": 250, "added_income": 500,
+                                       "debts": {"Sallie Mae": {"apr": 4.5, "status": "CURRENT"}}})
+    assert changed.extra_payment == 250
+    assert changed.monthly_income == pytest.approx(totals.monthly_income + 500)
+    sallie = next(row for row in changed.all_debts if row[0] == "Sallie Mae")
+    assert sallie[2] == 4.5 and sallie[5] == "CURRENT"
+    assert apply_overrides(inputs, {}) is inputs
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"income": 1}, "unknown input fields income"),
+    ({"debts": {"Nobody": {"apr": 1}}}, "no account named 'Nobody'"),
+    ({"debts": {"Sallie Mae": {"rate": 1}}}, "unknown debt field 'rate'"),
+    ({"added_income": "lots"}, "added_income must be a number"),
+])
+def test_bad_overrides(inputs, overrides, message):
+    with pytest.raises(ValueError, match=message):
+        apply_overrides(inputs, overrides, "plan")
+
+
+def test_added_income_is_new_money_but_extra_payment_is_not(inputs):
+    base = projection_summary(inputs)
+    committed = projection_summary(replace(inputs, extra_payment=500))
+    added = projection_summary(apply_overrides(inputs, DEFAULT_SCENARIOS["+$500/mo income"]))
+    assert added["interest"]["horizon"] < committed["interest"]["horizon"] - 100
+    assert added["end_of_projection"]["emergency_fund"] >= base["end_of_projection"]["emergency_fund"]
+
+
+def test_pool_and_in_process_runs_agree(inputs):
+    pooled = compare_scenarios(inputs, DEFAULT_SCENARIOS, workers=2)
+    local = compare_scenarios(inputs, DEFAULT_SCENARIOS, workers=1)
+    assert list(pooled) == list(DEFAULT_SCENARIOS)
+    assert pooled == local
+    assert pooled["Current plan"] == projection_summary(inputs, series=True)
+
+    wb = build_comparison(DEFAULT_SCENARIOS, pooled)
+    summary = wb["Scenario Summary"]
+    assert [summary[f"A{row}"].value for row in range(5, 10)] == list(DEFAULT_SCENARIOS)
+    assert summary["H6"].value == "added_income = 500"
+    assert wb["Debt by Month"]["C3"].value == "+$500/mo income"
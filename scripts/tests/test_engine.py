@@ -0,0 +1,60 @@
+from dataclasses import replace
+
+import numpy as np
+
+from financial_model.bnpl import minimum_schedule
+from financial_model.engine import Portfolio, debt_bucket, simulate
+from financial_model.inputs import project
+from financial_model.money import audit, simulate_decimal, to_cents
+
+
+def cash_flow(inputs, totals):
+    return dict(income=totals.monthly_income, bills=totals.monthly_bills, living=totals.monthly_living,
+                debt_share=inputs.debt_surplus_percent, ef_cap=inputs.emergency_fund_target,
+                extra=inputs.extra_payment)
+
+
+def test_exact_engine_matches_decimal_audit(inputs, totals):
+    months = 60
+    schedule = minimum_schedule(totals.portfolio, inputs.projection_start, months, inputs.bnpl_frequency)
+    assert audit(totals.portfolio, months, minimum_schedule=schedule, **cash_flow(inputs, totals)) == []
+    assert audit(totals.portfolio, months, **cash_flow(inputs, totals)) == []
+
+
+def test_decimal_audit_checks_the_workbook_projection(inputs, totals):
+    _, projection = project(inputs, totals)
+    schedule = minimum_schedule(totals.portfolio, inputs.projection_start, 12, inputs.bnpl_frequency)
+    balances, funds = simulate_decimal(totals.portfolio, 12, minimum_schedule=schedule, **cash_flow(inputs, totals))
+    assert float(sum(balances[11])) == round(float(projection.total_debt[0, 11]), 2)
+    assert float(funds[11]) == round(float(projection.emergency_fund[0, 11]), 2)
+
+
+def test_float_and_exact_runs_agree_to_the_dollar(inputs, totals):
+    flows = cash_flow(inputs, totals)
+    fast = simulate(totals.portfolio, 120, **flows)
+    exact = simulate(totals.portfolio, 120, exact=True, **flows)
+    assert np.abs(fast.total_debt - exact.total_debt).max() < 1
+
+
+def test_scenario_axis_matches_single_runs(inputs, totals):
+    flows = cash_flow(inputs, totals)
+    extras = np.asarray([0.0, 250.0, 1000.0])
+    batched = simulate(totals.portfolio, 48, exact=True, **{**flows, "extra": extras})
+    for s, extra in enumerate(extras):
+        single = simulate(totals.portfolio, 48, exact=True, **{**flows, "extra": extra})
+        np.testing.assert_array_equal(batched.total_debt[s], single.total_debt[0])
+
+
+def test_other_debt_types_get_their_own_bucket():
+    assert debt_bucket("CREDIT_CARD") == "CREDIT_CARD"
+    for debt_type in ("MORTGAGE", "PERSONAL_LOAN", "OTHER"):
+        assert debt_bucket(debt_type) == "OTHER"
+    rows = [("Visa", 3000, 23, 90, 5, "CURRENT", 1), ("Home", 250000, 6.5, 1580, 1, "CURRENT", 2)]
+    portfolio = Portfolio.from_rows(rows, categories=["CREDIT_CARD", "MORTGAGE"])
+    assert list(portfolio.category) == ["CREDIT_CARD", "OTHER"]
+
+
+def test_extra_payment_only_lowers_debt(inputs, totals):
+    _, base = project(inputs, totals)
+    _, more = project(replace(inputs, extra_payment=500), totals)
+    assert (to_cents(more.total_debt) <= to_cents(base.total_debt)).all()
@@ -0,0 +1,72 @@
+import csv
+
+import numpy as np
+import pytest
+
+from financial_model.engine import CATEGORIES
+from financial_model.export import SCHEMA_VERSION, SCHEMAS, _have_pyarrow, export_tables, projection_tables
+from financial_model.inputs import project
+from financial_model.paychecks import paycheck_plan
+
+
+@pytest.fixture(scope="module")
+def tables(inputs, totals):
+    return projection_tables(inputs, totals, months=24)
+
+
+def test_tables_follow_their_schemas(tables):
+    for name, columns in tables.items():
+        assert list(columns) == list(SCHEMAS[name])
+        assert len({len(values) for values in columns.values()}) == 1
+
+
+def test_projection_matches_the_workbook_run(inputs, totals, tables):
+    _, projection = project(inputs, totals)
+    np.testing.assert_allclose(tables["projection"]["total_debt"], projection.total_debt[0, :24], atol=0.005)
+    balances = sum(tables["projection"][f"balance_{c.lower()}"] for c in CATEGORIES)
+    np.testing.assert_allclose(balances, tables["projection"]["total_debt"], atol=0.01)
+
+
+def test_schedule_rows_balance(totals, tables):
+    schedule = tables["schedule"]
+    assert len(schedule["month"]) == 24 * len(totals.portfolio)
+    np.testing.assert_allclose(schedule["opening_balance"] + schedule["interest"] - schedule["payment"],
+                               schedule["balance"], atol=1e-6)
+    first = schedule["month"] == 1
+    np.testing.assert_allclose(schedule["opening_balance"][first], totals.portfolio.balance)
+
+
+def test_allocations_are_the_paycheck_plan(inputs, totals, tables):
+    plan = paycheck_plan(inputs, totals)
+    allocations = tables["allocations"]
+    assert len(allocations["amount"]) == sum(len(p.items) for p in plan)
+    assert allocations["amount"].sum() == pytest.approx(sum(p.obligations for p in plan), abs=0.05)
+    assert np.isnat(allocations["payday"][allocations["period"] == 0]).all()
+
+
+def test_csv_export(tmp_path, inputs, totals):
+    paths = export_tables(inputs, tmp_path, format="csv", totals=totals, months=12)
+    assert [p.name for p in paths] == ["projection.csv", "schedule.csv", "allocations.csv"]
+    with open(tmp_path / "projection.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == list(SCHEMAS["projection"])
+    assert len(rows) == 12 and rows[0]["month_start"] == "2026-01-01"
+    assert all(len(value.partition(".")[2]) <= 2 for row in rows for value in row.values())
+
+
+def test_arrow_formats(tmp_path, inputs, totals):
+    if not _have_pyarrow():
+        with pytest.raises(ValueError, match="needs pyarrow"):
+            export_tables(inputs, tmp_path, format="parquet", totals=totals)
+        pytest.skip("pyarrow is not installed")
+    import pyarrow.parquet as pq
+
+    export_tables(inputs, tmp_path, format="parquet", totals=totals, months=12)
+    table = pq.read_table(tmp_path / "projection.parquet")
+    assert table.column_names == list(SCHEMAS["projection"])
+    assert table.schema.metadata[b"schema_version"] == str(SCHEMA_VERSION).encode()
+
+
+def test_unknown_format(tmp_path, inputs):
+    with pytest.raises(ValueError, match="unknown export format 'xlsx'"):
+        export_tables(inputs, tmp_path, format="xlsx")
@@ -0,0 +1,94 @@
+import os
+import stat
+import zipfile
+
+from openpyxl import Workbook, load_workbook
+
+from financial_model.formulas import FormulaError, evaluate, write_cached_values
+
+
+def values(**cells):
+    return evaluate({"S": cells})["S"]
+
+
+def test_arithmetic_ranges_and_functions():
+    result = values(A1=2, A2=3, A3="=A1+A2*2", A4="=SUM(A1:A3)", A5="=ROUND(A4/3,2)", A6="=-A1^2",
+                    A7="=MAX(A1:A2)-MIN(A1:A2)", A8="=10%")
+    assert result["A3"] == 8
+    assert result["A4"] == 13
+    assert result["A5"] == 4.33
+    assert result["A6"] == 4  # Excel negates before raising to a power
+    assert result["A7"] == 1
+    assert result["A8"] == 0.1
+
+
+def test_cross_sheet_references():
+    result = evaluate({"Inputs": {"B2": 100}, "Out": {"A1": "='Inputs'!B2*2", "A2": "=Inputs!$B$2+A1"}})
+    assert result["Out"] == {"A1": 200, "A2": 300}
+
+
+def test_errors_propagate():
+    result = values(A1="=1/0", A2="=A1+1", A3='=AVERAGE(B1:B2)')
+    assert result["A1"] == FormulaError("#DIV/0!")
+    assert result["A2"] == "#DIV/0!"
+    assert result["A3"] == "#DIV/0!"
+
+
+def test_if_evaluates_only_the_chosen_branch():
+    result = values(A1=5, B1='=IF(A1>1,"x",1/0)', B2='=IF(A1<1,"x",1/0)', B3="=IF(A1>1,IF(A1>9,1,2),1/0)",
+                    B4="=-IF(A1,3,4)", B5="=IF(FALSE,1)", B6="=IF(A1>1,1/0,2)")
+    assert result["B1"] == "x"
+    assert result["B2"] == "#DIV/0!"
+    assert result["B3"] == 2
+    assert result["B4"] == -3
+    assert result["B5"] is False
+    assert result["B6"] == "#DIV/0!"
+
+
+def test_formulas_reading_unsupported_ones_stay_unevaluated():
+    result = values(A1=1, A2="=VLOOKUP(1,C1:D2,2)", A3="=A2+1", A4='="a"&"b"', A5="=A4", A6="=SUM(A1:A5)",
+                    A7="=A1+1")
+    assert result["A2"] is None
+    assert result["A3"] is None
+    assert result["A4"] is None
+    assert result["A5"] is None
+    assert result["A6"] is None
+    assert result["A7"] == 2
+
+
+def test_cycles_stay_unevaluated():
+    result = values(A1="=A2+1", A2="=A1+1", A3="=A1", A4="=1+1")
+    assert result["A1"] is None and result["A2"] is None and result["A3"] is None
+    assert result["A4"] == 2
+
+
+def test_cached_values_written_only_where_known(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "S"
+    ws["A1"] = 4
+    ws["A2"] = "=A1*2"
+    ws["A3"] = "=VLOOKUP(1,C1:D2,2)"
+    ws["A4"] = "=A3+1"
+    path = tmp_path / "book.xlsx"
+    wb.save(path)
+
+    write_cached_values(path)
+    cached = load_workbook(path, data_only=True)["S"]
+    assert cached["A2"].value == 8
+    assert cached["A3"].value is None
+    assert cached["A4"].value is None
+    assert load_workbook(path)["S"]["A4"].value == "=A3+1"
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+
+
+def test_cached_values_keep_the_file_mode(tmp_path):
+    path = tmp_path / "book.xlsx"
+    wb = Workbook()
+    wb.active["A1"] = "=1+1"
+    wb.save(path)
+    os.chmod(path, 0o644)
+
+    write_cached_values(path)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
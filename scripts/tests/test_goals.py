@@ -0,0 +1,72 @@
+from dataclasses import replace
+
+import pytest
+
+from financial_model.goals import GoalSolver, check_goals
+from financial_model.inputs import project
+
+
+def goals_for(inputs, totals, goals):
+    goal_inputs = replace(inputs, goals=goals)
+    _, projection = project(goal_inputs, totals)
+    return check_goals(goal_inputs, totals, projection)
+
+
+def test_bnpl_goal_is_met_on_the_default_plan(inputs, totals):
+    _, projection = project(inputs, totals)
+    bnpl = next(g for g in check_goals(inputs, totals, projection) if g.metric == "BNPL")
+    assert bnpl.met
+    assert bnpl.extra_needed == 0
+
+
+def test_results_read_the_projection(inputs, totals):
+    _, projection = project(inputs, totals)
+    results = check_goals(inputs, totals, projection)
+    assert [g.label for g in results] == [label for label, *_ in inputs.goals]
+    debt = next(g for g in results if g.metric == "total_debt")
+    assert debt.projected == round(float(projection.total_debt[0, debt.month - 1]), 2)
+    assert debt.met == (debt.projected <= debt.target)
+    fund = next(g for g in results if g.metric == "emergency_fund")
+    assert fund.extra_needed is None
+
+
+def test_extra_needed_is_the_least_that_meets_the_goal(inputs, totals):
+    _, projection = project(inputs, totals)
+    target = round(float(projection.total_debt[0, 11]) - 5000, 2)
+    goal, = goals_for(inputs, totals, [("Debt", "total_debt", target, 12)])
+    assert not goal.met
+    assert goal.reached_month == -1 or goal.reached_month > 12
+    assert goal.extra_needed > 0
+
+    solver = GoalSolver(inputs, totals, 12)
+    cents = round(goal.extra_needed * 100)
+    enough, short = solver.values("total_debt", 12, [cents, cents - 100])
+    assert enough <= target + 0.005
+    assert short > target
+
+
+def test_a_goal_met_later_reports_its_month(inputs, totals):
+    _, projection = project(inputs, totals)
+    target = round(float(projection.total_debt[0, 5]), 2)
+    goal, = goals_for(inputs, totals, [("Debt", "total_debt", target, 3)])
+    assert not goal.met
+    assert goal.reached_month == 6
+    assert goal.extra_needed > 0
+
+
+def test_goals_share_one_solver_cache(inputs, totals):
+    solver = GoalSolver(inputs, totals, 12)
+    solver.minimum_extra("total_debt", 60000, 12)
+    runs = solver.simulations
+    solver.minimum_extra("total_debt", 60000, 12)
+    assert solver.simulations == runs
+
+
+@pytest.mark.parametrize("goal, message", [
+    (("Savings", "savings", 1000, 12), "unknown metric"),
+    (("Late", "total_debt", 0, 0), "outside"),
+    (("Later", "total_debt", 0, 361), "outside"),
+])
+def test_invalid_goals_are_rejected(inputs, totals, goal, message):
+    with pytest.raises(ValueError, match=message):
+        goals_for(inputs, totals, [goal])
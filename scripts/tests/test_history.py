@@ -0,0 +1,84 @@
+from dataclasses import replace
+from datetime import date
+
+import numpy as np
+
+from financial_model import build_model
+from financial_model.engine import CATEGORIES
+from financial_model.history import HistoryStore, month_key, record_history
+from financial_model.inputs import derive, project
+
+
+def paid_down(inputs, as_of, start, amount):
+    debts = [(name, max(balance - amount, 0), *rest) for name, balance, *rest in inputs.all_debts]
+    return replace(inputs, as_of=as_of, projection_start=start, all_debts=debts)
+
+
+def category_balances(inputs):
+    portfolio = derive(inputs).portfolio
+    return np.asarray([portfolio.balance[portfolio.category == c].sum() for c in CATEGORIES])
+
+
+def test_identical_inputs_are_recorded_once(tmp_path, inputs):
+    with HistoryStore(tmp_path / "history.db") as store:
+        first = store.record("alice", inputs)
+        assert store.record("alice", inputs) == first
+        assert store.record("bob", inputs) != first
+        assert store.con.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 2
+        accounts = store.con.execute("SELECT COUNT(*) FROM balances WHERE snapshot = ?", (first,)).fetchone()[0]
+        assert accounts == len(inputs.all_debts)
+
+
+def test_variance_compares_actuals_with_earlier_projections(tmp_path, inputs):
+    feb = paid_down(inputs, date(2026, 2, 10), date(2026, 3, 1), 100)
+    feb_later = paid_down(inputs, date(2026, 2, 25), date(2026, 3, 1), 150)
+    mar = paid_down(inputs, date(2026, 3, 20), date(2026, 4, 1), 300)
+    with HistoryStore(tmp_path / "history.db") as store:
+        for snapshot in (inputs, feb, feb_later, mar):
+            store.record("alice", snapshot)
+        report = store.variance("alice")
+
+    assert list(report.months) == [month_key(date(2025, 12, 1)), month_key(date(2026, 2, 1)),
+                                   month_key(date(2026, 3, 1))]
+    assert report.as_of == [inputs.as_of, feb_later.as_of, mar.as_of]
+    assert report.planned_on == inputs.as_of
+    for row, snapshot in enumerate((inputs, feb_later, mar)):
+        np.testing.assert_allclose(report.actual[row], category_balances(snapshot), atol=0.005)
+
+    # December has no earlier snapshot; February was projected by the first one,
+    # March by the last February one
+    assert np.isnan(report.projected[0]).all() and np.isnan(report.planned[0]).all()
+    assert report.projected_on == [None, inputs.as_of, feb_later.as_of]
+    _, plan = project(inputs)
+    _, late_feb = project(feb_later)
+    np.testing.assert_allclose(report.projected[1], plan.group_balances[0, 1], atol=0.005)
+    np.testing.assert_allclose(report.projected[2], late_feb.group_balances[0, 0], atol=0.005)
+    np.testing.assert_allclose(report.planned[2], plan.group_balances[0, 2], atol=0.005)
+
+
+def test_variance_window_and_unknown_users(tmp_path, inputs):
+    later = paid_down(inputs, date(2026, 6, 5), date(2026, 7, 1), 200)
+    with HistoryStore(tmp_path / "history.db") as store:
+        store.record("alice", inputs)
+        store.record("alice", later)
+        assert len(store.variance("alice", months=3)) == 1
+        assert len(store.variance("alice", until=date(2026, 1, 31))) == 1
+        assert len(store.variance("nobody")) == 0
+
+
+def test_variance_sheet(tmp_path, inputs):
+    record_history(tmp_path / "history.db", "alice", inputs)
+    report = record_history(tmp_path / "history.db", "alice", paid_down(inputs, date(2026, 2, 10),
+                                                                        date(2026, 3, 1), 100))
+    ws = build_model(inputs, variance=report)["Variance"]
+    assert ws["A3"].value == "Plan: the first snapshot, Dec 27, 2025"
+    assert [ws[f"A{row}"].value for row in (6, 7)] == ["Dec 2025", "Feb 2026"]
+    assert ws["D6"].value is None
+    assert ws["D7"].value == round(float(report.projected[1].sum()), 2)
+    assert ws["E7"].value == "=C7-D7"
+
+
+def test_empty_history_has_a_placeholder_sheet(tmp_path, inputs):
+    with HistoryStore(tmp_path / "history.db") as store:
+        report = store.variance("alice")
+    assert build_model(inputs, variance=report)["Variance"]["A4"].value == "No snapshots recorded yet"
@@ -0,0 +1,39 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from financial_model.inputs import project
+from financial_model.ledger import projection_periods, simulate_ledger
+
+
+def year_end(periods, year):
+    """Index of the last period of `year`."""
+    return max(i for i, d in enumerate(periods.dates()) if d.year == year)
+
+
+@pytest.mark.parametrize("frequency", ["weekly", "biweekly"])
+def test_periods_agree_with_the_monthly_run(inputs, totals, frequency):
+    _, projection = project(inputs, totals)
+    monthly = projection_periods(inputs, totals, projection)
+    periods = projection_periods(replace(inputs, projection_frequency=frequency), totals, projection)
+
+    last, monthly_last = year_end(periods, 2026), year_end(monthly, 2026)
+    assert periods.end_labels()[last] == "Dec 31 2026"
+    np.testing.assert_allclose(periods.balances[last], monthly.balances[monthly_last], atol=0.005)
+    assert periods.emergency_fund[last] == pytest.approx(monthly.emergency_fund[monthly_last])
+
+    in_2026 = [d.year == 2026 for d in periods.dates()]
+    for flow in ("income", "bills", "debt_minimums", "bnpl", "living", "to_debt", "to_savings"):
+        assert getattr(periods, flow)[in_2026].sum() == pytest.approx(getattr(monthly, flow)[:12].sum()), flow
+
+
+def test_periods_start_on_paydays(inputs, totals):
+    _, projection = project(inputs, totals)
+    periods = projection_periods(replace(inputs, projection_frequency="biweekly"), totals, projection)
+    paydays = set(simulate_ledger(inputs, totals).paydays.tolist())
+    dates = periods.dates()
+    # Every period after the first starts on a payday, or on Jan 1 where a year splits one
+    assert all(day in paydays or (dates[i].month, dates[i].day) == (1, 1)
+               for i, day in enumerate(periods.first_day.tolist()) if i)
+    assert (periods.last_day[:-1] + 1 == periods.first_day[1:]).all()
@@ -0,0 +1,52 @@
+from decimal import Decimal
+from pathlib import Path
+import subprocess
+import sys
+
+import numpy as np
+
+from financial_model.engine import Portfolio
+from financial_model.money import audit, half_up, simulate_decimal, to_basis_points, to_cents, to_decimal
+
+SCRIPT = Path(__file__).resolve().parent.parent / "build-financial-model.py"
+
+
+def test_rounding_is_half_up_on_the_decimal_spelling():
+    assert to_cents([1.005, 2.675, 0.125, -1.005, 19.99]).tolist() == [101, 268, 13, -101, 1999]
+    assert to_basis_points([0.8, 0.12345, 1]).tolist() == [8000, 1235, 10000]
+    assert half_up(np.array([5, 15, 14]), 10).tolist() == [1, 2, 1]
+    assert to_decimal(2.675) == Decimal("2.68")
+
+
+def test_decimal_reference_by_hand():
+    portfolio = Portfolio.from_rows([("Card", 1000, 12, 50, 1, "CURRENT", 1)])
+    balances, funds = simulate_decimal(portfolio, 2, income=500, bills=200, living=100, debt_share=0.8,
+                                       ef_cap=1000)
+    # Month 1: +10.00 interest, -50 minimum, then 150 surplus: 30 saved, 120 to the card
+    assert balances[0] == [Decimal("840.00")]
+    assert funds[0] == Decimal("30.00")
+    # Month 2: +8.40 interest
+    assert balances[1] == [Decimal("678.40")]
+    assert funds[1] == Decimal("60.00")
+
+
+def test_random_portfolios_audit_exactly():
+    rng = np.random.default_rng(7)
+    for _ in range(5):
+        n = 12
+        rows = [(f"Debt {i}", round(float(rng.uniform(50, 20000)), 2), round(float(rng.uniform(0, 30)), 2),
+                 round(float(rng.uniform(15, 400)), 2), int(rng.integers(1, 29)), "CURRENT", i + 1)
+                for i in range(n)]
+        portfolio = Portfolio.from_rows(rows)
+        schedule = np.tile(portfolio.min_payment, (48, 1)) * rng.choice([0.5, 1, 1.5], (48, n))
+        flows = dict(income=round(float(rng.uniform(3000, 9000)), 2), bills=412.37, living=803.11,
+                     debt_share=float(rng.choice([0.5, 0.8, 0.12345])), ef_cap=1234.56, extra=99.99)
+        assert audit(portfolio, 48, **flows) == []
+        assert audit(portfolio, 48, minimum_schedule=np.round(schedule, 2), **flows) == []
+
+
+def test_audit_command():
+    done = subprocess.run([sys.executable, str(SCRIPT), "audit", "--months", "60"],
+                          capture_output=True, text=True)
+    assert done.returncode == 0, done.stderr
+    assert done.stdout.strip().endswith("x 60 months: exact to the cent")
@@ -0,0 +1,45 @@
+import numpy as np
+
+from financial_model.engine import simulate
+from financial_model.montecarlo import PERCENTILES, Shocks, run_monte_carlo
+
+CALM = Shocks(income_sigma=0, income_loss_rate=0, overrun_rate=0, apr_sigma=0)
+
+
+def flows(inputs, totals):
+    return dict(income=totals.monthly_income, living=totals.monthly_living, bills=totals.monthly_bills,
+                debt_share=inputs.debt_surplus_percent, ef_cap=inputs.emergency_fund_target,
+                extra=inputs.extra_payment)
+
+
+def test_without_shocks_every_path_is_the_deterministic_run(inputs, totals):
+    result = run_monte_carlo(totals.portfolio, 36, paths=50, shocks=CALM, workers=1, chunk_size=20,
+                             **flows(inputs, totals))
+    expected = simulate(totals.portfolio, 36, **flows(inputs, totals))
+    for band in result.debt_bands:
+        np.testing.assert_allclose(band, expected.total_debt[0], rtol=1e-5, atol=0.01)
+    assert (result.payoff_bands == expected.payoff_month[0]).all()
+    assert result.debt_free_share == 1.0
+
+
+def test_bands_are_ordered_and_reproducible(inputs, totals):
+    run = dict(paths=3000, workers=1, chunk_size=1000, **flows(inputs, totals))
+    result = run_monte_carlo(totals.portfolio, 60, **run)
+    assert result.debt_bands.shape == (len(PERCENTILES), 60)
+    assert (np.diff(result.debt_bands, axis=0) >= 0).all()
+    assert (np.diff(result.fund_bands, axis=0) >= 0).all()
+    assert list(result.payoff_bands) == sorted(result.payoff_bands)
+    assert 0 < result.debt_free_share <= 1
+
+    again = run_monte_carlo(totals.portfolio, 60, **run)
+    np.testing.assert_array_equal(result.debt_bands, again.debt_bands)
+    pooled = run_monte_carlo(totals.portfolio, 60, **dict(run, workers=2))
+    np.testing.assert_array_equal(result.debt_bands, pooled.debt_bands)
+
+
+def test_harsher_shocks_push_the_payoff_later(inputs, totals):
+    run = dict(paths=2000, workers=1, **flows(inputs, totals))
+    mild = run_monte_carlo(totals.portfolio, 60, **run)
+    harsh = run_monte_carlo(totals.portfolio, 60, shocks=Shocks(income_loss_rate=0.2, overrun_rate=0.6), **run)
+    assert harsh.payoff_bands[1] >= mild.payoff_bands[1]
+    assert harsh.debt_bands[1, -12:].sum() >= mild.debt_bands[1, -12:].sum()
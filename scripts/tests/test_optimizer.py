@@ -0,0 +1,49 @@
+import numpy as np
+
+from financial_model.engine import avalanche_order, snowball_order
+from financial_model.optimizer import (Policy, _evaluate, candidate_orders, candidate_policies, evaluate,
+                                       optimize, pareto_front)
+
+
+def money(totals):
+    return dict(income=totals.monthly_income, bills=totals.monthly_bills, living=totals.monthly_living)
+
+
+def test_pareto_front():
+    points = [(1, 5), (2, 2), (3, 3), (5, 1), (1, 6), (2, 2)]
+    assert list(pareto_front(points)) == [0, 1, 3, 5]  # Ties do not dominate each other
+
+
+def test_candidate_orders_are_distinct_permutations(totals):
+    orders = candidate_orders(totals.portfolio)
+    names = [name for name, _ in orders]
+    assert names[:2] == ["Avalanche", "Snowball"]
+    np.testing.assert_array_equal(orders[0][1], avalanche_order(totals.portfolio))
+    np.testing.assert_array_equal(orders[1][1], snowball_order(totals.portfolio))
+    assert len({order.tobytes() for _, order in orders}) == len(orders)
+    for _, order in orders:
+        assert sorted(order) == list(range(len(totals.portfolio)))
+
+
+def test_pruning_keeps_the_exact_pareto_front(inputs, totals):
+    policies = candidate_policies(totals.portfolio, debt_shares=(0.6, 0.8, 1.0), ef_caps=(0, 1000, 3000))
+    front = optimize(totals.portfolio, policies=policies, **money(totals))
+    assert front and [e.total_interest for e in front] == sorted(e.total_interest for e in front)
+
+    # Every policy simulated to the end without pruning gives the same front
+    interest, payoff, cushion = _evaluate(totals.portfolio, policies, extra=0.0, horizon=360, stage=360,
+                                          prune=False, **money(totals))
+    reached = np.flatnonzero(payoff > 0)
+    points = np.column_stack([interest[reached], payoff[reached], -cushion[reached]])
+    exact = {tuple(np.round(points[i], 2)) for i in pareto_front(points)}
+    assert {(round(e.total_interest, 2), e.payoff_month, round(-e.cushion, 2)) for e in front} == exact
+
+
+def test_evaluate_matches_the_current_plan(inputs, totals):
+    current = Policy("Current", avalanche_order(totals.portfolio), inputs.debt_surplus_percent,
+                     inputs.emergency_fund_target)
+    result = evaluate(totals.portfolio, current, **money(totals))
+    assert result.payoff_month > 0 and result.total_interest > 0
+    more_to_debt = evaluate(totals.portfolio, Policy("All in", current.order, 1.0, 0), **money(totals))
+    assert more_to_debt.total_interest < result.total_interest
+    assert more_to_debt.cushion < result.cushion
@@ -0,0 +1,51 @@
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+
+from financial_model import build_model
+from financial_model.inputs import derive, paycheck_allocations
+from financial_model.paychecks import paycheck_plan
+
+
+def test_periods_run_payday_to_payday(inputs, totals):
+    periods = paycheck_plan(inputs, totals)
+    assert periods[0].number == 0 and periods[0].start == inputs.projection_start
+    assert periods[0].paycheck == inputs.cash_on_hand
+    assert len(periods) == 27
+    for before, after in zip(periods, periods[1:]):
+        assert after.start == before.end + timedelta(days=1)
+    for period in periods[1:]:
+        assert (period.start - inputs.last_paycheck).days % 14 == 0
+        assert period.paycheck == inputs.net_paycheck
+
+
+def test_every_obligation_lands_in_the_period_it_is_due(inputs, totals):
+    for period in paycheck_plan(inputs, totals):
+        assert all(period.start <= due <= period.end for due, *_ in period.items)
+        by_kind = {"BILL": 0, "DEBT": 0, "BNPL": 0}
+        for _, _, kind, amount in period.items:
+            by_kind[kind if kind in by_kind else "DEBT"] += amount
+        assert period.bills == pytest.approx(by_kind["BILL"], abs=0.01)
+        assert period.bnpl == pytest.approx(by_kind["BNPL"], abs=0.01)
+        assert period.debt == pytest.approx(by_kind["DEBT"], abs=0.01)
+
+
+@pytest.mark.parametrize("frequency, per_month", [("weekly", 4.33), ("biweekly", 2.17), ("monthly", 1)])
+def test_bill_allocations_follow_the_paycheck_frequency(inputs, frequency, per_month):
+    changed = replace(inputs, paycheck_frequency=frequency)
+    rows = {name: amount for name, amount, _ in paycheck_allocations(changed, derive(changed))}
+    assert rows["Clearcover Insurance"] == pytest.approx(239 / per_month)
+    assert rows["Gym"] == pytest.approx(20 / per_month)
+    assert rows["Best Buy Credit Card"] == 230  # Per-paycheck lines are kept as written
+
+
+def test_budget_labels_follow_the_paycheck_frequency(inputs):
+    wb = build_model(replace(inputs, paycheck_frequency="weekly"))
+    assert wb["Snapshot"]["A5"].value == "Net Paycheck (weekly)"
+    assert wb["Snapshot"]["B7"].value == "=B5*52"
+    budget = wb["Every Dollar Budget"]
+    assert budget["A1"].value.startswith("WEEKLY PAY PERIOD BUDGET")
+    assert budget["A3"].value == "This budget is for ONE pay period (1 week). You get paid weekly."
+    assert not any("2.17" in str(cell.value) or "biweekly" in str(cell.value).lower()
+                   for row in budget.iter_rows() for cell in row)
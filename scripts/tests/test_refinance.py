@@ -0,0 +1,74 @@
+import pytest
+
+from financial_model.refinance import (DEFAULT_OFFERS, Offer, candidate_moves, evaluate_offers,
+                                       federal_loan, offers_from_data)
+
+FEDERAL = "Nelnet Federal Student Loans"
+
+
+@pytest.fixture(scope="module")
+def ranked(inputs):
+    return evaluate_offers(inputs, DEFAULT_OFFERS)
+
+
+def test_federal_student_loans_are_never_moved(inputs, totals, ranked):
+    assert federal_loan(FEDERAL, "STUDENT_LOAN")
+    assert not federal_loan("Sallie Mae", "STUDENT_LOAN")
+    assert not federal_loan("Navy Federal CashRewards", "CREDIT_CARD")
+
+    # Even an offer far cheaper than the loan's 5% never takes it
+    cheap = Offer(name="1% consolidation", kind="consolidation_loan", apr=1, term_months=60)
+    names = totals.portfolio.names
+    moved = {names[a] for a, _ in candidate_moves(totals.portfolio, [cheap])}
+    assert "Sallie Mae" in moved and "LendKey Student Loan" in moved
+    assert FEDERAL not in moved
+    _, plans = evaluate_offers(inputs, [cheap])
+    assert plans and all(account != FEDERAL for p in plans for account, _ in p.moves)
+    assert all(account != FEDERAL for p in ranked[1] for account, _ in p.moves)
+
+
+def test_plans_are_ranked_by_interest_saved(ranked):
+    baseline, plans = ranked
+    assert baseline.moves == () and baseline.interest_saved == 0
+    assert plans
+    saved = [p.interest_saved for p in plans]
+    assert saved == sorted(saved, reverse=True) and saved[-1] > 0
+    for plan in plans:
+        assert plan.interest == pytest.approx(baseline.interest - plan.interest_saved, abs=0.01)
+    assert any(p.pareto for p in plans)
+
+
+def test_offers_respect_categories_limits_and_account_caps(totals, ranked):
+    categories = dict(zip(totals.portfolio.names, totals.portfolio.category))
+    balances = dict(zip(totals.portfolio.names, totals.portfolio.balance))
+    offers = {o["name"]: Offer(**o) for o in DEFAULT_OFFERS}
+    for plan in ranked[1]:
+        taken = {}
+        for account, offer in plan.moves:
+            kind = offers[offer].kind
+            assert categories[account] == {"balance_transfer": "CREDIT_CARD",
+                                           "auto_refinance": "AUTO_LOAN"}.get(kind, categories[account])
+            taken.setdefault(offer, []).append(balances[account])
+        for offer, moved in taken.items():
+            o = offers[offer]
+            if o.limit is not None:
+                assert sum(moved) * (1 + o.fee_percent / 100) <= o.limit + 0.01
+            if o.accounts is not None:
+                assert len(moved) <= o.accounts
+
+
+def test_no_offer_below_any_apr_saves_nothing(inputs):
+    expensive = Offer(name="40% loan", kind="consolidation_loan", apr=40, term_months=36)
+    baseline, plans = evaluate_offers(inputs, [expensive])
+    assert plans == [] and baseline.payoff_month > 0
+
+
+def test_offers_from_data_validates(inputs):
+    with pytest.raises(ValueError, match="unknown fields"):
+        offers_from_data([{"name": "x", "kind": "balance_transfer", "apr": 5, "rate": 1}])
+    with pytest.raises(ValueError, match="unique"):
+        offers_from_data([DEFAULT_OFFERS[0], DEFAULT_OFFERS[0]])
+    with pytest.raises(ValueError, match="needs term_months"):
+        offers_from_data([{"name": "x", "kind": "consolidation_loan", "apr": 5}])
+    with pytest.raises(ValueError, match="unknown kind"):
+        Offer(name="x", kind="mortgage", apr=5)
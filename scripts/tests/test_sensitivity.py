@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from financial_model import sensitivity
+from financial_model.bnpl import minimum_schedule
+from financial_model.choices import SENSITIVITY_AXES
+from financial_model.engine import simulate
+from financial_model.sensitivity import AXES, axis_values, current_values, sweep
+
+
+def test_axes_match_the_cli_choices():
+    assert tuple(AXES) == SENSITIVITY_AXES
+
+
+def test_relative_axes_scale_the_current_value():
+    np.testing.assert_array_equal(axis_values("living", 2000, steps=3), [1000, 2000, 3000])
+    np.testing.assert_array_equal(axis_values("extra_payment", 2000, steps=3), [0, 1000, 2000])
+    assert axis_values("debt_share", 0.8, steps=4).tolist() == [0.5, 0.6667, 0.8333, 1.0]
+
+
+def test_unknown_or_repeated_axes_are_rejected(inputs, totals):
+    with pytest.raises(ValueError, match="unknown sensitivity axis"):
+        sweep(inputs, totals, "extra_payment", "rent")
+    with pytest.raises(ValueError, match="must differ"):
+        sweep(inputs, totals, "living", "living")
+
+
+def test_each_cell_is_the_single_scenario_run(inputs, totals):
+    x_values, y_values = [0, 300, 1200], [0.6, 0.9]
+    grid = sweep(inputs, totals, "extra_payment", "debt_share", x_values=x_values, y_values=y_values, workers=1)
+    assert grid.payoff_month.shape == grid.total_interest.shape == (2, 3)
+    assert grid.current == (inputs.extra_payment, inputs.debt_surplus_percent)
+
+    months = inputs.payoff_horizon
+    schedule = minimum_schedule(totals.portfolio, inputs.projection_start, months, inputs.bnpl_frequency)
+    for i, share in enumerate(y_values):
+        for j, extra in enumerate(x_values):
+            single = simulate(totals.portfolio, months, minimum_schedule=schedule,
+                              income=totals.monthly_income, bills=totals.monthly_bills,
+                              living=totals.monthly_living, debt_share=share,
+                              ef_cap=inputs.emergency_fund_target, extra=extra)
+            assert grid.payoff_month[i, j] == single.payoff_month[0]
+            assert grid.total_interest[i, j] == pytest.approx(single.total_interest[0])
+
+
+def test_net_paycheck_axis_sets_income_per_paycheck(inputs, totals):
+    paycheck = current_values(inputs, totals)["net_paycheck"]
+    grid = sweep(inputs, totals, "net_paycheck", "living", x_values=[paycheck], y_values=[totals.monthly_living],
+                 workers=1)
+    base = sweep(inputs, totals, "extra_payment", "living", x_values=[inputs.extra_payment],
+                 y_values=[totals.monthly_living], workers=1)
+    assert grid.payoff_month[0, 0] == base.payoff_month[0, 0]
+    assert grid.total_interest[0, 0] == pytest.approx(base.total_interest[0, 0])
+
+
+def test_paying_more_never_pays_off_later(inputs, totals):
+    grid = sweep(inputs, totals, steps=7, workers=1)
+    payoff = np.where(grid.payoff_month < 0, np.iinfo(np.int32).max, grid.payoff_month)
+    assert (np.diff(payoff, axis=1) <= 0).all()   # More extra payment
+    assert (np.diff(payoff, axis=0) >= 0).all()   # Higher living costs
+
+
+def test_chunks_across_the_pool_match_one_run(inputs, totals, monkeypatch):
+    single = sweep(inputs, totals, steps=6, workers=1)
+    monkeypatch.setattr(sensitivity, "CHUNK_CELLS", inputs.payoff_horizon * 5)
+    pooled = sweep(inputs, totals, steps=6, workers=2)
+    np.testing.assert_array_equal(pooled.payoff_month, single.payoff_month)
+    np.testing.assert_allclose(pooled.total_interest, single.total_interest)
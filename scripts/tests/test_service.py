@@ -0,0 +1,121 @@
+from dataclasses import replace
+import asyncio
+import json
+import os
+
+import pytest
+
+from financial_model.service import ModelService, apply_scenario
+
+
+def request(service, method, target, body=b""):
+    """(status, decoded body) for one request to `service.handle` over a real socket."""
+    async def run():
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"{method} {target} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    head, _, payload = asyncio.run(run()).partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, payload if b"spreadsheetml" in head else json.loads(payload)
+
+
+@pytest.fixture
+def service():
+    service = ModelService(workers=1)
+    yield service
+    service.pool.shutdown()
+
+
+def test_apply_scenario(inputs):
+    changed = apply_scenario(inputs, {"income": "7000", "debt_share": 0.5})
+    assert changed.monthly_income == 7000 and changed.debt_surplus_percent == 0.5
+    for overrides, message in (({"bonus": 1}, "unknown scenario fields bonus"),
+                               ({"income": "lots"}, "income must be a number"),
+                               ({"debt_share": 2}, "debt_share out of range"),
+                               ({"extra_payment": "nan"}, "extra_payment out of range")):
+        with pytest.raises(ValueError, match=message):
+            apply_scenario(inputs, overrides)
+
+
+def test_projection_and_scenario(service):
+    status, baseline = request(service, "GET", "/projection")
+    assert status == 200 and baseline["debt_free"] and baseline["series"]
+    status, scenario = request(service, "POST", "/scenario", json.dumps({"extra_payment": 500}).encode())
+    assert status == 200
+    assert scenario["scenario"] == {"extra_payment": 500}
+    assert scenario["vs_baseline"]["interest_saved"] > 0
+    status, body = request(service, "GET", "/workbook?extra_payment=100")
+    assert status == 200 and body[:2] == b"PK"
+
+
+@pytest.mark.parametrize("method, target, body, status, message", [
+    ("GET", "/nowhere", b"", 404, "no route /nowhere"),
+    ("POST", "/projection", b"", 405, "/projection takes GET"),
+    ("GET", "/projection?income=abc", b"", 400, "income must be a number"),
+    ("GET", "/projection?bonus=1", b"", 400, "unknown scenario fields"),
+    ("POST", "/scenario", b"{oops", 400, "body is not JSON"),
+    ("POST", "/scenario", b"[1]", 400, "body must be a JSON object"),
+])
+def test_client_errors(service, method, target, body, status, message):
+    got, result = request(service, method, target, body)
+    assert got == status
+    assert message in result["error"]
+    assert service.stats["builds"] == 0
+
+
+@pytest.mark.parametrize("content", [None, "{not json", json.dumps({"all_debts": [["Card", "lots"]]})])
+def test_inputs_that_cannot_load_are_server_errors(tmp_path, content):
+    path = tmp_path / "user.json"
+    if content is not None:
+        path.write_text(content)
+    service = ModelService(inputs_path=path, workers=1)
+    try:
+        status, result = request(service, "GET", "/projection?income=7000")
+    finally:
+        service.pool.shutdown()
+    assert status == 500
+    assert result["error"].startswith(f"cannot load {path}")
+
+
+def test_inputs_reload_when_the_file_changes(tmp_path, service):
+    path = tmp_path / "user.json"
+    path.write_text(json.dumps({"extra_payment": 100}))
+    service.inputs_path = path
+    assert asyncio.run(service.inputs()).extra_payment == 100
+    path.write_text(json.dumps({"extra_payment": 200}))
+    os.utime(path, ns=(0, 1))  # A different modification time, however fast the rewrite
+    assert asyncio.run(service.inputs()).extra_payment == 200
+
+
+def test_identical_requests_share_one_build(inputs, service):
+    async def run():
+        first, second = await asyncio.gather(service.result("projection", inputs),
+                                             service.result("projection", inputs))
+        third = await service.result("projection", inputs)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first == second == third
+    assert service.stats == dict(builds=1, hits=1, coalesced=1)
+
+
+def test_finished_results_are_an_lru(inputs, service):
+    service.results = 2
+    scenarios = [replace(inputs, extra_payment=x) for x in (100, 200, 300)]
+
+    async def run():
+        for scenario in scenarios:
+            await service.result("projection", scenario)
+        await service.result("projection", scenarios[0])
+
+    asyncio.run(run())
+    assert service.stats["builds"] == 4 and service.stats["hits"] == 0
+    assert len(service._done) == 2
@@ -0,0 +1,127 @@
+import csv
+from datetime import date
+import json
+import sqlite3
+
+import pytest
+
+from financial_model.cache import normalized
+from financial_model.inputs import ModelInputs, derive, inputs_from_data, load_inputs, paycheck_allocations
+from financial_model.snapshot import load_snapshot
+
+USER = {"id": "u1", "paycheckFrequency": "biweekly", "paycheckAmount": "2800.00", "lastPaycheckDate":
+        "2026-03-04T00:00:00.000Z", "debtSurplusPercent": "0.75", "updatedAt": "2026-02-20T10:00:00.000Z"}
+DEBTS = [
+    {"name": "Visa", "type": "CREDIT_CARD", "status": "CURRENT", "currentBalance": "3000.00",
+     "interestRate": "24.99", "minimumPayment": "90.00", "dueDay": 5, "updatedAt": "2026-03-08T12:00:00.000Z"},
+    {"name": "Car", "type": "AUTO_LOAN", "status": "PAST_DUE", "currentBalance": "15000",
+     "interestRate": "7.5", "minimumPayment": "400", "dueDay": 12, "pastDueAmount": "400"},
+    {"name": "Affirm - Laptop", "type": "BNPL", "status": "CURRENT", "currentBalance": "600",
+     "interestRate": "0", "minimumPayment": "100", "dueDay": 20, "paymentFrequency": "monthly"},
+    {"name": "Home", "type": "MORTGAGE", "status": "CURRENT", "currentBalance": "200000",
+     "interestRate": "6.25", "minimumPayment": "1500", "dueDay": 1},
+    {"name": "Old card", "type": "CREDIT_CARD", "status": "PAID_OFF", "currentBalance": "0",
+     "interestRate": "20", "minimumPayment": "0", "dueDay": 1},
+]
+BILLS = [{"name": "Insurance", "category": "INSURANCE", "amount": "120", "dueDay": 23, "frequency": "MONTHLY"},
+         {"name": "Card autopay", "category": "CREDIT_CARD", "amount": "90", "dueDay": 5, "frequency": "MONTHLY",
+          "debtId": "d1"}]
+
+
+def export(tmp_path, **extra):
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps({"user": USER, "debts": DEBTS, "bills": BILLS, **extra}))
+    return path
+
+
+def test_json_export(tmp_path):
+    inputs = load_inputs(export(tmp_path))
+    assert [row[0] for row in inputs.all_debts] == ["Visa", "Car", "Home", "Affirm - Laptop"]
+    assert inputs.debt_types == ["CREDIT_CARD", "AUTO_LOAN", "MORTGAGE", "BNPL"]
+    assert inputs.all_debts[1][5] == "PAST DUE - $400"
+    assert inputs.net_paycheck == 2800 and inputs.debt_surplus_percent == 0.75
+    assert inputs.bnpl_frequency == {"Affirm - Laptop": "monthly"}
+    assert inputs.bills == [("Insurance", 120.0, 23, "MONTHLY")]  # The debt's autopay is its minimum
+    assert inputs.category_notes["AUTO_LOAN"] == "Car is PAST DUE - $400 behind"
+    assert ("Insurance", 120.0, "Due 23rd", "MONTHLY") in inputs.allocations
+    totals = derive(inputs)
+    assert totals.total_debt == 218600
+    assert dict((n, a) for n, a, _ in paycheck_allocations(inputs, totals))["Insurance"] == pytest.approx(120 / 2.17)
+
+
+def test_as_of_comes_from_the_export(tmp_path):
+    # Latest updatedAt of any row when there is no export time
+    inputs = load_snapshot(export(tmp_path))
+    assert inputs.as_of == date(2026, 3, 8)
+    assert inputs.projection_start == date(2026, 4, 1)
+    inputs = load_snapshot(export(tmp_path, exportedAt="2026-03-10T08:00:00.000Z"))
+    assert inputs.as_of == date(2026, 3, 10)
+    assert load_snapshot(export(tmp_path), as_of=date(2026, 5, 2)).as_of == date(2026, 5, 2)
+
+
+def test_the_same_export_builds_the_same_inputs(tmp_path):
+    path = export(tmp_path)
+    assert normalized(load_snapshot(path)) == normalized(load_snapshot(path))
+
+
+def test_without_any_dates_it_is_as_of_today(tmp_path):
+    path = tmp_path / "export.json"
+    undated = [{k: v for k, v in row.items() if k != "updatedAt"} for row in [USER, *DEBTS]]
+    path.write_text(json.dumps({"user": undated[0], "debts": undated[1:], "bills": BILLS}))
+    assert load_snapshot(path).as_of == date.today()
+
+
+def test_csv_directory_and_sqlite(tmp_path):
+    from_json = normalized(load_snapshot(export(tmp_path)))
+    directory = tmp_path / "csv"
+    directory.mkdir()
+    for name, rows in (("user", [USER]), ("debts", DEBTS), ("bills", BILLS)):
+        keys = sorted({k for row in rows for k in row})
+        with open(directory / f"{name}.csv", "w", newline="") as f:
+            writer = csv.DictWriter(f, keys)
+            writer.writeheader()
+            writer.writerows(rows)
+    assert normalized(load_snapshot(directory)) == from_json
+
+    db = tmp_path / "app.db"
+    con = sqlite3.connect(db)
+    for table, rows in (("User", [USER]), ("Debt", DEBTS), ("Bill", BILLS)):
+        keys = sorted({k for row in rows for k in row} | ({"userId"} if table != "User" else set()))
+        con.execute(f'CREATE TABLE "{table}" ({", ".join(keys)})')
+        for row in rows:
+            row = dict(row, userId="u1") if table != "User" else row
+            con.execute(f'INSERT INTO "{table}" VALUES ({", ".join("?" * len(keys))})', [row.get(k) for k in keys])
+    con.commit()
+    con.close()
+    assert normalized(load_snapshot(db)) == from_json
+
+
+def test_every_snapshot_problem_is_reported(tmp_path):
+    bad = [dict(DEBTS[0], interestRate="abc"), dict(DEBTS[1], dueDay=40, type="LOAN")]
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps({"user": USER, "debts": bad, "bills": [], "exportedAt": "yesterday"}))
+    with pytest.raises(ValueError) as error:
+        load_snapshot(path)
+    message = str(error.value)
+    for problem in ("debts[0].interestRate: cannot read 'abc'", "debts[1].dueDay: 40 is not a day",
+                    "debts[1].type: 'LOAN' is not one of", "export.exportedAt: cannot read 'yesterday'"):
+        assert problem in message
+
+
+def test_inputs_rows_are_checked_like_snapshot_rows():
+    data = json.loads(ModelInputs().to_json())
+    assert normalized(inputs_from_data(data)) == normalized(ModelInputs())
+    data["all_debts"][0][1] = "lots"
+    data["all_debts"][1][4] = 40
+    data["all_debts"][2] = data["all_debts"][2][:3]
+    data["bills"][0][3] = "DAILY"
+    data["allocations"][0][1] = None
+    data["debt_types"] = ["CREDIT_CARD"]
+    with pytest.raises(ValueError) as error:
+        inputs_from_data(data, source="user.json")
+    message = str(error.value)
+    assert message.startswith("user.json: invalid inputs")
+    for problem in ("all_debts[0].balance: cannot read 'lots'", "all_debts[1].due_day: 40 is not a day",
+                    "all_debts[2]: expected (name, balance", "bills[0].frequency: 'DAILY' is not one of",
+                    "allocations[0].amount: missing", "debt_types: 1 types for 30 debts"):
+        assert problem in message
@@ -0,0 +1,40 @@
+from dataclasses import replace
+
+from openpyxl import load_workbook
+import pytest
+
+from financial_model import build_model
+from financial_model.streaming import StreamingWorkbook
+
+
+@pytest.mark.parametrize("frequency", ["monthly", "weekly"])
+def test_streamed_build_matches_the_in_memory_build(tmp_path, inputs, state_of, frequency):
+    inputs = replace(inputs, projection_frequency=frequency)
+    options = dict(cash_calendar=True, sensitivity=("extra_payment", "living"))
+    build_model(inputs, **options).save(tmp_path / "normal.xlsx")
+    build_model(inputs, write_only=True, **options).save(tmp_path / "streamed.xlsx")
+    assert (state_of(load_workbook(tmp_path / "streamed.xlsx"))
+            == state_of(load_workbook(tmp_path / "normal.xlsx")))
+
+
+def test_rows_stream_top_to_bottom(tmp_path):
+    wb = StreamingWorkbook()
+    ws = wb.active
+    ws.title = "S"
+    ws["B1"] = "title"
+    ws["A3"] = 1
+    ws["C3"] = "=A3*2"
+    ws.merge_cells("B1:C1")
+    with pytest.raises(ValueError, match="row 1 was already streamed"):
+        ws["A1"] = "late"
+    ws.append([None, 5])
+    assert ws.counts == (4, 0)
+    wb.create_sheet("T")["A1"] = "next"
+    wb.save(tmp_path / "s.xlsx")
+
+    saved = load_workbook(tmp_path / "s.xlsx")
+    assert saved.sheetnames == ["S", "T"]
+    s = saved["S"]
+    assert (s["B1"].value, s["A2"].value, s["A3"].value, s["C3"].value, s["B4"].value) == (
+        "title", None, 1, "=A3*2", 5)
+    assert [str(r) for r in s.merged_cells.ranges] == ["B1:C1"]
@@ -0,0 +1,75 @@
+from dataclasses import replace
+import os
+import stat
+
+from openpyxl import load_workbook
+from openpyxl.comments import Comment
+import pytest
+
+from financial_model import build_model
+from financial_model.update import update_model
+
+
+@pytest.fixture
+def annotated(tmp_path, inputs):
+    """A default workbook with a note, a comment and a hand-formatted cell added in Excel."""
+    path = tmp_path / "model.xlsx"
+    build_model(inputs).save(path)
+    wb = load_workbook(path)
+    wb["Snapshot"]["F3"] = "Called BMW on Jan 2"
+    wb["Snapshot"]["A11"].comment = Comment("Check the statement", "me")
+    wb["2026 Projections"]["Q5"] = "my column"
+    wb.save(path)
+    return path
+
+
+def check_annotations(path):
+    wb = load_workbook(path)
+    assert wb["Snapshot"]["F3"].value == "Called BMW on Jan 2"
+    assert wb["Snapshot"]["A11"].comment.text == "Check the statement"
+    assert wb["2026 Projections"]["Q5"].value == "my column"
+    return wb
+
+
+def without_annotations(state):
+    state["Snapshot"]["cells"].pop("F3")
+    state["2026 Projections"]["cells"].pop("Q5")
+    return state
+
+
+def test_update_keeps_annotations_and_matches_a_fresh_build(tmp_path, inputs, annotated, state_of):
+    changed = replace(inputs, extra_payment=250, net_paycheck=3200)
+    patched = update_model(changed, annotated)
+    assert patched and "2026 Projections" in patched
+
+    wb = check_annotations(annotated)
+    build_model(changed).save(tmp_path / "fresh.xlsx")
+    assert without_annotations(state_of(wb)) == state_of(load_workbook(tmp_path / "fresh.xlsx"))
+
+
+def test_update_to_a_grouped_layout_and_back(tmp_path, inputs, annotated, state_of):
+    weekly = replace(inputs, projection_frequency="weekly")
+    update_model(weekly, annotated)
+    build_model(weekly).save(tmp_path / "weekly.xlsx")
+    updated = without_annotations(state_of(check_annotations(annotated)))
+    assert updated == state_of(load_workbook(tmp_path / "weekly.xlsx"))
+    assert updated["2026 Projections"]["rows"]
+
+    update_model(inputs, annotated)
+    build_model(inputs).save(tmp_path / "monthly.xlsx")
+    restored = without_annotations(state_of(check_annotations(annotated)))
+    assert restored == state_of(load_workbook(tmp_path / "monthly.xlsx"))
+    assert restored["2026 Projections"]["rows"] == {}
+
+
+def test_unchanged_inputs_patch_nothing(inputs, annotated):
+    assert update_model(inputs, annotated) == {}
+    check_annotations(annotated)
+
+
+def test_update_keeps_the_file_mode(tmp_path, inputs, annotated):
+    os.chmod(annotated, 0o644)
+    update_model(replace(inputs, extra_payment=250), annotated)
+    assert stat.S_IMODE(os.stat(annotated).st_mode) == 0o644
+    update_model(replace(inputs, extra_payment=300), annotated, output=tmp_path / "copy.xlsx")
+    assert stat.S_IMODE(os.stat(tmp_path / "copy.xlsx").st_mode) == 0o644
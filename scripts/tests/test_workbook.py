@@ -0,0 +1,34 @@
+from dataclasses import replace
+
+from openpyxl import load_workbook
+
+from financial_model import build_model
+from financial_model.batch import build_many
+
+
+def test_default_sheets(inputs):
+    wb = build_model(inputs)
+    assert wb.sheetnames == ["Snapshot", "Debt Detail", "Every Dollar Budget", "Paycheck Plan",
+                             "2026 Projections", "Action Plan", "_model"]
+
+
+def test_projection_assumptions_follow_the_inputs(inputs):
+    note = build_model(inputs)["2026 Projections"]["A2"].value
+    assert "split 80% to highest-APR debt (avalanche) / 20% to emergency fund until $1,000" in note
+
+    changed = replace(inputs, debt_surplus_percent=0.65, emergency_fund_target=2500)
+    note = build_model(changed)["2026 Projections"]["A2"].value
+    assert "split 65% to highest-APR debt (avalanche) / 35% to emergency fund until $2,500" in note
+
+
+def test_batch_builds_each_user_and_reports_failures(tmp_path, inputs):
+    broken = tmp_path / "broken.json"
+    broken.write_text("{not json")
+    results = build_many([("alice", inputs), ("bob", replace(inputs, extra_payment=300)), ("carol", broken)],
+                         tmp_path / "out", workers=2)
+    by_name = {r.name: r for r in results}
+    assert sorted(by_name) == ["alice", "bob", "carol"]
+    assert by_name["carol"].path is None and by_name["carol"].error
+    for name in ("alice", "bob"):
+        assert by_name[name].error is None
+        assert "2026 Projections" in load_workbook(by_name[name].path).sheetnames